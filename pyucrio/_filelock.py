@@ -0,0 +1,150 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Lock files, used to coordinate work on the same file between threads and processes (including
+processes on other machines sharing the same filesystem).
+
+A lock is a file created atomically (it only succeeds if the file doesn't exist), containing the
+host, process, and thread of its owner. While the lock is held, a background thread of the owner
+refreshes the lock's modification time (so that it stays fresh whatever the owner is doing, ie.
+waiting before a retry), and the owner removes the lock when done. A lock is considered stale, and can be taken over, if its
+owner was a process on this machine that no longer exists, or if it hasn't been refreshed for a
+while (ie. its owner crashed on another machine, or hung).
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import os
+import json
+import time
+import socket
+import threading
+
+
+class FileLock:
+    """
+    A lock file. Use `acquire()` to try to take the lock without waiting.
+    """
+
+    # seconds without a refresh after which a lock is stale, and seconds between refreshes
+    __STALE_SECONDS = 60.0
+    __REFRESH_SECONDS = 10.0
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.__owner = {"host": socket.gethostname(), "pid": os.getpid(), "thread": threading.get_ident()}
+        self.__heartbeat_stop = None
+
+    def acquire(self) -> bool:
+        """
+        Try to take the lock, taking over a stale lock. Returns True if the lock was taken.
+        """
+        for _ in range(0, 2):
+            try:
+                fd = os.open(self.filename, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if (self.__remove_if_stale() is False):
+                    return False
+                continue
+            with os.fdopen(fd, "w") as fp:
+                json.dump(self.__owner, fp)
+            self.__heartbeat_stop = threading.Event()
+            threading.Thread(target=self.__heartbeat, args=(self.__heartbeat_stop, ), daemon=True).start()
+            return True
+        return False
+
+    def release(self):
+        """
+        Release the lock.
+        """
+        if (self.__heartbeat_stop is not None):
+            self.__heartbeat_stop.set()
+            self.__heartbeat_stop = None
+        try:
+            os.remove(self.filename)
+        except FileNotFoundError:  # pragma: nocover-ok
+            pass
+
+    def __heartbeat(self, stop):
+        """
+        Let others know the lock is still in use, until it is released.
+        """
+        while (stop.wait(self.__REFRESH_SECONDS) is False):
+            try:
+                os.utime(self.filename)
+            except OSError:  # pragma: nocover-ok
+                pass
+
+    def __read(self):
+        """
+        Read the owner and age of the lock. Returns None if there is no lock.
+        """
+        try:
+            age = time.time() - os.path.getmtime(self.filename)
+            with open(self.filename, "r") as fp:
+                content = fp.read()
+        except FileNotFoundError:
+            return None
+        try:
+            owner = json.loads(content)
+        except Exception:
+            # NOTE: the lock may be in the middle of being written
+            owner = None
+        return content, owner, age
+
+    def __is_stale(self, owner, age):
+        if (age > self.__STALE_SECONDS):
+            return True
+        if (owner is None or owner.get("host") != self.__owner["host"] or os.name != "posix"):
+            return False
+
+        # check if the owner process on this machine still exists
+        #
+        # NOTE: signal 0 only checks the process, but we don't use it on Windows, where os.kill()
+        # terminates the process.
+        try:
+            os.kill(owner["pid"], 0)
+        except ProcessLookupError:
+            return True
+        except Exception:  # pragma: nocover-ok
+            pass
+        return False
+
+    def __remove_if_stale(self) -> bool:
+        """
+        Remove the lock if it is stale. Returns True if there is no longer a lock.
+
+        NOTE: to not remove a lock that someone else just took over, we move the stale lock
+        aside first, and put it back if it turns out not to be the one we found stale.
+        """
+        found = self.__read()
+        if (found is None):
+            return True
+        content, owner, age = found
+        if (self.__is_stale(owner, age) is False):
+            return False
+        aside_filename = "%s.%d.%d.stale" % (self.filename, os.getpid(), threading.get_ident())
+        try:
+            os.rename(self.filename, aside_filename)
+        except FileNotFoundError:
+            return True
+        with open(aside_filename, "r") as fp:
+            moved_content = fp.read()
+        if (moved_content != content):
+            try:
+                os.link(aside_filename, self.filename)
+            except OSError:  # pragma: nocover-ok
+                pass
+        os.remove(aside_filename)
+        return moved_content == content
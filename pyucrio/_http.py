@@ -0,0 +1,86 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Pooled HTTP session shared by all API and download traffic of a PyUCRio object.
+
+Connections are kept alive and reused across requests (and threads), so that bursts of small
+requests, such as file listings, do not pay for a new TCP and TLS handshake each time.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HTTPSession:
+    """
+    A thread-safe pool of keep-alive HTTP connections, with connection reuse statistics.
+    """
+
+    def __init__(self, pool_size: int):
+        self.__pool_size = pool_size
+        self.__lock = threading.Lock()
+        self.__n_requests = 0
+        self.__n_connections_discarded = 0
+
+        # NOTE: 'pool_connections' is the number of hosts to keep pools for, and 'pool_maxsize'
+        # the number of connections per host. Requests beyond this (ie. more parallel downloads
+        # than the pool size) wait for a connection to be free, instead of opening connections
+        # that would be closed (with a warning) once done.
+        self.__adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.__session = requests.Session()
+        self.__session.mount("https://", self.__adapter)
+        self.__session.mount("http://", self.__adapter)
+
+    @property
+    def pool_size(self):
+        return self.__pool_size
+
+    def get(self, url, **kwargs):
+        """
+        Perform a GET request using a pooled connection. Arguments are passed to `requests.Session.get()`.
+        """
+        with self.__lock:
+            self.__n_requests += 1
+        return self.__session.get(url, **kwargs)
+
+    def stats(self):
+        """
+        Connection reuse statistics, as a dictionary.
+        """
+        # NOTE: urllib3 counts the connections opened by each host pool
+        n_connections = self.__n_connections_discarded
+        pools = self.__adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if (pool is not None):
+                n_connections += pool.num_connections
+        with self.__lock:
+            n_requests = self.__n_requests
+        return {
+            "pool_size": self.__pool_size,
+            "requests": n_requests,
+            "connections_opened": n_connections,
+            "connections_reused": max(0, n_requests - n_connections),
+        }
+
+    def close(self):
+        """
+        Close all pooled connections.
+        """
+        n_connections = self.stats()["connections_opened"]
+        self.__session.close()
+        self.__n_connections_discarded = n_connections
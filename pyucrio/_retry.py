@@ -0,0 +1,91 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Retrying of requests with exponential backoff, and hedging of slow requests.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed
+
+
+class RetryableError(Exception):
+    """
+    Raised by a function called using `call_with_retry()` for an error that is worth retrying. The
+    'error' attribute is the exception to raise if there are no attempts left.
+    """
+
+    def __init__(self, error):
+        super().__init__(str(error))
+        self.error = error
+
+
+def is_retryable_exception(e):
+    """
+    Check if an exception raised while making a request is a transient network error.
+    """
+    return isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError))
+
+
+def get_deadline(retry_policy):
+    """
+    Get the time (as given by `time.monotonic()`) after which no more retries are started.
+    """
+    if (retry_policy.deadline is None):
+        return None
+    return time.monotonic() + retry_policy.deadline
+
+
+def call_with_retry(func, retry_policy, deadline):
+    """
+    Call a function, retrying it with exponential backoff when it raises a RetryableError.
+    """
+    attempt = 1
+    while True:
+        try:
+            return func()
+        except RetryableError as e:
+            delay = retry_policy.backoff_delay(attempt)
+            if (attempt >= retry_policy.max_attempts or (deadline is not None and time.monotonic() + delay > deadline)):
+                raise e.error from e.error.__cause__
+            time.sleep(delay)
+            attempt += 1
+
+
+def call_hedged(func, hedge_after):
+    """
+    Call a function, calling it a second time in parallel if the first call hasn't finished after
+    'hedge_after' seconds. Returns the result of whichever call succeeds first.
+    """
+    if (hedge_after is None):
+        return func()
+
+    # NOTE: we don't wait for the slower call to finish when leaving
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        futures = [executor.submit(func)]
+        done, _ = wait(futures, timeout=hedge_after)
+        if (len(done) == 0):
+            futures.append(executor.submit(func))
+        error = None
+        for future in as_completed(futures):
+            try:
+                return future.result()
+            except Exception as e:
+                error = e
+        raise error  # type: ignore
+    finally:
+        executor.shutdown(wait=False)
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import warnings
+import multiprocessing
 
 
 def show_warning(message: str, stacklevel: int = 1) -> None:
@@ -25,4 +26,21 @@ def show_warning(message: str, stacklevel: int = 1) -> None:
     warnings.simplefilter("always", UserWarning)
     warnings.warn(message, UserWarning, stacklevel=stacklevel)
     warnings.resetwarnings()
-    
\ No newline at end of file
+
+
+def get_mp_context():
+    """
+    This is a helper method for within the library to determine the multiprocessing context to
+    use for process pools.
+
+    We prefer 'forkserver' where it is available (Linux, macOS), since forking a multi-threaded
+    process (ie. one with matplotlib or an HTTP pool loaded) can deadlock the child. On platforms
+    without it (Windows), the default context is used, which is 'spawn'.
+
+    NOTE: This is a private method only meant for use within the library.
+    """
+    if ("forkserver" in multiprocessing.get_all_start_methods()):
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["pyucrio"])
+        return ctx
+    return multiprocessing.get_context()  # pragma: nocover-ok
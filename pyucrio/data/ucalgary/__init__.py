@@ -17,17 +17,33 @@ Data downloading and reading routines for data provided by the University of Cal
 
 import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, List, Union, Literal
+from typing import TYPE_CHECKING, Optional, List, Union, Literal, Iterable, Iterator
 from pyucalgarysrs.data import (
     Observatory,
     Dataset,
-    FileDownloadResult,
     FileListingResponse,
     Data,
 )
-from pyucalgarysrs.exceptions import SRSAPIError, SRSDownloadError
-from ...exceptions import PyUCRioAPIError, PyUCRioDownloadError
+from ...exceptions import PyUCRioAPIError
 from .read import ReadManager
+from .classes import (
+    AvailabilityMatrix,
+    ObservatoryIndex,
+    ObservatoryMatch,
+    RetryPolicy,
+    FileDownloadResult,
+    FileDownloadFailure,
+)
+from ._availability import availability_matrix as func_availability_matrix
+from ._observatory_index import observatory_index as func_observatory_index
+from ._api import get_urls as func_get_urls, iter_urls as func_iter_urls
+from ._download import download as func_download, download_using_urls as func_download_using_urls
+from ._metadata import (
+    list_datasets as func_list_datasets,
+    get_dataset as func_get_dataset,
+    list_observatories as func_list_observatories,
+    refresh_snapshot as func_refresh_snapshot,
+)
 if TYPE_CHECKING:
     from ...pyucrio import PyUCRio  # pragma: nocover-ok
 
@@ -38,6 +54,11 @@ __all__ = [
     "FileDownloadResult",
     "FileListingResponse",
     "Data",
+    "AvailabilityMatrix",
+    "ObservatoryIndex",
+    "ObservatoryMatch",
+    "RetryPolicy",
+    "FileDownloadFailure",
 ]
 
 
@@ -48,6 +69,8 @@ class UCalgaryManager:
     """
 
     __DEFAULT_DOWNLOAD_N_PARALLEL = 5
+    __DEFAULT_LISTING_SHARD_SIZE = "month"
+    __DEFAULT_LISTING_N_PARALLEL = 4
 
     def __init__(self, rio_obj):
         self.__rio_obj: PyUCRio = rio_obj
@@ -66,6 +89,8 @@ class UCalgaryManager:
         """
         List available datasets
 
+        The results come from the local metadata snapshot when available (see `refresh_metadata_snapshot()`).
+
         Args:
             name (str): 
                 Supply a name used for filtering. If that name is found in the available dataset 
@@ -84,19 +109,14 @@ class UCalgaryManager:
         Raises:
             pyucrio.exceptions.PyUCRioAPIError: An API error was encountered.
         """
-        try:
-            return self.__rio_obj.srs_obj.data.list_datasets(
-                name=name,
-                timeout=timeout,
-                supported_library="pyucrio",
-            )
-        except SRSAPIError as e:
-            raise PyUCRioAPIError(e) from e
+        return func_list_datasets(self.__rio_obj, name, timeout)
 
     def get_dataset(self, name: str, timeout: Optional[int] = None) -> Dataset:
         """
         Get a specific dataset
 
+        The results come from the local metadata snapshot when available (see `refresh_metadata_snapshot()`).
+
         Args:
             name (str): 
                 The dataset name to get. Case is insensitive.
@@ -114,7 +134,7 @@ class UCalgaryManager:
             pyucrio.exceptions.PyUCRioAPIError: An API error was encountered.
         """
         try:
-            return self.__rio_obj.srs_obj.data.get_dataset(name, timeout=timeout)
+            return func_get_dataset(self.__rio_obj, name, timeout)
         except Exception as e:
             raise PyUCRioAPIError(e) from e
 
@@ -125,6 +145,8 @@ class UCalgaryManager:
         """
         List information about observatories
 
+        The results come from the local metadata snapshot when available (see `refresh_metadata_snapshot()`).
+
         Args:
             instrument_array (str): 
                 The instrument array to list observatories for. Valid values are: norstar_riometer, and swan_hsr.
@@ -146,10 +168,89 @@ class UCalgaryManager:
         Raises:
             pyucrio.exceptions.PyUCRioAPIError: An API error was encountered.
         """
-        try:
-            return self.__rio_obj.srs_obj.data.list_observatories(instrument_array, uid=uid, timeout=timeout)
-        except SRSAPIError as e:
-            raise PyUCRioAPIError(e) from e
+        return func_list_observatories(self.__rio_obj, instrument_array, uid, timeout)
+
+    def refresh_metadata_snapshot(self, background: bool = False, timeout: Optional[int] = None) -> str:
+        """
+        Refresh the local snapshot of dataset and observatory metadata from the API.
+
+        The `list_datasets()`, `get_dataset()`, and `list_observatories()` functions use this snapshot 
+        instead of contacting the API, once it has been retrieved the first time. It is refreshed 
+        automatically in the background when older than a day, and can be refreshed explicitly 
+        using this function.
+
+        The snapshot is a file in the `download_output_root_path` directory, with one file per API base
+        URL. To work on a machine without access to the API, refresh the snapshot on a machine with 
+        access, and copy the file to the same location on the other machine.
+
+        Args:
+            background (bool): 
+                Refresh in a background thread, and return immediately. Default is `False`. This 
+                parameter is optional.
+
+            timeout (int): 
+                Represents how many seconds to wait for the API to send data before giving up. The 
+                default is 10 seconds, or the `api_timeout` value in the super class' `pyucrio.PyUCRio`
+                object. This parameter is optional.
+
+        Returns:
+            The filename of the snapshot.
+
+        Raises:
+            pyucrio.exceptions.PyUCRioAPIError: An API error was encountered.
+        """
+        return func_refresh_snapshot(self.__rio_obj, background, timeout)
+
+    def observatory_index(self,
+                          instrument_array: Optional[Union[Literal["norstar_riometer", "swan_hsr"], List[str]]] = None,
+                          coordinates: Literal["geodetic", "aacgm"] = "geodetic",
+                          timestamp: Optional[datetime.datetime] = None,
+                          use_cache: bool = True,
+                          timeout: Optional[int] = None) -> ObservatoryIndex:
+        """
+        Get a spatial index over the locations of observatories, for finding the observatories within a 
+        distance of, or nearest to, a location.
+
+        For example, to find all SWAN HSR sites within 500 km of the NORSTAR riometer at Gillam:
+
+        ```python
+        index = rio.data.ucalgary.observatory_index()
+        lat, lon = index.location("gill", instrument_array="norstar_riometer")
+        matches = index.query_radius(lat, lon, 500, instrument_array="swan_hsr")
+        site_uids = [m.uid for m in matches]
+        ```
+
+        Args:
+            instrument_array (str or List[str]): 
+                The instrument array(s) to include. Valid values are: norstar_riometer, and swan_hsr. Default
+                is all instrument arrays. This parameter is optional.
+
+            coordinates (str): 
+                The coordinate system to index the observatories in, either `geodetic` or `aacgm`. Query 
+                locations must then be in the same coordinate system. Default is `geodetic`. This parameter
+                is optional.
+
+            timestamp (datetime.datetime): 
+                The date to use when converting to AACGM coordinates. Default is today. Only used if the
+                `coordinates` parameter is `aacgm`. This parameter is optional.
+
+            use_cache (bool): 
+                Re-use the index from a previous call with the same parameters, instead of retrieving the
+                observatories again. Default is `True`. This parameter is optional.
+
+            timeout (int): 
+                Represents how many seconds to wait for the API to send data before giving up. The 
+                default is 10 seconds, or the `api_timeout` value in the super class' `pyucrio.PyUCRio`
+                object. This parameter is optional.
+
+        Returns:
+            A `pyucrio.data.ucalgary.ObservatoryIndex` object.
+
+        Raises:
+            ValueError: issues encountered with supplied parameters
+            pyucrio.exceptions.PyUCRioAPIError: An API error was encountered.
+        """
+        return func_observatory_index(self.__rio_obj, instrument_array, coordinates, timestamp, use_cache, timeout)
 
     def list_supported_read_datasets(self) -> List[str]:
         """
@@ -182,21 +283,26 @@ class UCalgaryManager:
         """
         return self.__rio_obj.srs_obj.data.is_read_supported(dataset_name)
 
-    def download(self,
-                 dataset_name: str,
-                 start: datetime.datetime,
-                 end: datetime.datetime,
-                 site_uid: Optional[str] = None,
-                 n_parallel: int = __DEFAULT_DOWNLOAD_N_PARALLEL,
-                 overwrite: bool = False,
-                 progress_bar_disable: bool = False,
-                 progress_bar_ncols: Optional[int] = None,
-                 progress_bar_ascii: Optional[str] = None,
-                 progress_bar_desc: Optional[str] = None,
-                 timeout: Optional[int] = None) -> FileDownloadResult:
+    def download(
+            self,
+            dataset_name: str,
+            start: datetime.datetime,
+            end: datetime.datetime,
+            site_uid: Optional[str] = None,
+            n_parallel: Union[int, Literal["auto"]] = __DEFAULT_DOWNLOAD_N_PARALLEL,
+            overwrite: Union[bool, Literal["if_invalid"]] = False,
+            progress_bar_disable: bool = False,
+            progress_bar_ncols: Optional[int] = None,
+            progress_bar_ascii: Optional[str] = None,
+            progress_bar_desc: Optional[str] = None,
+            timeout: Optional[int] = None,
+            shard_size: Optional[Union[Literal["day", "month", "year"], datetime.timedelta]] = __DEFAULT_LISTING_SHARD_SIZE) -> FileDownloadResult:
         """
         Download data from the UCalgary Space Remote Sensing Open Data Platform.
 
+        Long time ranges are listed in time shards, in parallel, and the files of the first shards 
+        are downloaded while the next are still being listed.
+
         The parameters `dataset_name`, `start`, and `end` are required. All other parameters
         are optional.
 
@@ -221,14 +327,23 @@ class UCalgaryManager:
                 Gillam observatory will be downloaded for the given dataset name, start, and 
                 end times. This parameter is optional.
 
-            n_parallel (int): 
+            n_parallel (int or str): 
                 Number of data files to download in parallel. Default value is 5. Adjust as needed 
-                for your internet connection. This parameter is optional.
+                for your internet connection, or use `"auto"` to adjust it automatically during the 
+                download based on the measured throughput (between 1 and 32, limited by the `http_pool_size`
+                of the super class' `pyucrio.PyUCRio` object). The level used, and the throughput achieved, 
+                are included in the result. This parameter is optional.
 
-            overwrite (bool): 
+            overwrite (bool or str): 
                 By default, data will not be re-downloaded if it already exists locally. Use 
-                the `overwrite` parameter to force re-downloading. Default is `False`. This 
-                parameter is optional.
+                the `overwrite` parameter to force re-downloading, or `"if_invalid"` to only 
+                re-download files that weren't verified when downloaded, or that have changed 
+                since. Downloaded files are checked against the size and any checksums sent by 
+                the server, and recorded in a verification index. Default is `False`. Files 
+                being downloaded by another process sharing the same `download_output_root_path` 
+                are waited for instead of being downloaded again, until the `retry_policy` 
+                deadline passes, or the other process makes no progress for `timeout` seconds. 
+                This parameter is optional.
 
             progress_bar_disable (bool): 
                 Disable the progress bar. Default is `False`. This parameter is optional.
@@ -253,14 +368,20 @@ class UCalgaryManager:
                 default is 10 seconds, or the `api_timeout` value in the super class' `pyucrio.PyUCRio`
                 object. This parameter is optional.
 
+            shard_size (str or datetime.timedelta): 
+                Long time ranges are listed in shards, which are listed in parallel. Use 'day', 'month', 
+                or 'year' for calendar shards, a `datetime.timedelta` for shards of a fixed duration, 
+                or `None` to list the whole range in a single request. Default is 'month'. This 
+                parameter is optional.
+
         Returns:
-            A [`FileDownloadResult`](https://docs-pyucalgarysrs.phys.ucalgary.ca/data/classes.html#pyucalgarysrs.data.classes.FileDownloadResult) 
-            object containing details about what data files were downloaded.
+            A `FileDownloadResult` object containing details about what data files were downloaded, and
+            which files could not be downloaded (after retrying according to the `retry_policy` of the 
+            super class' `pyucrio.PyUCRio` object).
 
         Raises:
-            pyucrio.exceptions.PyUCRioDownloadError: an error was encountered while downloading a 
-                specific file
             pyucrio.exceptions.PyUCRioAPIError: an API error was encountered
+            ValueError: issues encountered with supplied parameters
 
         Notes:
         --------
@@ -284,29 +405,26 @@ class UCalgaryManager:
         rio.data.download(dataset_name, start, end)
         ```
         """
-        try:
-            return self.__rio_obj.srs_obj.data.download(
-                dataset_name,
-                start,
-                end,
-                site_uid=site_uid,
-                n_parallel=n_parallel,
-                overwrite=overwrite,
-                progress_bar_disable=progress_bar_disable,
-                progress_bar_ncols=progress_bar_ncols,
-                progress_bar_ascii=progress_bar_ascii,
-                progress_bar_desc=progress_bar_desc,
-                timeout=timeout,
-            )
-        except SRSDownloadError as e:  # pragma: nocover-ok
-            raise PyUCRioDownloadError(e) from e
-        except SRSAPIError as e:  # pragma: nocover-ok
-            raise PyUCRioAPIError(e) from e
+        return func_download(
+            self.__rio_obj,
+            dataset_name,
+            start,
+            end,
+            site_uid,
+            n_parallel,
+            overwrite,
+            shard_size,
+            progress_bar_disable,
+            progress_bar_ncols,
+            progress_bar_ascii,
+            progress_bar_desc,
+            timeout,
+        )
 
     def download_using_urls(self,
-                            file_listing_response: FileListingResponse,
-                            n_parallel: int = __DEFAULT_DOWNLOAD_N_PARALLEL,
-                            overwrite: bool = False,
+                            file_listing_response: Union[FileListingResponse, Iterable[FileListingResponse]],
+                            n_parallel: Union[int, Literal["auto"]] = __DEFAULT_DOWNLOAD_N_PARALLEL,
+                            overwrite: Union[bool, Literal["if_invalid"]] = False,
                             progress_bar_disable: bool = False,
                             progress_bar_ncols: Optional[int] = None,
                             progress_bar_ascii: Optional[str] = None,
@@ -326,16 +444,27 @@ class UCalgaryManager:
             file_listing_response (FileListingResponse): 
                 A [`FileListingResponse`](https://docs-pyucalgarysrs.phys.ucalgary.ca/data/classes.html#pyucalgarysrs.data.classes.FileListingResponse) 
                 object returned from a `get_urls()` call, which contains a list of URLs to download 
-                for a specific dataset. This parameter is required.
+                for a specific dataset. The listings of several time shards can also be given, ie. the 
+                generator returned by `iter_urls()`, in which case the files of each listing are 
+                downloaded as soon as it is available. This parameter is required.
 
-            n_parallel (int): 
+            n_parallel (int or str): 
                 Number of data files to download in parallel. Default value is 5. Adjust as needed 
-                for your internet connection. This parameter is optional.
+                for your internet connection, or use `"auto"` to adjust it automatically during the 
+                download based on the measured throughput (between 1 and 32, limited by the `http_pool_size`
+                of the super class' `pyucrio.PyUCRio` object). The level used, and the throughput achieved, 
+                are included in the result. This parameter is optional.
 
-            overwrite (bool): 
+            overwrite (bool or str): 
                 By default, data will not be re-downloaded if it already exists locally. Use 
-                the `overwrite` parameter to force re-downloading. Default is `False`. This 
-                parameter is optional.
+                the `overwrite` parameter to force re-downloading, or `"if_invalid"` to only 
+                re-download files that weren't verified when downloaded, or that have changed 
+                since. Downloaded files are checked against the size and any checksums sent by 
+                the server, and recorded in a verification index. Default is `False`. Files 
+                being downloaded by another process sharing the same `download_output_root_path` 
+                are waited for instead of being downloaded again, until the `retry_policy` 
+                deadline passes, or the other process makes no progress for `timeout` seconds. 
+                This parameter is optional.
 
             progress_bar_disable (bool): 
                 Disable the progress bar. Default is `False`. This parameter is optional.
@@ -361,13 +490,13 @@ class UCalgaryManager:
                 object. This parameter is optional.
 
         Returns:
-            A [`FileDownloadResult`](https://docs-pyucalgarysrs.phys.ucalgary.ca/data/classes.html#pyucalgarysrs.data.classes.FileDownloadResult) 
-            object containing details about what data files were downloaded.
+            A `FileDownloadResult` object containing details about what data files were downloaded, and
+            which files could not be downloaded (after retrying according to the `retry_policy` of the 
+            super class' `pyucrio.PyUCRio` object).
 
         Raises:
-            pyucrio.exceptions.PyUCRioDownloadError: an error was encountered while downloading a 
-                specific file
             pyucrio.exceptions.PyUCRioAPIError: an API error was encountered
+            ValueError: issues encountered with supplied parameters
 
         Notes:
         --------
@@ -391,34 +520,35 @@ class UCalgaryManager:
         rio.data.download(dataset_name, start, end)
         ```
         """
-        try:
-            return self.__rio_obj.srs_obj.data.download_using_urls(
-                file_listing_response,
-                n_parallel=n_parallel,
-                overwrite=overwrite,
-                progress_bar_disable=progress_bar_disable,
-                progress_bar_ncols=progress_bar_ncols,
-                progress_bar_ascii=progress_bar_ascii,
-                progress_bar_desc=progress_bar_desc,
-                timeout=timeout,
-            )
-        except SRSDownloadError as e:  # pragma: nocover-ok
-            raise PyUCRioDownloadError(e) from e
-        except SRSAPIError as e:  # pragma: nocover-ok
-            raise PyUCRioAPIError(e) from e
+        return func_download_using_urls(
+            self.__rio_obj,
+            file_listing_response,
+            n_parallel,
+            overwrite,
+            progress_bar_disable,
+            progress_bar_ncols,
+            progress_bar_ascii,
+            progress_bar_desc,
+            timeout,
+        )
 
     def get_urls(self,
                  dataset_name: str,
                  start: datetime.datetime,
                  end: datetime.datetime,
                  site_uid: Optional[str] = None,
-                 timeout: Optional[int] = None) -> FileListingResponse:
+                 timeout: Optional[int] = None,
+                 shard_size: Optional[Union[Literal["day", "month", "year"], datetime.timedelta]] = __DEFAULT_LISTING_SHARD_SIZE,
+                 n_parallel: int = __DEFAULT_LISTING_N_PARALLEL) -> FileListingResponse:
         """
         Get URLs of data files
 
         The parameters `dataset_name`, `start`, and `end` are required. All other parameters
         are optional.
 
+        Long time ranges are split into time shards, which are listed in parallel and merged. Use 
+        `iter_urls()` to consume the listing of each shard as it completes instead.
+
         Args:
             dataset_name (str): 
                 Name of the dataset to download data for. Use the `list_datasets()` function
@@ -444,24 +574,149 @@ class UCalgaryManager:
                 Represents how many seconds to wait for the API to send data before giving up. The 
                 default is 10 seconds, or the `api_timeout` value in the super class' `pyucrio.PyUCRio`
                 object. This parameter is optional.
-    
+
+            shard_size (str or datetime.timedelta): 
+                Long time ranges are listed in shards, which are listed in parallel. Use 'day', 'month', 
+                or 'year' for calendar shards, a `datetime.timedelta` for shards of a fixed duration, 
+                or `None` to list the whole range in a single request. Default is 'month'. This 
+                parameter is optional.
+
+            n_parallel (int): 
+                Number of shards to list in parallel. Default is `4`. This parameter is optional.
+
         Returns:
             A [`FileListingResponse`](https://docs-pyucalgarysrs.phys.ucalgary.ca/data/classes.html#pyucalgarysrs.data.classes.FileListingResponse)
             object containing a list of the available URLs, among other values.
 
         Raises:
             pyucrio.exceptions.PyUCRioAPIError: an API error was encountered
+            ValueError: issues encountered with supplied parameters
         """
-        try:
-            return self.__rio_obj.srs_obj.data.get_urls(
-                dataset_name,
-                start,
-                end,
-                site_uid=site_uid,
-                timeout=timeout,
-            )
-        except SRSAPIError as e:  # pragma: nocover-ok
-            raise PyUCRioAPIError(e) from e
+        return func_get_urls(self.__rio_obj, dataset_name, start, end, site_uid, shard_size, n_parallel, timeout)
+
+    def iter_urls(self,
+                  dataset_name: str,
+                  start: datetime.datetime,
+                  end: datetime.datetime,
+                  site_uid: Optional[str] = None,
+                  timeout: Optional[int] = None,
+                  shard_size: Optional[Union[Literal["day", "month", "year"], datetime.timedelta]] = __DEFAULT_LISTING_SHARD_SIZE,
+                  n_parallel: int = __DEFAULT_LISTING_N_PARALLEL) -> Iterator[FileListingResponse]:
+        """
+        Get URLs of data files, one time shard at a time.
+
+        The shards are listed in parallel, and their listings are returned in time order as they
+        complete. This allows for the files of the first shards to be processed (ie. by passing this
+        function's result to `download_using_urls()`) while the next are still being listed.
+
+        Args:
+            dataset_name (str): 
+                Name of the dataset to get the URLs of. Note that dataset names are case sensitive. This 
+                parameter is required.
+
+            start (datetime.datetime): 
+                Start timestamp to use (inclusive), expected to be in UTC. Any timezone data 
+                will be ignored. This parameter is required.
+
+            end (datetime.datetime): 
+                End timestamp to use (inclusive), expected to be in UTC. Any timezone data 
+                will be ignored. This parameter is required.
+
+            site_uid (str): 
+                The site UID to filter for. This parameter is optional.
+
+            timeout (int): 
+                Represents how many seconds to wait for the API to send data before giving up. The 
+                default is 10 seconds, or the `api_timeout` value in the super class' `pyucrio.PyUCRio`
+                object. This parameter is optional.
+
+            shard_size (str or datetime.timedelta): 
+                Long time ranges are listed in shards, which are listed in parallel. Use 'day', 'month', 
+                or 'year' for calendar shards, a `datetime.timedelta` for shards of a fixed duration, 
+                or `None` to list the whole range in a single request. Default is 'month'. This 
+                parameter is optional.
+
+            n_parallel (int): 
+                Number of shards to list in parallel. Default is `4`. This parameter is optional.
+
+        Returns:
+            A generator of [`FileListingResponse`](https://docs-pyucalgarysrs.phys.ucalgary.ca/data/classes.html#pyucalgarysrs.data.classes.FileListingResponse)
+            objects, one for each shard.
+
+        Raises:
+            pyucrio.exceptions.PyUCRioAPIError: an API error was encountered, when consuming the generator
+            ValueError: issues encountered with supplied parameters
+        """
+        return func_iter_urls(self.__rio_obj, dataset_name, start, end, site_uid, shard_size, n_parallel, timeout)
+
+    def availability_matrix(self,
+                            dataset_name: str,
+                            start: datetime.datetime,
+                            end: datetime.datetime,
+                            site_uids: Optional[List[str]] = None,
+                            resolution: Literal["day", "hour"] = "day",
+                            n_parallel: int = 1,
+                            use_cache: bool = True,
+                            timeout: Optional[int] = None) -> AvailabilityMatrix:
+        """
+        Determine the data availability of a dataset for each site and day (or hour).
+
+        The files of all sites are retrieved using a single listing of the dataset, rather than one
+        listing per site. Long time ranges can be split into chunks that are listed in parallel.
+
+        Args:
+            dataset_name (str): 
+                Name of the dataset to check the availability of. One example is "SWAN_HSR_K0_H5". Note 
+                that dataset names are case sensitive. This parameter is required.
+
+            start (datetime.datetime): 
+                Start timestamp to use (inclusive), expected to be in UTC. Any timezone data 
+                will be ignored. This parameter is required.
+
+            end (datetime.datetime): 
+                End timestamp to use (inclusive), expected to be in UTC. Any timezone data 
+                will be ignored. This parameter is required.
+
+            site_uids (List[str]): 
+                The sites to include, in the order of the rows of the matrix. Default is all observatories
+                of the dataset's instrument array. This parameter is optional.
+
+            resolution (str): 
+                The size of each time bin, either `day` or `hour`. Files covering a whole day are counted
+                in every hour of that day. Default is `day`. This parameter is optional.
+
+            n_parallel (int): 
+                Number of time shards (of whole days) to list in parallel. Default is `1`, which retrieves 
+                the listing in a single request. This parameter is optional.
+
+            use_cache (bool): 
+                Re-use the result of a previous call with the same parameters, instead of listing the files 
+                again. Disable this to pick up files added since. Default is `True`. This parameter is optional.
+
+            timeout (int): 
+                Represents how many seconds to wait for the API to send data before giving up. The 
+                default is 10 seconds, or the `api_timeout` value in the super class' `pyucrio.PyUCRio`
+                object. This parameter is optional.
+
+        Returns:
+            A `pyucrio.data.ucalgary.AvailabilityMatrix` object containing a boolean matrix of (site x time bin),
+            which can be rendered as a heatmap using its `plot()` method.
+
+        Raises:
+            ValueError: issues encountered with supplied parameters
+            pyucrio.exceptions.PyUCRioAPIError: an API error was encountered
+        """
+        return func_availability_matrix(
+            self.__rio_obj,
+            dataset_name,
+            start,
+            end,
+            site_uids,
+            resolution,
+            n_parallel,
+            use_cache,
+            timeout,
+        )
 
     def read(self,
              dataset: Dataset,
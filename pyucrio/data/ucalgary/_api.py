@@ -0,0 +1,228 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Requests to the UCalgary Space Remote Sensing API, made using the PyUCRio object's pooled HTTP session.
+
+File listings of long time ranges are split into time shards (ie. one per month), which are listed
+in parallel. They can be merged into one listing, or consumed shard by shard as they complete, in
+order, so that downloading can start before the whole range is listed.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from pyucalgarysrs.data import Dataset, Observatory, FileListingResponse
+from ...exceptions import PyUCRioAPIError
+from ..._retry import RetryableError, is_retryable_exception, get_deadline, call_with_retry, call_hedged
+
+
+def __get_json_attempt(ucrio_obj, url, params, timeout):
+    """
+    Make a single attempt at an API request, raising a RetryableError for transient errors.
+    """
+    # make request
+    try:
+        r = ucrio_obj.http_session.get(url, params=params, headers=ucrio_obj.api_headers, timeout=timeout)
+    except Exception as e:
+        error = PyUCRioAPIError("Unexpected API error: %s" % (str(e)))
+        error.__cause__ = e
+        if (is_retryable_exception(e) is True):
+            raise RetryableError(error) from e
+        raise error from e  # pragma: nocover-ok
+
+    # check response
+    if (r.status_code != 200):
+        try:
+            res = r.json()
+            msg = res["detail"]
+        except Exception:
+            msg = r.content
+        error = PyUCRioAPIError("API error code %d: %s" % (r.status_code, msg))
+        if (r.status_code in ucrio_obj.retry_policy.retry_status_codes):
+            raise RetryableError(error)
+        raise error
+
+    # return
+    return r.json()
+
+
+def get_json(ucrio_obj, path, params, timeout, deadline=None):
+    """
+    Make a GET request to the API and return the decoded JSON response, retrying and hedging
+    the request according to the PyUCRio object's retry policy.
+    """
+    # set timeout
+    if (timeout is None):
+        timeout = ucrio_obj.api_timeout
+
+    # make request
+    url = "%s%s" % (ucrio_obj.api_base_url, path)
+    retry_policy = ucrio_obj.retry_policy
+    if (deadline is None):
+        deadline = get_deadline(retry_policy)
+    return call_with_retry(
+        lambda: call_hedged(lambda: __get_json_attempt(ucrio_obj, url, params, timeout), retry_policy.hedge_after),
+        retry_policy,
+        deadline,
+    )
+
+
+def list_datasets(ucrio_obj, name, supported_library, timeout):
+    # set up request
+    params = {}
+    if (name is not None):
+        params["name"] = name
+
+    # make request
+    res = get_json(ucrio_obj, "/api/v1/data_distribution/datasets", params, timeout)
+
+    # cast response into dataset objects, keeping only the ones supported by the given library
+    file_reading_supported_datasets = ucrio_obj.data.ucalgary.list_supported_read_datasets()
+    datasets = []
+    for d in res:
+        d["file_reading_supported"] = True if d["name"] in file_reading_supported_datasets else False
+        dataset = Dataset(**d)
+        if (supported_library in dataset.supported_libraries):
+            datasets.append(dataset)
+
+    # return
+    return datasets
+
+
+def list_observatories(ucrio_obj, instrument_array, uid, timeout):
+    # set up request
+    params = {"instrument_array": instrument_array}
+    if (uid is not None):
+        params["uid"] = uid
+
+    # make request
+    res = get_json(ucrio_obj, "/api/v1/data_distribution/observatories", params, timeout)
+
+    # return
+    return [Observatory(**x) for x in res]
+
+
+def __get_urls_request(ucrio_obj, dataset_name, start, end, site_uid, timeout, deadline):
+    # set up request
+    params = {
+        "name": dataset_name,
+        "start": start,
+        "end": end,
+        "include_total_bytes": True,
+    }
+    if (site_uid is not None):
+        params["site_uid"] = site_uid
+
+    # make request
+    res = get_json(ucrio_obj, "/api/v1/data_distribution/urls", params, timeout, deadline=deadline)
+
+    # cast response into a file listing object
+    file_reading_supported_datasets = ucrio_obj.data.ucalgary.list_supported_read_datasets()
+    file_listing_obj = FileListingResponse(**res)
+    file_reading_supported = True if res["dataset"]["name"] in file_reading_supported_datasets else False
+    file_listing_obj.dataset = Dataset(**res["dataset"], file_reading_supported=file_reading_supported)
+
+    # return
+    return file_listing_obj
+
+
+def get_shard_bounds(start, end, shard_size):
+    """
+    Split a time range into shards of whole days, months, years, or a fixed duration. Returns the
+    (inclusive) start and end of each shard.
+    """
+    # check parameters
+    if (shard_size not in [None, "day", "month", "year"]
+            and (isinstance(shard_size, datetime.timedelta) is False or shard_size.total_seconds() <= 0)):
+        raise ValueError("The shard_size parameter must be 'day', 'month', 'year', a positive datetime.timedelta, or None")
+    if (shard_size is None):
+        return [(start, end)]
+
+    # split
+    #
+    # NOTE: any timezone is ignored by the API, so we ignore it here too
+    naive_start = start.replace(tzinfo=None)
+    naive_end = end.replace(tzinfo=None)
+    bounds = []
+    shard_start = naive_start
+    while (shard_start <= naive_end):
+        if (shard_size == "day"):
+            next_start = datetime.datetime.combine(shard_start.date() + datetime.timedelta(days=1), datetime.time())
+        elif (shard_size == "month"):
+            next_start = datetime.datetime(shard_start.year + shard_start.month // 12, shard_start.month % 12 + 1, 1)
+        elif (shard_size == "year"):
+            next_start = datetime.datetime(shard_start.year + 1, 1, 1)
+        else:
+            next_start = shard_start + shard_size
+        bounds.append((shard_start, min(naive_end, next_start - datetime.timedelta(microseconds=1))))
+        shard_start = next_start
+
+    # return, keeping the original range if it wasn't split
+    if (len(bounds) <= 1):
+        return [(start, end)]
+    return bounds
+
+
+def iter_urls(ucrio_obj, dataset_name, start, end, site_uid, shard_size, n_parallel, timeout, deadline=None):
+    """
+    List the files of each time shard, in parallel. Returns a generator of the listing of each
+    shard, in time order, as they complete.
+    """
+    # check parameters
+    if (n_parallel < 1):
+        raise ValueError("The n_parallel parameter must be at least 1")
+    bounds = get_shard_bounds(start, end, shard_size)
+    if (deadline is None):
+        deadline = get_deadline(ucrio_obj.retry_policy)
+
+    def list_shard(shard_bounds):
+        return __get_urls_request(ucrio_obj, dataset_name, shard_bounds[0], shard_bounds[1], site_uid, timeout, deadline)
+
+    def generator():
+        if (len(bounds) == 1):
+            yield list_shard(bounds[0])
+            return
+
+        # NOTE: if the caller stops early, the shards not yet listed are cancelled
+        executor = ThreadPoolExecutor(max_workers=min(n_parallel, len(bounds)))
+        try:
+            futures = [executor.submit(list_shard, b) for b in bounds]
+            for future in futures:
+                yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # return
+    return generator()
+
+
+def merge_listings(file_listings):
+    """
+    Merge the listings of several time shards into one, removing any duplicate files.
+    """
+    if (len(file_listings) == 1):
+        return file_listings[0]
+    urls = list(dict.fromkeys([url for file_listing_obj in file_listings for url in file_listing_obj.urls]))
+    return FileListingResponse(
+        urls=urls,
+        path_prefix=file_listings[0].path_prefix,
+        count=len(urls),
+        dataset=file_listings[0].dataset,
+        total_bytes=sum([x.total_bytes for x in file_listings if x.total_bytes is not None]),
+    )
+
+
+def get_urls(ucrio_obj, dataset_name, start, end, site_uid, shard_size, n_parallel, timeout, deadline=None):
+    return merge_listings(list(iter_urls(ucrio_obj, dataset_name, start, end, site_uid, shard_size, n_parallel, timeout, deadline=deadline)))
@@ -0,0 +1,180 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Site x time availability matrices, built from file listings.
+
+We list all files of a dataset for all sites at once (optionally split into time shards that are
+listed in parallel, see `get_urls()`), and determine the site and timestamp of each file from its
+URL. Files with only a date in their name are considered to cover that whole day.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import re
+import datetime
+import threading
+import numpy as np
+from collections import OrderedDict
+from .classes import AvailabilityMatrix
+
+# timestamp in a filename, such as 20240203 or 20240203_0600
+__TIMESTAMP_REGEX = re.compile(r"(?<!\d)(\d{4})(\d{2})(\d{2})(?:_(\d{2})\d{2})?(?!\d)")
+
+# cache of availability matrices
+__MATRIX_CACHE_MAX_SIZE = 32
+__matrix_cache = OrderedDict()
+__matrix_cache_lock = threading.Lock()
+
+
+def __get_instrument_array(dataset_name):
+    """
+    Determine the instrument array that a dataset is from.
+    """
+    for instrument_array in ["swan_hsr", "norstar_riometer"]:
+        if (instrument_array.upper() in dataset_name.upper()):
+            return instrument_array
+    raise ValueError("Unable to determine the instrument array for dataset '%s', please supply the site_uids parameter" % (dataset_name))
+
+
+def __list_urls(ucrio_obj, dataset_name, start, end, n_parallel, timeout):
+    """
+    List the URLs of all files for the dataset, splitting the time range into as many shards of
+    whole days as the number of shards to list in parallel.
+    """
+    n_days = (end.date() - start.date()).days + 1
+    shard_size = None if (n_parallel == 1 or n_days == 1) else datetime.timedelta(days=-(-n_days // n_parallel))
+    return ucrio_obj.data.ucalgary.get_urls(dataset_name, start, end, timeout=timeout, shard_size=shard_size, n_parallel=n_parallel).urls
+
+
+def __parse_urls(urls, site_uids):
+    """
+    Determine the site index and timestamp of each file. Files for sites that are not requested, or
+    without a timestamp, are excluded.
+
+    Returns the site index, the day (as datetime64[D]), and the hour (-1 if not known) of each file.
+    """
+    site_index = {site: i for i, site in enumerate(site_uids)}
+    site_idx = []
+    date_strs = []
+    hours = []
+    for url in urls:
+        filename = url.rsplit("/", 1)[-1]
+
+        # find the site, in the filename or otherwise the path
+        idx = None
+        for token in re.split(r"[_\-.]", filename.lower()) + url.lower().split("/")[::-1]:
+            if (token in site_index):
+                idx = site_index[token]
+                break
+        if (idx is None):
+            continue
+
+        # find the timestamp
+        match = __TIMESTAMP_REGEX.search(filename)
+        if (match is None):
+            continue
+        site_idx.append(idx)
+        date_strs.append("%s-%s-%s" % (match.group(1), match.group(2), match.group(3)))
+        hours.append(-1 if match.group(4) is None else int(match.group(4)))
+
+    # convert all timestamps at once
+    return (
+        np.array(site_idx, dtype=np.int64),
+        np.array(date_strs, dtype="datetime64[D]"),
+        np.array(hours, dtype=np.int64),
+    )
+
+
+def __fill_matrix(site_idx, days, hours, start, end, n_sites, resolution):
+    """
+    Fill the boolean availability matrix, returning it and the start of each time bin.
+    """
+    if (resolution == "day"):
+        bin_start = np.datetime64(start.date(), "D")
+        n_bins = int((np.datetime64(end.date(), "D") - bin_start).astype(np.int64)) + 1
+        first_bin = (days - bin_start).astype(np.int64)
+        bin_count = np.ones(len(first_bin), dtype=np.int64)
+    else:
+        bin_start = np.datetime64(start.replace(minute=0, second=0, microsecond=0), "h")
+        n_bins = int((np.datetime64(end.replace(minute=0, second=0, microsecond=0), "h") - bin_start).astype(np.int64)) + 1
+        first_bin = (days.astype("datetime64[h]") - bin_start).astype(np.int64) + np.maximum(hours, 0)
+        bin_count = np.where(hours < 0, 24, 1)
+
+    # expand each file to the bins it covers, and fill
+    #
+    # NOTE: files covering a whole day are spread across 24 hourly bins
+    available = np.zeros((n_sites, n_bins), dtype=bool)
+    if (len(first_bin) > 0):
+        offsets = np.arange(0, int(bin_count.sum())) - np.repeat(np.cumsum(bin_count) - bin_count, bin_count)
+        bins = np.repeat(first_bin, bin_count) + offsets
+        rows = np.repeat(site_idx, bin_count)
+        in_range = (bins >= 0) & (bins < n_bins)
+        available[rows[in_range], bins[in_range]] = True
+
+    # determine the timestamps
+    timestamps = (bin_start + np.arange(0, n_bins)).astype("datetime64[us]").astype(datetime.datetime).tolist()
+
+    # return
+    return available, timestamps
+
+
+def availability_matrix(ucrio_obj, dataset_name, start, end, site_uids, resolution, n_parallel, use_cache, timeout):
+    # check parameters
+    if (resolution not in ["day", "hour"]):
+        raise ValueError("The resolution parameter must be 'day' or 'hour'")
+    if (n_parallel < 1):
+        raise ValueError("The n_parallel parameter must be at least 1")
+    start = start.replace(tzinfo=None)
+    end = end.replace(tzinfo=None)
+    if (end < start):
+        raise ValueError("The end timestamp must be after the start timestamp")
+
+    # check the cache
+    cache_key = (ucrio_obj.api_base_url, dataset_name, start, end, None if site_uids is None else tuple(site_uids), resolution)
+    if (use_cache is True):
+        with __matrix_cache_lock:
+            if (cache_key in __matrix_cache):
+                __matrix_cache.move_to_end(cache_key)
+                cached = __matrix_cache[cache_key]
+                return AvailabilityMatrix(dataset_name, list(cached.site_uid_list), list(cached.timestamps), resolution, cached.available.copy())
+
+    # determine the sites
+    if (site_uids is None):
+        observatories = ucrio_obj.data.ucalgary.list_observatories(__get_instrument_array(dataset_name), timeout=timeout)  # type: ignore
+        site_uids = [x.uid for x in observatories]
+    site_uids = [x.lower() for x in site_uids]
+
+    # list the files and fill the matrix
+    urls = __list_urls(ucrio_obj, dataset_name, start, end, n_parallel, timeout)
+    site_idx, days, hours = __parse_urls(urls, site_uids)
+    available, timestamps = __fill_matrix(site_idx, days, hours, start, end, len(site_uids), resolution)
+    matrix = AvailabilityMatrix(dataset_name, list(site_uids), timestamps, resolution, available)
+
+    # add to cache, evicting the least recently used entry if necessary
+    if (use_cache is True):
+        with __matrix_cache_lock:
+            __matrix_cache[cache_key] = AvailabilityMatrix(dataset_name, list(site_uids), list(timestamps), resolution, available.copy())
+            if (len(__matrix_cache) > __MATRIX_CACHE_MAX_SIZE):
+                __matrix_cache.popitem(last=False)
+
+    # return
+    return matrix
+
+
+def clear_cache():
+    """
+    Clear the in-memory availability matrix cache.
+    """
+    with __matrix_cache_lock:
+        __matrix_cache.clear()
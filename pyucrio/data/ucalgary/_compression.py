@@ -0,0 +1,108 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Compressed-at-rest storage of downloaded text files.
+
+With the PyUCRio object's `download_compression` set, the text files of the datasets below are
+compressed once downloaded and verified, and stored with a '.gz' or '.zst' suffix. They are
+decompressed again when read.
+
+NOTE: zstd compression uses the standard library's `compression.zstd` module (Python 3.14+), or
+the 'zstandard' package if it is installed.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import gzip
+import shutil
+from ...exceptions import PyUCRioError
+
+# datasets with text files that can be stored compressed
+COMPRESSIBLE_DATASETS = ["NORSTAR_RIOMETER_K0_TXT", "NORSTAR_RIOMETER_K2_TXT"]
+
+# filename suffixes of the compression formats
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+# size of the blocks that files are compressed and decompressed in
+__BLOCK_SIZE = 1024 * 1024
+
+
+def __get_zstd_module():
+    try:
+        from compression import zstd  # type: ignore
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore
+        return zstandard
+    except ImportError:
+        return None
+
+
+def is_zstd_available():
+    """
+    Check if zstd compression is available.
+    """
+    return __get_zstd_module() is not None
+
+
+def get_compressed_filename(filename, dataset_name, compression):
+    """
+    Get the filename a downloaded file is stored as.
+    """
+    if (compression is None or dataset_name not in COMPRESSIBLE_DATASETS or str(filename).endswith(".txt") is False):
+        return filename
+    return filename.with_name(filename.name + COMPRESSION_SUFFIXES[compression])
+
+
+def get_compression(filename):
+    """
+    Get the compression format of a file from its suffix, or None if it isn't compressed.
+    """
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if (str(filename).endswith(suffix) is True):
+            return compression
+    return None
+
+
+def open_compressed(filename, mode, compression):
+    """
+    Open a compressed file as a binary stream, for reading ('rb') or writing ('wb').
+    """
+    if (compression == "gzip"):
+        # NOTE: zlib's default level of 6 is much faster than gzip's default of 9, for a similar ratio
+        return gzip.open(filename, mode, compresslevel=6)
+    zstd = __get_zstd_module()
+    if (zstd is None):
+        raise PyUCRioError("Reading or writing zstd compressed files requires Python 3.14+, or the 'zstandard' package")
+    if (hasattr(zstd, "ZstdFile") is True):
+        return zstd.ZstdFile(filename, mode)  # pragma: nocover-ok
+    return zstd.open(filename, mode)
+
+
+def compress_file(filename, compressed_filename, compression):
+    """
+    Compress a file, streaming it in blocks.
+    """
+    with open(filename, "rb") as fp_in, open_compressed(compressed_filename, "wb", compression) as fp_out:
+        shutil.copyfileobj(fp_in, fp_out, __BLOCK_SIZE)
+
+
+def decompress_file(compressed_filename, filename):
+    """
+    Decompress a file, streaming it in blocks.
+    """
+    with open_compressed(compressed_filename, "rb", get_compression(compressed_filename)) as fp_in, open(filename, "wb") as fp_out:
+        shutil.copyfileobj(fp_in, fp_out, __BLOCK_SIZE)
@@ -0,0 +1,109 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Control of the number of files downloaded in parallel.
+
+With `n_parallel="auto"`, the number of parallel downloads is adjusted using additive increase
+and multiplicative decrease (AIMD). The throughput is estimated over windows of as many completed
+files as there are parallel downloads, from the size and duration of each file's download (the
+number of parallel downloads, times the bytes per second of a single download). While the
+throughput keeps improving, one more parallel download is added. When it drops well below the
+best seen, or files fail, the number of parallel downloads is halved.
+
+Small files, where the latency of each request dominates, take as long with more parallel
+downloads, so the throughput improves and more are added. Large files, where the bandwidth
+dominates, take proportionally longer once the link is saturated, so the number stops growing.
+
+NOTE: using the duration of each download, instead of the time between completions, keeps the
+estimate stable when downloads complete in bursts.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import time
+import threading
+
+# limits of the number of parallel downloads in 'auto' mode
+AUTO_N_PARALLEL_INITIAL = 4
+AUTO_N_PARALLEL_MIN = 1
+AUTO_N_PARALLEL_MAX = 32
+
+
+class ConcurrencyController:
+    """
+    Tracks the throughput of completed downloads, and the number of downloads to run in parallel.
+    A fixed number of parallel downloads is a controller with equal minimum and maximum.
+    """
+
+    # relative throughput change considered an improvement, or a drop
+    __INCREASE_THRESHOLD = 0.05
+    __DECREASE_THRESHOLD = 0.2
+
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.__limit = max(minimum, min(maximum, initial))
+        self.__lock = threading.Lock()
+        self.__best_throughput = None
+        self.__window_bytes = 0
+        self.__window_seconds = 0.0
+        self.__window_files = 0
+        self.__window_failed = False
+        self.__total_start = time.monotonic()
+        self.__total_bytes = 0
+
+    @property
+    def limit(self) -> int:
+        return self.__limit
+
+    @property
+    def throughput(self) -> float:
+        """
+        The overall throughput so far, in bytes per second.
+        """
+        elapsed = time.monotonic() - self.__total_start
+        return 0.0 if elapsed <= 0 else self.__total_bytes / elapsed
+
+    def record(self, n_bytes: int, seconds: float, failed: bool):
+        """
+        Record a completed (or failed) download and how long it took, adjusting the limit at the
+        end of each window.
+        """
+        with self.__lock:
+            self.__total_bytes += n_bytes
+            self.__window_bytes += n_bytes
+            self.__window_seconds += seconds
+            self.__window_files += 1
+            self.__window_failed = self.__window_failed or failed
+            if (self.__window_files < self.__limit):
+                return
+
+            # evaluate the window
+            throughput = 0.0
+            if (self.__window_seconds > 0):
+                throughput = self.__limit * self.__window_bytes / self.__window_seconds
+            if (self.__window_failed is True):
+                self.__limit = max(self.minimum, self.__limit // 2)
+            elif (self.__best_throughput is None or throughput > self.__best_throughput * (1.0 + self.__INCREASE_THRESHOLD)):
+                self.__limit = min(self.maximum, self.__limit + 1)
+            elif (throughput < self.__best_throughput * (1.0 - self.__DECREASE_THRESHOLD)):
+                self.__limit = max(self.minimum, self.__limit // 2)
+            if (self.__window_failed is False):
+                self.__best_throughput = throughput if self.__best_throughput is None else max(self.__best_throughput, throughput)
+
+            # start a new window
+            self.__window_bytes = 0
+            self.__window_seconds = 0.0
+            self.__window_files = 0
+            self.__window_failed = False
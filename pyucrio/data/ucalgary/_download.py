@@ -0,0 +1,484 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Downloading of data files, using the PyUCRio object's pooled HTTP session.
+
+The files to download can be given as the listings of several time shards, as they are listed,
+in which case the files of the first shards are downloaded while the next are still being listed.
+
+Files are streamed to a '.part' file next to their final location, which is renamed into place
+once complete. An interrupted download leaves the '.part' file behind, and the next download of
+the file resumes from it using an HTTP range request. Transient errors are retried according to
+the PyUCRio object's retry policy, resuming from the partial file, and files that still fail are
+reported in the result instead of aborting the other downloads.
+
+Each file is downloaded while holding a '.lock' file next to it, so that threads and processes
+sharing the same download path don't download the same file at the same time. A file that is
+being downloaded by someone else is waited for instead of being downloaded again (giving up, and
+reporting it as failed, if they stop making progress), and the lock of a download that crashed is
+taken over (resuming from its partial file).
+
+Files are verified as they are downloaded, and recorded in the verification index (see the
+`_verification` module). Files can then be compressed, if the PyUCRio object's
+`download_compression` is set (see the `_compression` module).
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import os
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pyucalgarysrs.data import FileListingResponse
+from ...exceptions import PyUCRioDownloadError
+from ..._util import show_warning
+from ..._filelock import FileLock
+from ..._retry import RetryableError, is_retryable_exception, get_deadline, call_with_retry
+from ._api import iter_urls
+from . import _verification, _compression
+from .classes import FileDownloadResult, FileDownloadFailure
+from ._concurrency import ConcurrencyController, AUTO_N_PARALLEL_INITIAL, AUTO_N_PARALLEL_MIN, AUTO_N_PARALLEL_MAX
+
+# size of the chunks that files are written to disk in
+#
+# NOTE: if a download is interrupted, at most one chunk of what was received is lost
+__CHUNK_SIZE = 64 * 1024
+
+# number of time shards listed in parallel by download()
+__LISTING_N_PARALLEL = 4
+
+# seconds between checks of whether a file being downloaded by someone else is done
+__LOCK_POLL_SECONDS = 0.1
+
+
+def __download_to_part_file(ucrio_obj, url, part_filename, timeout, advance_pbar):
+    """
+    Download a file to its partial filename, resuming from what was downloaded previously, and
+    verify it. Returns the number of bytes downloaded, and the SHA-256 checksum and checks that
+    the file passed. The 'advance_pbar' function is called with the number of bytes as they are
+    written.
+    """
+    # ask for only the missing bytes if some were downloaded already
+    offset = os.path.getsize(part_filename) if (os.path.exists(part_filename) is True) else 0
+    headers = dict(ucrio_obj.api_headers)
+    if (offset > 0):
+        headers["range"] = "bytes=%d-" % (offset)
+
+    # retrieve file
+    with ucrio_obj.http_session.get(url, headers=headers, timeout=timeout, stream=True) as r:
+        # check if we were given a page of HTML instead of the file we asked for
+        #
+        # NOTE: the data server can redirect to the home page when a file doesn't exist, so
+        # we can get back a successful response that is not the file that was asked for.
+        is_html = ("text/html" in r.headers.get("Content-Type", "").lower())
+        if (r.status_code == 200 and is_html is True):
+            raise PyUCRioDownloadError("HTML content received instead of a file when downloading '%s', the " % (url) +
+                                       "file was likely not found on the server")
+
+        # check how the server responded to the range request
+        content_range = r.headers.get("Content-Range", "")
+        expected_digests = _verification.get_expected_digests(r.headers, r.status_code)
+        hashers = _verification.new_hashers(expected_digests)
+        if (offset > 0 and r.status_code == 416 and content_range == "bytes */%d" % (offset)):
+            # the partial file was already complete
+            _verification.hash_file(part_filename, hashers)
+            return 0, __verify(url, part_filename, offset, expected_digests, hashers)
+        elif (offset > 0 and r.status_code == 206 and content_range.startswith("bytes %d-" % (offset)) is True):
+            # resume the partial file
+            #
+            # NOTE: the checksums include what was downloaded previously
+            mode = "ab"
+            advance_pbar(offset)
+            _verification.hash_file(part_filename, hashers)
+            expected_size = int(content_range.partition("/")[2]) if content_range.partition("/")[2].isdigit() else None
+        elif (offset > 0 and r.status_code in [206, 416]):
+            # the partial file doesn't match the file on the server, so we start over
+            os.remove(part_filename)
+            return __download_to_part_file(ucrio_obj, url, part_filename, timeout, advance_pbar)
+        elif (r.status_code == 200):
+            # NOTE: servers that don't support range requests send the whole file
+            mode = "wb"
+            expected_size = None
+            if (r.headers.get("Content-Encoding", "") == "" and r.headers.get("Content-Length", "").isdigit() is True):
+                expected_size = int(r.headers["Content-Length"])
+        else:
+            error = PyUCRioDownloadError("HTTP error %d when downloading '%s'" % (r.status_code, url))
+            if (r.status_code in ucrio_obj.retry_policy.retry_status_codes):
+                raise RetryableError(error)
+            raise error
+
+        # write to disk as the data arrives, computing the checksums as we go
+        bytes_downloaded = 0
+        with open(part_filename, mode) as fp:
+            for chunk in r.iter_content(chunk_size=__CHUNK_SIZE):
+                fp.write(chunk)
+                for hasher in hashers.values():
+                    hasher.update(chunk)
+                bytes_downloaded += len(chunk)
+                advance_pbar(len(chunk))
+
+    # return
+    return bytes_downloaded, __verify(url, part_filename, expected_size, expected_digests, hashers)
+
+
+def __verify(url, part_filename, expected_size, expected_digests, hashers):
+    """
+    Check a downloaded file against the size and checksums sent by the server. Returns the
+    SHA-256 checksum, and the checks that were done.
+    """
+    # NOTE: a file of the wrong size, or with the wrong contents, is likely a transient issue,
+    # so we start over and let it be retried
+    size = os.path.getsize(part_filename)
+    if (expected_size is not None and size != expected_size):
+        os.remove(part_filename)
+        raise RetryableError(
+            PyUCRioDownloadError("Downloaded file '%s' has the wrong size, expected %d bytes but got %d" % (url, expected_size, size)))
+    for algorithm, digest in expected_digests.items():
+        if (hashers[algorithm].digest() != digest):
+            os.remove(part_filename)
+            raise RetryableError(PyUCRioDownloadError("Downloaded file '%s' failed %s checksum verification" % (url, algorithm)))
+
+    # return
+    verified_by = (["size"] if expected_size is not None else []) + sorted(expected_digests.keys())
+    return {"sha256": hashers["sha256"].hexdigest(), "verified_by": ",".join(verified_by)}
+
+
+def __get_lock_holder_progress(output_filename):
+    """
+    Get the sizes of the partial files of a file being downloaded by someone else, which change
+    as they make progress.
+    """
+    progress = []
+    for suffix in [".part", ".tmp"]:
+        try:
+            progress.append(os.path.getsize("%s%s" % (output_filename, suffix)))
+        except OSError:
+            progress.append(None)
+    return tuple(progress)
+
+
+def __download_url(ucrio_obj, url, prefix, output_base_path, dataset_name, timeout, overwrite, deadline, pbar, pbar_iterator_nfiles):
+    # set output filename
+    #
+    # NOTE: files stored compressed have the compression format's suffix added
+    download_filename = Path(output_base_path) / Path(url.removeprefix(prefix + "/"))
+    compression = ucrio_obj.download_compression
+    output_filename = _compression.get_compressed_filename(download_filename, dataset_name, compression)
+    if (output_filename == download_filename):
+        compression = None
+
+    def skip_existing():
+        if (pbar is not None):
+            pbar.update(1 if pbar_iterator_nfiles is True else os.path.getsize(output_filename))
+        return {"filename": output_filename, "bytes_downloaded": 0, "failure": None}
+
+    def is_complete():
+        # NOTE: with overwrite="if_invalid", files are kept if they were verified and haven't changed since
+        if (overwrite is True or os.path.exists(output_filename) is False):
+            return False
+        return overwrite is False or _verification.is_valid(ucrio_obj, output_filename)
+
+    if (is_complete() is True):
+        return skip_existing()
+
+    # create destination directory
+    #
+    # NOTE: when making directories in parallel there can be race conditions, so we
+    # carry on if there are ever issues.
+    try:
+        os.makedirs(os.path.dirname(output_filename), exist_ok=True)
+    except Exception:  # pragma: nocover-ok
+        pass
+
+    # take the lock on the file, waiting while someone else is downloading it
+    #
+    # NOTE: we give up waiting once the deadline passes, or if whoever holds the lock makes
+    # no progress on the file for as long as the request timeout. Once we have the lock, the
+    # file may have been downloaded by whoever held it before us, in which case there's
+    # nothing left to do.
+    lock = FileLock("%s.lock" % (output_filename))
+    progress = None
+    last_progress_time = time.monotonic()
+    while (lock.acquire() is False):
+        now = time.monotonic()
+        current_progress = __get_lock_holder_progress(output_filename)
+        if (current_progress != progress):
+            progress = current_progress
+            last_progress_time = now
+        if ((deadline is not None and now > deadline) or (timeout is not None and now - last_progress_time > timeout)):
+            if (pbar is not None and pbar_iterator_nfiles is True):
+                pbar.update(1)
+            error = "Timed out waiting for '%s' to be downloaded by another process or thread" % (url)
+            return {"filename": None, "bytes_downloaded": 0, "failure": FileDownloadFailure(url=url, error=error, attempts=0)}
+        time.sleep(__LOCK_POLL_SECONDS)
+    try:
+        if (is_complete() is True):
+            return skip_existing()
+        return __download_url_locked(ucrio_obj, url, output_filename, compression, timeout, overwrite, deadline, pbar, pbar_iterator_nfiles)
+    finally:
+        lock.release()
+
+
+def __download_url_locked(ucrio_obj, url, output_filename, compression, timeout, overwrite, deadline, pbar, pbar_iterator_nfiles):
+    # download to a partial file
+    #
+    # NOTE: if the download is interrupted, the partial file is kept so that the next
+    # attempt only needs to retrieve the missing bytes.
+    part_filename = Path("%s.part" % (output_filename))
+    if (overwrite is True and os.path.exists(part_filename) is True):
+        os.remove(part_filename)
+    attempts = 0
+
+    def attempt():
+        nonlocal attempts
+        attempts += 1
+        pbar_bytes = 0
+
+        def advance_pbar(n):
+            nonlocal pbar_bytes
+            if (pbar is not None and pbar_iterator_nfiles is False):
+                pbar.update(n)
+                pbar_bytes += n
+
+        try:
+            return __download_to_part_file(ucrio_obj, url, part_filename, timeout, advance_pbar)
+        except (PyUCRioDownloadError, RetryableError):
+            advance_pbar(-pbar_bytes)
+            raise
+        except Exception as e:
+            advance_pbar(-pbar_bytes)
+            error = PyUCRioDownloadError("Unexpected error when downloading '%s': %s" % (url, str(e)))
+            error.__cause__ = e
+            if (is_retryable_exception(e) is True):
+                raise RetryableError(error) from e
+            raise error from e
+
+    try:
+        bytes_downloaded, verification = call_with_retry(attempt, ucrio_obj.retry_policy, deadline)
+    except PyUCRioDownloadError as e:
+        if (pbar is not None and pbar_iterator_nfiles is True):
+            pbar.update(1)
+        return {"filename": None, "bytes_downloaded": 0, "failure": FileDownloadFailure(url=url, error=str(e), attempts=attempts)}
+
+    # move the complete file into place, compressing it if needed, and record it as verified
+    #
+    # NOTE: the partial file is kept until the compressed file is in place, so that an
+    # interrupted compression doesn't need the file to be downloaded again
+    if (compression is None):
+        os.replace(part_filename, output_filename)
+    else:
+        compressed_part_filename = Path("%s.tmp" % (output_filename))
+        _compression.compress_file(part_filename, compressed_part_filename, compression)
+        os.replace(compressed_part_filename, output_filename)
+        os.remove(part_filename)
+    _verification.record(ucrio_obj, output_filename, verification["sha256"], verification["verified_by"])
+    if (pbar is not None and pbar_iterator_nfiles is True):
+        pbar.update(1)
+
+    # return
+    return {"filename": output_filename, "bytes_downloaded": bytes_downloaded, "failure": None}
+
+
+def __download_urls(ucrio_obj, file_listings, n_parallel, overwrite, progress_bar_disable, progress_bar_ncols, progress_bar_ascii, progress_bar_desc,
+                    timeout, deadline, progress_bar_format_numurls_nobytes):
+    # check parameters
+    if (n_parallel == "auto"):
+        # NOTE: more parallel downloads than HTTP connections would only wait for a connection
+        maximum = max(AUTO_N_PARALLEL_MIN, min(AUTO_N_PARALLEL_MAX, ucrio_obj.http_pool_size))
+        controller = ConcurrencyController(AUTO_N_PARALLEL_INITIAL, AUTO_N_PARALLEL_MIN, maximum)
+    elif (isinstance(n_parallel, int) and not isinstance(n_parallel, bool) and n_parallel >= 1):
+        controller = ConcurrencyController(n_parallel, n_parallel, n_parallel)
+    else:
+        raise ValueError("The n_parallel parameter must be a positive integer, or 'auto'")
+    if (overwrite not in [True, False, "if_invalid"]):
+        raise ValueError("The overwrite parameter must be True, False, or 'if_invalid'")
+
+    # wait for the first listing with files
+    #
+    # NOTE: the listings of several time shards can be given as an iterator, in which case the
+    # files of the first shards are downloaded while the next are still being listed
+    if (isinstance(file_listings, FileListingResponse)):
+        file_listings = [file_listings]
+    file_listings = iter(file_listings)
+    file_listing_obj = None
+    for x in file_listings:
+        file_listing_obj = x
+        if (file_listing_obj.count > 0):
+            break
+    if (file_listing_obj is None):
+        raise ValueError("No file listing was given to download")
+
+    # set output path
+    output_path = Path(ucrio_obj.download_output_root_path) / file_listing_obj.dataset.name
+
+    # check if there's files to download
+    if (file_listing_obj.count == 0):
+        show_warning("No data found to download", stacklevel=5)
+        return FileDownloadResult(filenames=[], count=0, dataset=file_listing_obj.dataset, total_bytes=0, output_root_path=output_path)
+
+    # set timeout
+    if (timeout is None):
+        timeout = ucrio_obj.api_timeout
+
+    # set progress bar description text
+    desc_str = "Downloading %s files" % (file_listing_obj.dataset.name)
+    if (progress_bar_desc is not None):
+        desc_str = progress_bar_desc
+
+    def do_parallel_work(pbar=None, pbar_iterator_nfiles=False):
+        # the files to download, with the path prefix of their listing
+        tasks = []
+        seen_urls = set()
+
+        def add_listing(listing):
+            for url in listing.urls:
+                if (url not in seen_urls):
+                    seen_urls.add(url)
+                    tasks.append((url, listing.path_prefix))
+
+        add_listing(file_listing_obj)
+
+        # NOTE: we keep as many downloads in flight as the controller allows, which can change
+        # as downloads complete, and wait for the next listing alongside them
+        parallel_data = {}
+        with ThreadPoolExecutor(max_workers=controller.maximum) as executor, ThreadPoolExecutor(max_workers=1) as listing_executor:
+            listing_future = listing_executor.submit(next, file_listings, None)
+            in_flight = {}
+            next_idx = 0
+            while (next_idx < len(tasks) or len(in_flight) > 0 or listing_future is not None):
+                while (next_idx < len(tasks) and len(in_flight) < controller.limit):
+                    future = executor.submit(
+                        __download_url,
+                        ucrio_obj,
+                        tasks[next_idx][0],
+                        tasks[next_idx][1],
+                        output_path,
+                        file_listing_obj.dataset.name,
+                        timeout,
+                        overwrite,
+                        deadline,
+                        pbar,
+                        pbar_iterator_nfiles,
+                    )
+                    in_flight[future] = (next_idx, time.monotonic())
+                    next_idx += 1
+                done, _ = wait(list(in_flight.keys()) + ([listing_future] if listing_future is not None else []), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if (future is listing_future):
+                        # add the files of the next listing
+                        listing = listing_future.result()
+                        listing_future = None
+                        if (listing is not None):
+                            n_tasks = len(tasks)
+                            add_listing(listing)
+                            if (pbar is not None):
+                                pbar.total += (len(tasks) - n_tasks) if pbar_iterator_nfiles is True else (listing.total_bytes or 0)
+                                pbar.refresh()
+                            listing_future = listing_executor.submit(next, file_listings, None)
+                        continue
+                    result = future.result()
+                    idx, start_time = in_flight.pop(future)
+                    parallel_data[idx] = result
+
+                    # NOTE: files that already existed don't tell us anything about the throughput
+                    if (result["bytes_downloaded"] > 0 or result["failure"] is not None):
+                        controller.record(result["bytes_downloaded"], time.monotonic() - start_time, result["failure"] is not None)
+        return [parallel_data[i] for i in range(0, len(tasks))]
+
+    # download the urls
+    if (progress_bar_disable is True):
+        parallel_data = do_parallel_work()
+    elif (progress_bar_format_numurls_nobytes is True):
+        # total bytes could be inaccurate, so the progress bar counts files instead
+        with ucrio_obj._tqdm(total=len(file_listing_obj.urls), desc=desc_str, unit="files", ncols=progress_bar_ncols,
+                             ascii=progress_bar_ascii) as pbar:
+            parallel_data = do_parallel_work(pbar=pbar, pbar_iterator_nfiles=True)
+    else:
+        # total bytes is accurate, show MB/s
+        with ucrio_obj._tqdm(total=file_listing_obj.total_bytes,
+                             desc=desc_str,
+                             ncols=progress_bar_ncols,
+                             ascii=progress_bar_ascii,
+                             unit="B",
+                             unit_scale=True) as pbar:
+            parallel_data = do_parallel_work(pbar=pbar)
+
+    # report any files that couldn't be downloaded
+    downloaded_data = [p for p in parallel_data if p["failure"] is None]
+    failures = [p["failure"] for p in parallel_data if p["failure"] is not None]
+    if (len(failures) > 0):
+        show_warning(
+            "%d of %d files could not be downloaded, see the 'failed' attribute of the result for details. The first error was: %s" % (
+                len(failures),
+                len(parallel_data),
+                failures[0].error,
+            ),
+            stacklevel=5,
+        )
+
+    # return
+    return FileDownloadResult(
+        filenames=[p["filename"] for p in downloaded_data],
+        count=len(downloaded_data),
+        dataset=file_listing_obj.dataset,
+        total_bytes=sum([p["bytes_downloaded"] for p in downloaded_data]),
+        output_root_path=output_path,
+        failed=failures,
+        n_parallel=controller.limit,
+        throughput_mb_per_second=controller.throughput / 1e6,
+    )
+
+
+def download(ucrio_obj, dataset_name, start, end, site_uid, n_parallel, overwrite, shard_size, progress_bar_disable, progress_bar_ncols,
+             progress_bar_ascii, progress_bar_desc, timeout):
+    # list the files of each time shard
+    #
+    # NOTE: the files are downloaded as the shards are listed
+    deadline = get_deadline(ucrio_obj.retry_policy)
+    file_listings = iter_urls(ucrio_obj, dataset_name, start, end, site_uid, shard_size, __LISTING_N_PARALLEL, timeout, deadline=deadline)
+
+    # download the urls
+    ucrio_obj.initialize_paths()
+    return __download_urls(
+        ucrio_obj,
+        file_listings,
+        n_parallel,
+        overwrite,
+        progress_bar_disable,
+        progress_bar_ncols,
+        progress_bar_ascii,
+        progress_bar_desc,
+        timeout,
+        deadline,
+        False,
+    )
+
+
+def download_using_urls(ucrio_obj, file_listing_obj, n_parallel, overwrite, progress_bar_disable, progress_bar_ncols, progress_bar_ascii,
+                        progress_bar_desc, timeout):
+    # download the urls
+    ucrio_obj.initialize_paths()
+    return __download_urls(
+        ucrio_obj,
+        file_listing_obj,
+        n_parallel,
+        overwrite,
+        progress_bar_disable,
+        progress_bar_ncols,
+        progress_bar_ascii,
+        progress_bar_desc,
+        timeout,
+        get_deadline(ucrio_obj.retry_policy),
+        True,
+    )
@@ -0,0 +1,220 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Local snapshot of the dataset and observatory metadata, used before asking the API.
+
+The snapshot is a versioned JSON file in the download output root path, with one file per API
+base URL. Each section of it (the datasets, and the observatories of each instrument array) is
+filled in the first time it is retrieved from the API, and is then served from memory or disk
+without contacting the API. Sections older than a day are refreshed in a background thread,
+and the snapshot can also be refreshed explicitly. Copying the file to another machine allows
+it to work without access to the API.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import os
+import json
+import inspect
+import hashlib
+import datetime
+import threading
+from pyucalgarysrs.data import Dataset, Observatory
+from . import _api
+from ...exceptions import PyUCRioAPIError
+
+# snapshot file format version
+__SNAPSHOT_VERSION = 1
+
+# age after which a section is refreshed in the background
+__SNAPSHOT_MAX_AGE = datetime.timedelta(days=1)
+
+# the instrument arrays that have observatories
+__INSTRUMENT_ARRAYS = ["norstar_riometer", "swan_hsr"]
+
+# in-memory copies of the snapshot files, and the sections being refreshed
+__snapshot_cache = {}
+__snapshot_lock = threading.Lock()
+__refreshing = set()
+
+
+def get_snapshot_filename(ucrio_obj):
+    """
+    Get the filename of the snapshot for the PyUCRio object's API base URL.
+    """
+    url_hash = hashlib.sha256(str(ucrio_obj.api_base_url).encode()).hexdigest()[0:16]
+    return os.path.join(str(ucrio_obj.download_output_root_path), ".metadata_snapshot_%s.json" % (url_hash))
+
+
+def __load_snapshot(filename):
+    """
+    Load a snapshot, from memory or disk. Must be called with the lock held.
+    """
+    if (filename in __snapshot_cache):
+        return __snapshot_cache[filename]
+    snapshot = {"version": __SNAPSHOT_VERSION, "sections": {}}
+    if (os.path.exists(filename) is True):
+        try:
+            with open(filename, "r") as fp:
+                from_disk = json.load(fp)
+            if (from_disk.get("version") == __SNAPSHOT_VERSION):
+                snapshot = from_disk
+        except Exception:
+            # corrupt or incompatible file, we'll regenerate it
+            pass
+    __snapshot_cache[filename] = snapshot
+    return snapshot
+
+
+def __store_section(filename, api_base_url, section, items):
+    """
+    Update a section of the snapshot, in memory and on disk.
+
+    NOTE: we write to a temporary file first and then move it into place, so that concurrent
+    readers never see a partially written file. Failing to write (ie. a read-only path) only
+    means the snapshot is not kept for the next process.
+    """
+    with __snapshot_lock:
+        snapshot = __load_snapshot(filename)
+        snapshot["api_base_url"] = api_base_url
+        snapshot["sections"][section] = {"updated": datetime.datetime.now(datetime.timezone.utc).isoformat(), "items": items}
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            tmp_filename = "%s.%d.%d.tmp" % (filename, os.getpid(), threading.get_ident())
+            with open(tmp_filename, "w") as fp:
+                json.dump(snapshot, fp)
+            os.replace(tmp_filename, filename)
+        except OSError:  # pragma: nocover-ok
+            pass
+
+
+def __fetch_section(ucrio_obj, section, timeout):
+    """
+    Retrieve a section from the API, as JSON-serializable items.
+    """
+    if (section == "datasets"):
+        dataset_params = list(inspect.signature(Dataset.__init__).parameters.keys())[1:]
+        datasets = _api.list_datasets(ucrio_obj, None, "pyucrio", timeout)
+        return [{k: getattr(d, k) for k in dataset_params} for d in datasets]
+    else:
+        instrument_array = section.split(":", 1)[1]
+        observatories = _api.list_observatories(ucrio_obj, instrument_array, None, timeout)
+        return [{
+            "uid": o.uid,
+            "full_name": o.full_name,
+            "geodetic_latitude": o.geodetic_latitude,
+            "geodetic_longitude": o.geodetic_longitude,
+        } for o in observatories]
+
+
+def __refresh_section(ucrio_obj, filename, section, timeout):
+    items = __fetch_section(ucrio_obj, section, timeout)
+    __store_section(filename, ucrio_obj.api_base_url, section, items)
+
+
+def __refresh_section_in_background(ucrio_obj, filename, section):
+    """
+    Refresh a section in a background thread, unless it is already being refreshed.
+    """
+    key = (filename, section)
+    with __snapshot_lock:
+        if (key in __refreshing):
+            return
+        __refreshing.add(key)
+
+    def refresh():
+        try:
+            __refresh_section(ucrio_obj, filename, section, None)
+        except Exception:
+            # keep using the snapshot, we'll try again next time
+            pass
+        finally:
+            with __snapshot_lock:
+                __refreshing.discard(key)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+def __get_items(ucrio_obj, section, timeout):
+    """
+    Get the items of a section, from the snapshot if possible or otherwise the API.
+    """
+    filename = get_snapshot_filename(ucrio_obj)
+    with __snapshot_lock:
+        entry = __load_snapshot(filename)["sections"].get(section)
+
+    # not in the snapshot yet
+    if (entry is None):
+        items = __fetch_section(ucrio_obj, section, timeout)
+        __store_section(filename, ucrio_obj.api_base_url, section, items)
+        return items
+
+    # refresh in the background if it's getting old
+    try:
+        age = datetime.datetime.now(datetime.timezone.utc) - datetime.datetime.fromisoformat(entry["updated"])
+    except Exception:
+        age = __SNAPSHOT_MAX_AGE
+    if (age >= __SNAPSHOT_MAX_AGE):
+        __refresh_section_in_background(ucrio_obj, filename, section)
+
+    # return
+    return entry["items"]
+
+
+def list_datasets(ucrio_obj, name, timeout):
+    datasets = [Dataset(**x) for x in __get_items(ucrio_obj, "datasets", timeout)]
+    if (name is not None):
+        datasets = [d for d in datasets if name.lower() in d.name.lower()]
+    return datasets
+
+
+def get_dataset(ucrio_obj, name, timeout):
+    for dataset in list_datasets(ucrio_obj, None, timeout):
+        if (dataset.name == name):
+            return dataset
+
+    # not a dataset supported by this library, so we ask the API directly
+    for dataset in _api.list_datasets(ucrio_obj, name.upper(), "pyucalgarysrs", timeout):
+        if (dataset.name == name.upper()):
+            return dataset
+    raise PyUCRioAPIError("Dataset not found")
+
+
+def list_observatories(ucrio_obj, instrument_array, uid, timeout):
+    observatories = [Observatory(**x) for x in __get_items(ucrio_obj, "observatories:%s" % (instrument_array), timeout)]
+    if (uid is not None):
+        observatories = [o for o in observatories if o.uid == uid]
+    return observatories
+
+
+def refresh_snapshot(ucrio_obj, background, timeout):
+    filename = get_snapshot_filename(ucrio_obj)
+    sections = ["datasets"] + ["observatories:%s" % (x) for x in __INSTRUMENT_ARRAYS]
+    if (background is True):
+        for section in sections:
+            __refresh_section_in_background(ucrio_obj, filename, section)
+    else:
+        for section in sections:
+            __refresh_section(ucrio_obj, filename, section, timeout)
+
+    # return
+    return filename
+
+
+def clear_cache():
+    """
+    Clear the in-memory copies of the snapshot files.
+    """
+    with __snapshot_lock:
+        __snapshot_cache.clear()
@@ -0,0 +1,95 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Cached spatial indexes over observatory locations.
+
+NOTE: with only tens of observatories, a brute-force vectorized distance computation is faster
+than building and querying a tree, so the index is just the precomputed unit vectors of the
+observatory locations (see `classes.ObservatoryIndex`).
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import datetime
+import threading
+import numpy as np
+from collections import OrderedDict
+from .classes import ObservatoryIndex
+
+# the instrument arrays that have observatories
+__INSTRUMENT_ARRAYS = ["norstar_riometer", "swan_hsr"]
+
+# cache of indexes
+__INDEX_CACHE_MAX_SIZE = 16
+__index_cache = OrderedDict()
+__index_cache_lock = threading.Lock()
+
+
+def observatory_index(ucrio_obj, instrument_array, coordinates, timestamp, use_cache, timeout):
+    # check parameters
+    if (coordinates not in ["geodetic", "aacgm"]):
+        raise ValueError("The coordinates parameter must be 'geodetic' or 'aacgm'")
+    if (instrument_array is None):
+        instrument_array = list(__INSTRUMENT_ARRAYS)
+    elif (isinstance(instrument_array, str)):
+        instrument_array = [instrument_array]
+    if (coordinates == "aacgm"):
+        if (timestamp is None):
+            timestamp = datetime.datetime.now(datetime.timezone.utc)
+        # NOTE: the AACGM coefficients are evaluated at the start of the day
+        timestamp = datetime.datetime.combine(timestamp.date(), datetime.time())
+    else:
+        timestamp = None
+
+    # check the cache
+    cache_key = (ucrio_obj.api_base_url, tuple(instrument_array), coordinates, timestamp)
+    if (use_cache is True):
+        with __index_cache_lock:
+            if (cache_key in __index_cache):
+                __index_cache.move_to_end(cache_key)
+                return __index_cache[cache_key]
+
+    # gather the observatories
+    observatories = []
+    instrument_array_list = []
+    for instrument in instrument_array:
+        instrument_observatories = ucrio_obj.data.ucalgary.list_observatories(instrument, timeout=timeout)
+        observatories.extend(instrument_observatories)
+        instrument_array_list.extend([instrument] * len(instrument_observatories))
+    latitudes = np.array([x.geodetic_latitude for x in observatories], dtype=np.float64)
+    longitudes = np.array([x.geodetic_longitude for x in observatories], dtype=np.float64)
+
+    # convert all locations at once
+    if (coordinates == "aacgm" and len(observatories) > 0):
+        import aacgmv2  # NOTE: imported here so that it is only loaded when needed
+        latitudes, longitudes, _ = aacgmv2.convert_latlon_arr(latitudes, longitudes, latitudes * 0.0, timestamp, method_code="G2A")
+    index = ObservatoryIndex(observatories, instrument_array_list, latitudes, longitudes, coordinates=coordinates, timestamp=timestamp)
+
+    # add to cache, evicting the least recently used entry if necessary
+    if (use_cache is True):
+        with __index_cache_lock:
+            __index_cache[cache_key] = index
+            if (len(__index_cache) > __INDEX_CACHE_MAX_SIZE):
+                __index_cache.popitem(last=False)
+
+    # return
+    return index
+
+
+def clear_cache():
+    """
+    Clear the in-memory observatory index cache.
+    """
+    with __index_cache_lock:
+        __index_cache.clear()
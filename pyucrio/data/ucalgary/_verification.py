@@ -0,0 +1,162 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Verification of downloaded files, and the local index of the files that were verified.
+
+Checksums are computed while a file is downloaded, as its chunks are written to disk. The file is
+checked against the size the server reports, and against any checksums the server sends in the
+'Repr-Digest', 'Digest', or 'Content-MD5' headers. A file that doesn't match is downloaded again.
+
+Files that pass are recorded in an SQLite database in the download output root path, with their
+size, modification time, and SHA-256 checksum. A file that still has the recorded size and
+modification time is known to be valid without reading it again, which is what
+`overwrite="if_invalid"` relies on.
+
+NOTE: SQLite handles concurrent access to the index, so processes sharing the same download
+output root path can share the index as well.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import os
+import base64
+import sqlite3
+import hashlib
+import datetime
+
+# name of the index file in the download output root path
+__INDEX_FILENAME = ".verification_index.sqlite"
+
+# seconds to wait for another process writing to the index
+__INDEX_TIMEOUT = 30.0
+
+# checksum algorithms the server can send, by their name in the headers
+__DIGEST_ALGORITHMS = {"sha-256": "sha256", "sha-512": "sha512", "md5": "md5"}
+
+
+def get_index_filename(ucrio_obj):
+    """
+    Get the filename of the verification index.
+    """
+    return os.path.join(str(ucrio_obj.download_output_root_path), __INDEX_FILENAME)
+
+
+def __connect(ucrio_obj):
+    conn = sqlite3.connect(get_index_filename(ucrio_obj), timeout=__INDEX_TIMEOUT)
+    conn.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT, "
+                 "verified_by TEXT, verified_at TEXT)")
+    return conn
+
+
+def __index_key(ucrio_obj, filename):
+    # NOTE: paths are relative to the root path, so the index stays valid if it is moved
+    return os.path.relpath(os.path.abspath(filename), os.path.abspath(str(ucrio_obj.download_output_root_path)))
+
+
+def get_expected_digests(headers, status_code):
+    """
+    Get the checksums of the whole file sent by the server, as a dictionary of hashlib algorithm
+    names to digests.
+    """
+    expected = {}
+
+    # RFC 9530 'Repr-Digest', and RFC 3230 'Digest', are for the whole file even in partial responses
+    for item in headers.get("Repr-Digest", "").split(","):
+        algorithm, _, value = item.strip().partition("=")
+        if (algorithm.lower() in __DIGEST_ALGORITHMS and value.startswith(":") and value.endswith(":") and len(value) > 2):
+            expected[__DIGEST_ALGORITHMS[algorithm.lower()]] = base64.b64decode(value[1:-1])
+    for item in headers.get("Digest", "").split(","):
+        algorithm, _, value = item.strip().partition("=")
+        if (algorithm.lower() in __DIGEST_ALGORITHMS and value != ""):
+            expected.setdefault(__DIGEST_ALGORITHMS[algorithm.lower()], base64.b64decode(value))
+
+    # 'Content-MD5' is for the body only, so we can only use it for the whole file
+    if (status_code == 200 and headers.get("Content-MD5", "") != ""):
+        expected.setdefault("md5", base64.b64decode(headers["Content-MD5"]))
+
+    # return
+    return expected
+
+
+def record(ucrio_obj, filename, sha256, verified_by):
+    """
+    Record a verified file in the index.
+    """
+    stat = os.stat(filename)
+    conn = __connect(ucrio_obj)
+    try:
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", (
+                __index_key(ucrio_obj, filename),
+                stat.st_size,
+                stat.st_mtime_ns,
+                sha256,
+                verified_by,
+                datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            ))
+    finally:
+        conn.close()
+
+
+def lookup(ucrio_obj, filename):
+    """
+    Get the index entry of a file, or None if it isn't in the index.
+    """
+    if (os.path.exists(get_index_filename(ucrio_obj)) is False):
+        return None
+    conn = __connect(ucrio_obj)
+    try:
+        row = conn.execute("SELECT size, mtime_ns, sha256, verified_by, verified_at FROM files WHERE path = ?",
+                           (__index_key(ucrio_obj, filename), )).fetchone()
+    finally:
+        conn.close()
+    if (row is None):
+        return None
+    return {"size": row[0], "mtime_ns": row[1], "sha256": row[2], "verified_by": row[3], "verified_at": row[4]}
+
+
+def is_valid(ucrio_obj, filename):
+    """
+    Check if a file was verified, and hasn't changed since. Files that aren't in the index (ie.
+    downloaded by an older version of the library) are not known to be valid.
+    """
+    entry = lookup(ucrio_obj, filename)
+    if (entry is None):
+        return False
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return False
+    return (stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"])
+
+
+def hash_file(filename, hashers):
+    """
+    Update the hashers with the contents of a file.
+    """
+    with open(filename, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1024 * 1024), b""):
+            for hasher in hashers.values():
+                hasher.update(chunk)
+
+
+def new_hashers(expected_digests):
+    """
+    Create the hashers for a download, SHA-256 for the index plus any the server sent.
+    """
+    hashers = {"sha256": hashlib.sha256()}
+    for algorithm in expected_digests:
+        if (algorithm not in hashers):
+            hashers[algorithm] = hashlib.new(algorithm)
+    return hashers
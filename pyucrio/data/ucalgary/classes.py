@@ -0,0 +1,667 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Class representations for data availability, observatory location information, and downloads.
+"""
+
+import os
+import random
+import datetime
+import numpy as np
+import pyucalgarysrs
+from dataclasses import dataclass, field
+from typing import List, Literal, Optional, Tuple, Union, Sequence, Any
+from numpy import ndarray
+from pyucalgarysrs.data import Observatory
+from ..._util import show_warning
+
+
+@dataclass
+class AvailabilityMatrix:
+    """
+    Class representation for the data availability of a dataset, for each site and time bin.
+
+    Attributes:
+        dataset_name (str): 
+            The dataset the availability was determined for.
+
+        site_uid_list (List[str]): 
+            The sites included, in the order used to index the rows of `available`.
+
+        timestamps (List[datetime.datetime]): 
+            The start of each time bin, in the order used to index the columns of `available`.
+
+        resolution (str): 
+            The size of each time bin. Either `day` or `hour`.
+
+        available (ndarray): 
+            Boolean matrix with shape (n_sites, n_bins). Element `[i, j]` is True if there is at least
+            one data file for site `i` during time bin `j`.
+    """
+    dataset_name: str
+    site_uid_list: List[str]
+    timestamps: List[datetime.datetime]
+    resolution: Literal["day", "hour"]
+    available: ndarray
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return "AvailabilityMatrix(dataset_name='%s', site_uid_list=%s, timestamps=[%d timestamps], resolution='%s', available=array(dims=%s))" % (
+            self.dataset_name,
+            self.site_uid_list,
+            len(self.timestamps),
+            self.resolution,
+            self.available.shape,
+        )
+
+    def pretty_print(self):
+        """
+        A special print output for this class.
+        """
+        print("AvailabilityMatrix:")
+        print("  %-14s: %s" % ("dataset_name", self.dataset_name))
+        print("  %-14s: %s" % ("site_uid_list", self.site_uid_list))
+        print("  %-14s: [%d timestamps]" % ("timestamps", len(self.timestamps)))
+        print("  %-14s: %s" % ("resolution", self.resolution))
+        print("  %-14s: array(dims=%s, dtype=%s)" % ("available", self.available.shape, self.available.dtype))
+
+    def plot(self,
+             cmap: str = "Greens",
+             figsize: Optional[Tuple[int, int]] = None,
+             title: Optional[str] = None,
+             date_format: Optional[str] = None,
+             returnfig: bool = False,
+             savefig: bool = False,
+             savefig_filename: Optional[str] = None,
+             savefig_quality: Optional[int] = None) -> Any:
+        """
+        Plot the availability matrix as a heatmap, with a row for each site.
+
+        Args:
+            cmap (str): 
+                The matplotlib colormap to use. Default is `Greens`.
+
+            figsize (tuple): 
+                The matplotlib figure size to use when plotting. For example `figsize=(14,4)`.
+
+            title (str): 
+                The title to display above the plotted heatmap. Default is the dataset name.
+
+            date_format (str): 
+                The format of the x-axis labels, as used by `datetime.strftime()`. Default is `%Y-%m-%d`.
+
+            returnfig (bool): 
+                Instead of displaying the image, return the matplotlib figure object. This allows for further plot
+                manipulation, for example, adding labels or a title in a different location than the default.
+
+                Remember - if this parameter is supplied, be sure that you close your plot after finishing work
+                with it. This can be achieved by doing `plt.close(fig)`.
+
+                Note that this method cannot be used in combination with `savefig`.
+
+            savefig (bool): 
+                Save the displayed image to disk instead of displaying it. The parameter savefig_filename is required if
+                this parameter is set to True. Defaults to `False`.
+
+            savefig_filename (str): 
+                Filename to save the image to. Must be specified if the savefig parameter is set to True.
+
+            savefig_quality (int): 
+                Quality level of the saved image. This can be specified if the savefig_filename is a JPG image. If it
+                is a PNG, quality is ignored. Default quality level for JPGs is matplotlib/Pillow's default of 75%.
+
+        Returns:
+            The displayed heatmap, by default. If `savefig` is set to True, nothing will be returned. If `returnfig` is
+            set to True, the plotting variables `(fig, ax)` will be returned.
+
+        Raises:
+            ValueError: issues encountered with supplied parameters
+        """
+        # NOTE: imported here so that matplotlib is only loaded when plotting
+        import matplotlib.pyplot as plt
+        import matplotlib.dates as mdates
+
+        # check return mode
+        if (returnfig is True and savefig is True):
+            raise ValueError("Only one of returnfig or savefig can be set to True")
+        if (returnfig is True and (savefig_filename is not None or savefig_quality is not None)):
+            show_warning("The figure will be returned, but a savefig option parameter was supplied. Consider " +
+                         "removing the savefig option parameter(s) as they will be ignored.")
+        elif (savefig is False and (savefig_filename is not None or savefig_quality is not None)):
+            show_warning("A savefig option parameter was supplied, but the savefig parameter is False. The " +
+                         "savefig option parameters will be ignored.")
+
+        # determine the bin edges
+        bin_size = datetime.timedelta(days=1) if self.resolution == "day" else datetime.timedelta(hours=1)
+        if (len(self.timestamps) > 0):
+            time_edges = mdates.date2num(list(self.timestamps) + [self.timestamps[-1] + bin_size])
+        else:
+            time_edges = np.zeros(1)
+        row_edges = np.arange(0, len(self.site_uid_list) + 1) - 0.5
+
+        # render as a single image
+        fig = plt.figure(figsize=figsize)
+        ax = fig.add_subplot()
+        ax.pcolormesh(time_edges, row_edges, self.available.astype(np.uint8), cmap=cmap, vmin=0, vmax=1, shading="flat", rasterized=True)
+
+        # label each row with the site
+        ax.set_yticks(np.arange(0, len(self.site_uid_list)))
+        ax.set_yticklabels([x.upper() for x in self.site_uid_list])
+        ax.invert_yaxis()
+
+        # format the x-axis (dates)
+        ax.xaxis_date()
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d" if date_format is None else date_format))
+        fig.autofmt_xdate()
+
+        # add title
+        ax.set_title(self.dataset_name if title is None else title)
+
+        # save figure or show it
+        if (savefig is True):
+            # check that filename has been set
+            if (savefig_filename is None):
+                raise ValueError("The savefig_filename parameter is missing, but required since savefig was set to True.")
+
+            # save the figure
+            f_extension = os.path.splitext(savefig_filename)[-1].lower()
+            if (".jpg" == f_extension or ".jpeg" == f_extension):
+                # check quality setting
+                if (savefig_quality is not None):  # pragma: nocover-ok
+                    plt.savefig(savefig_filename, quality=savefig_quality, bbox_inches="tight")
+                else:
+                    plt.savefig(savefig_filename, bbox_inches="tight")
+            else:
+                if (savefig_quality is not None):
+                    # quality specified, but output filename is not a JPG, so show a warning
+                    show_warning("The savefig_quality parameter was specified, but is only used for saving JPG files. The " +
+                                 "savefig_filename parameter was determined to not be a JPG file, so the quality will be ignored")
+                plt.savefig(savefig_filename, bbox_inches="tight")
+
+            # clean up by closing the figure
+            plt.close(fig)
+
+        elif (returnfig is True):
+            # return the figure and axis objects
+            return (fig, ax)
+        else:
+            # show the figure
+            plt.show(fig)
+
+            # cleanup by closing the figure
+            plt.close(fig)
+
+        # return
+        return None
+
+
+@dataclass
+class ObservatoryMatch:
+    """
+    An observatory found by a query of an `ObservatoryIndex`.
+
+    Attributes:
+        uid (str): 
+            The observatory's unique identifier.
+
+        instrument_array (str): 
+            The instrument array the observatory is part of.
+
+        latitude (float): 
+            Latitude of the observatory, in the coordinate system of the index.
+
+        longitude (float): 
+            Longitude of the observatory, in the coordinate system of the index.
+
+        distance_km (float): 
+            Great-circle distance from the query location, in kilometres.
+
+        observatory (Observatory): 
+            The full observatory information.
+    """
+    uid: str
+    instrument_array: str
+    latitude: float
+    longitude: float
+    distance_km: float
+    observatory: Observatory
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return "ObservatoryMatch(uid='%s', instrument_array='%s', latitude=%.2f, longitude=%.2f, distance_km=%.1f)" % (
+            self.uid,
+            self.instrument_array,
+            self.latitude,
+            self.longitude,
+            self.distance_km,
+        )
+
+    def pretty_print(self):
+        """
+        A special print output for this class.
+        """
+        print("ObservatoryMatch:")
+        print("  %-16s: %s" % ("uid", self.uid))
+        print("  %-16s: %s" % ("instrument_array", self.instrument_array))
+        print("  %-16s: %.2f" % ("latitude", self.latitude))
+        print("  %-16s: %.2f" % ("longitude", self.longitude))
+        print("  %-16s: %.1f" % ("distance_km", self.distance_km))
+        print("  %-16s: %s" % ("observatory", self.observatory))
+
+
+class ObservatoryIndex:
+    """
+    Index over the locations of observatories, for finding the observatories within a distance of, or
+    nearest to, one or more locations. Distances are great-circle distances on a spherical Earth.
+
+    All queries are vectorized over the query locations, and can be restricted to a single instrument 
+    array. The UIDs of the matches can be used to select sites for `rio.tools.site_map.create_map()`, or
+    to download data for.
+
+    Attributes:
+        observatories (List[Observatory]): 
+            The observatories in the index.
+
+        instrument_array_list (List[str]): 
+            The instrument array of each observatory.
+
+        coordinates (str): 
+            The coordinate system of the index, either `geodetic` or `aacgm`.
+
+        timestamp (datetime.datetime): 
+            The time used to convert the observatory locations to AACGM coordinates, or None for
+            geodetic coordinates.
+
+        latitudes (ndarray): 
+            The latitude of each observatory, in the coordinate system of the index.
+
+        longitudes (ndarray): 
+            The longitude of each observatory, in the coordinate system of the index.
+    """
+
+    # mean radius of the Earth
+    __EARTH_RADIUS_KM = 6371.0
+
+    def __init__(self,
+                 observatories: List[Observatory],
+                 instrument_array_list: List[str],
+                 latitudes: ndarray,
+                 longitudes: ndarray,
+                 coordinates: Literal["geodetic", "aacgm"] = "geodetic",
+                 timestamp: Optional[datetime.datetime] = None):
+        self.observatories = observatories
+        self.instrument_array_list = instrument_array_list
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.coordinates = coordinates
+        self.timestamp = timestamp
+
+        # precompute unit vectors, so that distances only need a dot product
+        self.__vectors = self.__to_unit_vectors(self.latitudes, self.longitudes)
+        self.__instrument_arrays = np.array(instrument_array_list, dtype=object)
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return "ObservatoryIndex(observatories=[%d observatories], instrument_arrays=%s, coordinates='%s', timestamp=%s)" % (
+            len(self.observatories),
+            sorted(set(self.instrument_array_list)),
+            self.coordinates,
+            self.timestamp.__repr__(),
+        )
+
+    def pretty_print(self):
+        """
+        A special print output for this class.
+        """
+        print("ObservatoryIndex:")
+        print("  %-21s: [%d observatories]" % ("observatories", len(self.observatories)))
+        print("  %-21s: %s" % ("instrument_array_list", sorted(set(self.instrument_array_list))))
+        print("  %-21s: %s" % ("coordinates", self.coordinates))
+        print("  %-21s: %s" % ("timestamp", self.timestamp))
+
+    @staticmethod
+    def __to_unit_vectors(latitude, longitude):
+        lat = np.deg2rad(np.asarray(latitude, dtype=np.float64))
+        lon = np.deg2rad(np.asarray(longitude, dtype=np.float64))
+        return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+    def __distances(self, latitude, longitude, instrument_array):
+        """
+        Compute the distance (km) from each query location to each observatory, with shape
+        (n_locations, n_observatories). Observatories of other instrument arrays are at an infinite
+        distance.
+        """
+        query_vectors = self.__to_unit_vectors(np.atleast_1d(latitude), np.atleast_1d(longitude))
+        cos_angle = np.clip(query_vectors @ self.__vectors.T, -1.0, 1.0)
+        distances = self.__EARTH_RADIUS_KM * np.arccos(cos_angle)
+        if (instrument_array is not None):
+            distances[:, self.__instrument_arrays != instrument_array] = np.inf
+        return distances
+
+    def __match(self, idx, distance):
+        return ObservatoryMatch(
+            uid=self.observatories[idx].uid,
+            instrument_array=self.instrument_array_list[idx],
+            latitude=float(self.latitudes[idx]),
+            longitude=float(self.longitudes[idx]),
+            distance_km=float(distance),
+            observatory=self.observatories[idx],
+        )
+
+    def location(self, site_uid: str, instrument_array: Optional[str] = None) -> Tuple[float, float]:
+        """
+        Get the location of an observatory, in the coordinate system of the index.
+
+        Args:
+            site_uid (str): 
+                The observatory's unique identifier.
+
+            instrument_array (str): 
+                The instrument array of the observatory. Default is the first observatory found with 
+                the UID, in any instrument array.
+
+        Returns:
+            The latitude and longitude of the observatory.
+
+        Raises:
+            ValueError: the observatory was not found
+        """
+        for i, observatory in enumerate(self.observatories):
+            if (observatory.uid == site_uid and (instrument_array is None or self.instrument_array_list[i] == instrument_array)):
+                return (float(self.latitudes[i]), float(self.longitudes[i]))
+        raise ValueError("Observatory '%s' was not found in the index" % (site_uid))
+
+    def query_radius(self,
+                     latitude: Union[float, Sequence[float], ndarray],
+                     longitude: Union[float, Sequence[float], ndarray],
+                     radius_km: float,
+                     instrument_array: Optional[str] = None) -> Union[List[ObservatoryMatch], List[List[ObservatoryMatch]]]:
+        """
+        Find the observatories within a distance of one or more locations.
+
+        Args:
+            latitude (float or ndarray): 
+                Latitude(s) of the query location(s), in the coordinate system of the index.
+
+            longitude (float or ndarray): 
+                Longitude(s) of the query location(s), in the coordinate system of the index.
+
+            radius_km (float): 
+                The maximum distance, in kilometres.
+
+            instrument_array (str): 
+                Only include observatories of this instrument array. Default is all instrument arrays.
+
+        Returns:
+            A list of `ObservatoryMatch` objects, ordered by distance. If multiple query locations are 
+            given, a list of these lists is returned, one for each location.
+        """
+        distances = self.__distances(latitude, longitude, instrument_array)
+        results = []
+        for i in range(0, distances.shape[0]):
+            idx = np.nonzero(distances[i, :] <= radius_km)[0]
+            idx = idx[np.argsort(distances[i, idx], kind="stable")]
+            results.append([self.__match(j, distances[i, j]) for j in idx])
+
+        # return
+        if (np.ndim(latitude) == 0):
+            return results[0]
+        return results
+
+    def query_nearest(self,
+                      latitude: Union[float, Sequence[float], ndarray],
+                      longitude: Union[float, Sequence[float], ndarray],
+                      k: int = 1,
+                      instrument_array: Optional[str] = None) -> Union[List[ObservatoryMatch], List[List[ObservatoryMatch]]]:
+        """
+        Find the observatories nearest to one or more locations.
+
+        Args:
+            latitude (float or ndarray): 
+                Latitude(s) of the query location(s), in the coordinate system of the index.
+
+            longitude (float or ndarray): 
+                Longitude(s) of the query location(s), in the coordinate system of the index.
+
+            k (int): 
+                The number of observatories to find for each location. Default is `1`.
+
+            instrument_array (str): 
+                Only include observatories of this instrument array. Default is all instrument arrays.
+
+        Returns:
+            A list of up to `k` `ObservatoryMatch` objects, ordered by distance. If multiple query locations 
+            are given, a list of these lists is returned, one for each location.
+
+        Raises:
+            ValueError: issues encountered with supplied parameters
+        """
+        if (k < 1):
+            raise ValueError("The k parameter must be at least 1")
+
+        # find the k nearest of every location at once
+        distances = self.__distances(latitude, longitude, instrument_array)
+        k = min(k, distances.shape[1])
+        if (k < distances.shape[1]):
+            nearest_idx = np.argpartition(distances, k - 1, axis=1)[:, 0:k]
+        else:
+            nearest_idx = np.tile(np.arange(0, distances.shape[1]), (distances.shape[0], 1))
+        nearest_distances = np.take_along_axis(distances, nearest_idx, axis=1)
+        order = np.argsort(nearest_distances, axis=1, kind="stable")
+        nearest_idx = np.take_along_axis(nearest_idx, order, axis=1)
+        nearest_distances = np.take_along_axis(nearest_distances, order, axis=1)
+
+        # build the matches, excluding observatories of other instrument arrays
+        results = []
+        for i in range(0, distances.shape[0]):
+            results.append([self.__match(j, d) for j, d in zip(nearest_idx[i, :], nearest_distances[i, :], strict=True) if np.isfinite(d)])
+
+        # return
+        if (np.ndim(latitude) == 0):
+            return results[0]
+        return results
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Settings for retrying API requests and file downloads that fail with a transient error, such
+    as a dropped connection, a timeout, or a 5xx response from the server.
+
+    Attributes:
+        max_attempts (int): 
+            The maximum number of attempts for each request, including the first one. Use `1` to
+            disable retries. Default is `3`.
+
+        backoff_initial (float): 
+            The delay before the first retry, in seconds. The delay doubles for each subsequent
+            retry. Default is `0.5`.
+
+        backoff_max (float): 
+            The maximum delay between retries, in seconds. Default is `30.0`.
+
+        jitter (bool): 
+            Randomize each delay between zero and its full value, so that parallel requests which
+            failed together don't retry together. Default is `True`.
+
+        deadline (float): 
+            The overall time limit for a `get_urls()`, `download()`, or similar call, in seconds. Requests
+            are not retried if the retry would start after this limit. Default is `None`, meaning no limit.
+
+        retry_status_codes (List[int]): 
+            The HTTP status codes to retry. Default is `[429, 500, 502, 503, 504]`.
+
+        hedge_after (float): 
+            For API requests (ie. listings), send a second identical request if there has been no
+            response after this many seconds, and use whichever response arrives first. This reduces
+            the impact of the occasional slow response. Default is `None`, meaning disabled.
+    """
+    max_attempts: int = 3
+    backoff_initial: float = 0.5
+    backoff_max: float = 30.0
+    jitter: bool = True
+    deadline: Optional[float] = None
+    retry_status_codes: List[int] = field(default_factory=lambda: [429, 500, 502, 503, 504])
+    hedge_after: Optional[float] = None
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return ("RetryPolicy(max_attempts=%d, backoff_initial=%s, backoff_max=%s, jitter=%s, deadline=%s, retry_status_codes=%s, " +
+                "hedge_after=%s)") % (
+                    self.max_attempts,
+                    self.backoff_initial,
+                    self.backoff_max,
+                    self.jitter,
+                    self.deadline,
+                    self.retry_status_codes,
+                    self.hedge_after,
+                )
+
+    def pretty_print(self):
+        """
+        A special print output for this class.
+        """
+        print("RetryPolicy:")
+        print("  %-18s: %s" % ("max_attempts", self.max_attempts))
+        print("  %-18s: %s" % ("backoff_initial", self.backoff_initial))
+        print("  %-18s: %s" % ("backoff_max", self.backoff_max))
+        print("  %-18s: %s" % ("jitter", self.jitter))
+        print("  %-18s: %s" % ("deadline", self.deadline))
+        print("  %-18s: %s" % ("retry_status_codes", self.retry_status_codes))
+        print("  %-18s: %s" % ("hedge_after", self.hedge_after))
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Get the delay before retrying, after the given attempt number (starting at 1) failed.
+
+        Args:
+            attempt (int): 
+                The attempt number that failed.
+
+        Returns:
+            The delay in seconds.
+        """
+        delay = min(self.backoff_max, self.backoff_initial * (2.0**(attempt - 1)))
+        if (self.jitter is True):
+            delay = random.uniform(0.0, delay)  # nosec
+        return delay
+
+
+@dataclass
+class FileDownloadFailure:
+    """
+    A file that could not be downloaded.
+
+    Attributes:
+        url (str): 
+            The URL of the file.
+
+        error (str): 
+            The error encountered on the last attempt.
+
+        attempts (int): 
+            The number of attempts made.
+    """
+    url: str
+    error: str
+    attempts: int
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return "FileDownloadFailure(url='%s', error='%s', attempts=%d)" % (self.url, self.error, self.attempts)
+
+    def pretty_print(self):
+        """
+        A special print output for this class.
+        """
+        print("FileDownloadFailure:")
+        print("  %-8s: %s" % ("url", self.url))
+        print("  %-8s: %s" % ("error", self.error))
+        print("  %-8s: %s" % ("attempts", self.attempts))
+
+
+@dataclass
+class FileDownloadResult(pyucalgarysrs.data.FileDownloadResult):
+    """
+    Representation of the results from a data download call.
+
+    Attributes:
+        filenames (List[str]): 
+            List of downloaded files, as absolute paths of their location on the local machine.
+        
+        count (int): 
+            Number of files downloaded
+        
+        total_bytes (int): 
+            Cumulative amount of bytes saved on the local machine.
+        
+        output_root_path (str): 
+            The root path of where the data was saved to on the local machine.
+        
+        dataset (Dataset): 
+            The `Dataset` object for this data.
+
+        failed (List[FileDownloadFailure]): 
+            The files that could not be downloaded, after retrying. These are not included in `filenames`.
+
+        n_parallel (int): 
+            The number of files downloaded in parallel. With `n_parallel="auto"`, this is the level that 
+            was reached by the end of the download.
+
+        throughput_mb_per_second (float): 
+            The achieved download throughput, in megabytes per second.
+    """
+    failed: List[FileDownloadFailure] = field(default_factory=list)
+    n_parallel: Optional[int] = None
+    throughput_mb_per_second: Optional[float] = None
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return ("FileDownloadResult(filenames=[%d filenames], count=%d, total_bytes=%d, output_root_path='%s', dataset=%s, " +
+                "failed=[%d failures], n_parallel=%s, throughput_mb_per_second=%s)") % (
+                    len(self.filenames),
+                    self.count,
+                    self.total_bytes,
+                    self.output_root_path,
+                    self.dataset,
+                    len(self.failed),
+                    self.n_parallel,
+                    None if self.throughput_mb_per_second is None else "%.2f" % (self.throughput_mb_per_second),
+                )
+
+    def pretty_print(self):
+        """
+        A special print output for this class.
+        """
+        print("FileDownloadResult:")
+        print("  %-24s: [%d filenames]" % ("filenames", len(self.filenames)))
+        print("  %-24s: %d" % ("count", self.count))
+        print("  %-24s: %d" % ("total_bytes", self.total_bytes))
+        print("  %-24s: %s" % ("output_root_path", self.output_root_path))
+        print("  %-24s: %s" % ("dataset", self.dataset))
+        print("  %-24s: [%d failures]" % ("failed", len(self.failed)))
+        print("  %-24s: %s" % ("n_parallel", self.n_parallel))
+        print("  %-24s: %s" % ("throughput_mb_per_second", self.throughput_mb_per_second))
@@ -15,9 +15,11 @@
 import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, List, Union, Optional
-from pyucalgarysrs.data import Dataset, Data
+from pyucalgarysrs.data import Dataset, Data, ProblematicFile
 from pyucalgarysrs.exceptions import SRSError, SRSUnsupportedReadError
 from ....exceptions import PyUCRioError, PyUCRioUnsupportedReadError
+from .._compression import COMPRESSIBLE_DATASETS
+from ._compressed import has_compressed_files, read_norstar_riometer as func_read_compressed_norstar_riometer
 if TYPE_CHECKING:
     from ....pyucrio import PyUCRio  # pragma: nocover-ok
 
@@ -123,6 +125,17 @@ class ReadManager:
                 trying to read files.
             pyucrio.exceptions.PyUCRioError: a generic read error was encountered
         """
+        # NOTE: compressed files are read by this library (see `download_compression`)
+        if (dataset.name in COMPRESSIBLE_DATASETS and has_compressed_files(file_list) is True):
+            return self.read_norstar_riometer(
+                file_list,
+                n_parallel=n_parallel,
+                no_metadata=no_metadata,
+                start_time=start_time,
+                end_time=end_time,
+                quiet=quiet,
+                dataset=dataset,
+            )
         try:
             return self.__rio_obj.srs_obj.data.readers.read(
                 dataset,
@@ -147,7 +160,9 @@ class ReadManager:
                               quiet: bool = False,
                               dataset: Optional[Dataset] = None) -> Data:
         """
-        Read in NORSTAR Riometer data (K0 and K2 ASCII files).
+        Read in NORSTAR Riometer data (K0 and K2 ASCII files). Files stored compressed (see the 
+        `download_compression` parameter of the `pyucrio.PyUCRio` object) are decompressed as they 
+        are read, within the worker processes.
 
         Args:
             file_list (List[str], List[Path], str, Path): 
@@ -196,6 +211,23 @@ class ReadManager:
         Raises:
             pyucrio.exceptions.PyUCRioError: a generic read error was encountered
         """
+        if (has_compressed_files(file_list) is True):
+            rio_data, top_level_timestamps, meta, problematic_files = func_read_compressed_norstar_riometer(
+                file_list,
+                n_parallel,
+                no_metadata,
+                start_time,
+                end_time,
+                quiet,
+            )
+            return Data(
+                data=rio_data,
+                timestamp=top_level_timestamps,
+                metadata=meta,
+                problematic_files=[ProblematicFile(p["filename"], error_message=p["error_message"], error_type="error") for p in problematic_files],
+                calibrated_data=None,
+                dataset=dataset,
+            )
         try:
             return self.__rio_obj.srs_obj.data.readers.read_norstar_riometer(
                 file_list,
@@ -0,0 +1,236 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Reading of NORSTAR riometer files stored compressed (see `download_compression`).
+
+Each worker process decompresses its file into memory, and parses it from there. The results
+are the same as those of the PyUCalgarySRS reader, which only reads files from disk by name.
+Files that aren't compressed are read the same way, so that a mix of files can be read.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import io
+import os
+import datetime
+import numpy as np
+from functools import partial
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from pyucalgarysrs.data.classes import RiometerData
+from ...._util import get_mp_context
+from .._compression import get_compression, open_compressed
+
+# sites with files named using a 3-letter site code
+__NORSTAR_RIOMETER_3_LETTER_SITE_CODES = {
+    "chur": ["chu"],
+    "cont": ["con"],
+    "daws": ["daw"],
+    "arvi": ["esk"],
+    "fsim": ["sim"],
+    "fsmi": ["smi"],
+    "gill": ["gil"],
+    "isll": ["isl"],
+    "mcmu": ["mcm"],
+    "pina": ["pin"],
+    "rabb": ["rab"],
+    "rank": ["ran"],
+    "talo": ["tal"],
+}
+
+
+def has_compressed_files(file_list):
+    """
+    Check if any of the files to read are compressed.
+    """
+    if (isinstance(file_list, (str, Path))):
+        file_list = [file_list]
+    return any([get_compression(f) is not None for f in file_list])
+
+
+def __read_content(file):
+    """
+    Read the content of a file into memory, decompressing it if needed.
+    """
+    compression = get_compression(file)
+    if (compression is None):
+        with open(file, "rb") as fp:
+            return fp.read()
+    with open_compressed(file, "rb", compression) as fp:
+        return fp.read()
+
+
+def __parse_metadata(basename, content):
+    """
+    Parse the metadata in the header lines of a file.
+    """
+    metadata = {}
+    found_site_uid = None
+    for line in io.StringIO(content.decode(errors="replace")):
+        if (line[0] != "#" or "------------" in line):
+            # end of metadata
+            break
+        line = line.strip()[1:]
+
+        # NOTE: some lines are differently formatted, so we need a few special cases to handle them
+        if ("Version" in line):
+            metadata["version"] = line.strip()
+        elif ("----" in line):
+            metadata["summary"] = line.strip()
+        else:
+            line_split = [x.strip() for x in line.split(":", maxsplit=1)]
+            if ("processing date" in line.lower()):
+                metadata["processing_date"] = datetime.datetime.strptime(line_split[1], "%a %b %d %H:%M:%S %Y").strftime("%Y-%m-%d %H:%M:%S")
+            elif ("site unique id" in line.lower()):
+                found_site_uid = line_split[1].lower()
+            else:
+                metadata[line_split[0].lower().replace(" ", "_")] = line_split[1]
+
+    # add in the site unique ID, from the filename if it isn't in the header
+    if (found_site_uid is None):
+        if (basename[3] == "_"):
+            for site_uid, site_codes in __NORSTAR_RIOMETER_3_LETTER_SITE_CODES.items():
+                if (basename[0:3] in site_codes):
+                    found_site_uid = site_uid
+                    break
+        elif (basename.find("rio-") != -1):
+            idx = basename.find("rio-")
+            found_site_uid = basename[idx + 4:idx + 8].lower()
+    metadata["site_unique_id"] = found_site_uid if found_site_uid is not None else "unknown"
+
+    # return
+    return metadata
+
+
+def __parse_timestamps(np_date, np_time):
+    """
+    Convert the date ('dd/mm/yy') and time ('HH:MM:SS') columns into datetimes, returning them
+    with the indexes of the UT24 records (which are removed).
+    """
+    ut24_idx = np.nonzero(np.char.startswith(np_time, b"24"))[0]
+    keep = np.ones(len(np_date), dtype=bool)
+    keep[ut24_idx] = False
+    dates = np.char.decode(np_date[keep])
+    times = np.char.decode(np_time[keep])
+
+    # NOTE: 2-digit years are mapped to a century the same way as datetime.strptime()
+    iso = ["%s%s-%s-%sT%s" % ("20" if int(d[6:8]) < 69 else "19", d[6:8], d[3:5], d[0:2], t) for d, t in zip(dates, times, strict=True)]
+    return np.array(iso, dtype="datetime64[s]").astype(datetime.datetime), ut24_idx
+
+
+def __read_file(file, no_metadata, start_time, end_time, quiet):
+    """
+    Read one file, returning the same results as the PyUCalgarySRS reader would.
+    """
+
+    def problematic_result(error_message):
+        if (quiet is False):
+            print("Error reading file '%s': %s" % (file, error_message))
+        return [], [], [], [{"filename": file, "error_message": error_message}]
+
+    # determine the file type from the filename
+    #
+    # NOTE: the filename of compressed files has the compression suffix, which is ignored
+    basename = os.path.basename(str(file))
+    if ("_k0_" in basename or "v0.txt" in basename):
+        file_type = "k0"
+    elif ("_k2_" in basename or "v1a.txt" in basename):
+        file_type = "k2"
+    else:
+        return problematic_result("error reading file, unknown file type")
+
+    # skip files outside of the desired time frame
+    try:
+        file_dt = datetime.datetime.strptime(basename.split("_")[-2], "%Y%m%d")
+    except Exception:
+        return problematic_result("failed to extract timestamp from filename")
+    if ((start_time is not None and file_dt < start_time.replace(hour=0, minute=0, second=0, microsecond=0))
+            or (end_time is not None and file_dt > end_time.replace(hour=0, minute=0, second=0, microsecond=0))):
+        return [], [], [], []
+
+    # read the file into memory
+    try:
+        content = __read_content(file)
+    except Exception as e:
+        return problematic_result("error decompressing file: %s" % (str(e)))
+
+    # parse the data
+    try:
+        if (file_type == "k0"):
+            np_date, np_time, np_raw_signal = np.genfromtxt(io.BytesIO(content), comments="#", dtype="S8,S8,f", unpack=True)
+            np_absorption = None
+        else:
+            np_date, np_time, np_absorption, np_raw_signal = np.genfromtxt(io.BytesIO(content), comments="#", dtype="S8,S8,f,f", unpack=True)
+    except Exception as e:
+        return problematic_result("error reading data: %s" % (str(e)))
+
+    # parse the metadata
+    metadata = {}
+    if (no_metadata is False):
+        try:
+            metadata = __parse_metadata(basename, content)
+        except Exception as e:
+            return problematic_result("error reading metadata: %s" % (str(e)))
+
+    # parse the timestamps, removing the UT24 records and those outside of the desired time frame
+    try:
+        np_timestamp, ut24_idx = __parse_timestamps(np.atleast_1d(np_date), np.atleast_1d(np_time))
+        np_raw_signal = np.delete(np.atleast_1d(np_raw_signal), ut24_idx)
+        if (np_absorption is not None):
+            np_absorption = np.delete(np.atleast_1d(np_absorption), ut24_idx)
+        keep = np.ones(len(np_timestamp), dtype=bool)
+        if (start_time is not None):
+            keep &= np_timestamp >= start_time
+        if (end_time is not None):
+            keep &= np_timestamp <= end_time
+        if (not np.all(keep)):
+            np_timestamp = np_timestamp[keep]
+            np_raw_signal = np_raw_signal[keep]
+            if (np_absorption is not None):
+                np_absorption = np_absorption[keep]
+    except Exception as e:
+        return problematic_result("error processing timestamps: %s" % (str(e)))
+
+    # return
+    rio_data = [RiometerData(timestamp=np_timestamp, raw_signal=np_raw_signal, absorption=np_absorption)]
+    top_level_timestamps = [np_timestamp[0]] if len(np_timestamp) > 0 else []
+    return rio_data, top_level_timestamps, [metadata] if no_metadata is False else [], []
+
+
+def read_norstar_riometer(file_list, n_parallel, no_metadata, start_time, end_time, quiet):
+    # if input is just a single file name in a string, convert to a list to be fed to the workers
+    if (isinstance(file_list, (str, Path))):
+        file_list = [file_list]
+
+    # read the files
+    worker = partial(__read_file, no_metadata=no_metadata, start_time=start_time, end_time=end_time, quiet=quiet)
+    if (n_parallel > 1 and len(file_list) > 1):
+        with ProcessPoolExecutor(max_workers=min(n_parallel, len(file_list)), mp_context=get_mp_context()) as executor:
+            results = list(executor.map(worker, file_list))
+    else:
+        results = [worker(f) for f in file_list]
+
+    # compile results, in the order of the files
+    rio_data = []
+    top_level_timestamps = []
+    metadata = []
+    problematic_files = []
+    for result in results:
+        rio_data.extend(result[0])
+        top_level_timestamps.extend(result[1])
+        metadata.extend(result[2])
+        problematic_files.extend(result[3])
+
+    # return
+    return rio_data, top_level_timestamps, metadata, problematic_files
@@ -14,6 +14,7 @@
 
 import os
 import shutil
+import threading
 import humanize
 import warnings
 import pyucalgarysrs
@@ -22,7 +23,10 @@ from pathlib import Path
 from typing import Optional, Any, Literal
 from . import __version__
 from .exceptions import PyUCRioInitializationError, PyUCRioPurgeError
+from ._http import HTTPSession
 from .data import DataManager
+from .data.ucalgary.classes import RetryPolicy
+from .data.ucalgary._compression import COMPRESSION_SUFFIXES, is_zstd_available
 from .tools import ToolsManager
 
 
@@ -48,6 +52,7 @@ class PyUCRio:
 
     __DEFAULT_API_BASE_URL = "https://api.phys.ucalgary.ca"
     __DEFAULT_API_TIMEOUT = 10
+    __DEFAULT_HTTP_POOL_SIZE = 32
     __DEFAULT_API_HEADERS = {
         "content-type": "application/json",
         "user-agent": "python-pyucrio/%s" % (__version__),
@@ -57,7 +62,10 @@ class PyUCRio:
                  download_output_root_path: Optional[str] = None,
                  api_base_url: Optional[str] = None,
                  api_timeout: Optional[int] = None,
-                 progress_bar_backend: Literal["auto", "standard", "notebook"] = "auto"):
+                 progress_bar_backend: Literal["auto", "standard", "notebook"] = "auto",
+                 http_pool_size: Optional[int] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 download_compression: Optional[Literal["gzip", "zstd"]] = None):
         """
         Attributes:
             download_output_root_path (str): 
@@ -79,6 +87,23 @@ class PyUCRio:
                 The progress bar backend to use. Valid choices are 'auto', 'standard', or 'notebook'. 
                 Default is 'auto'. This parameter is optional.
 
+            http_pool_size (int): 
+                The number of keep-alive connections to each of the API and data servers that are kept 
+                open for reuse, shared by all API requests and downloads made by this object. This is 
+                also the maximum number of requests made to a server in parallel. Default is `32`. This 
+                parameter is optional.
+
+            retry_policy (pyucrio.data.ucalgary.RetryPolicy): 
+                How API requests and file downloads that fail with a transient error are retried. By 
+                default, they are attempted up to 3 times with exponential backoff. This parameter is 
+                optional.
+
+            download_compression (str): 
+                Store downloaded NORSTAR riometer text files compressed, using 'gzip' or 'zstd'. They 
+                are saved with a '.gz' or '.zst' suffix, and decompressed when read. zstd requires 
+                Python 3.14+, or the 'zstandard' package. Default is `None`, to store them as is. This 
+                parameter is optional.
+
             srs_obj (pyucalgarysrs.PyUCalgarySRS): 
                 A [PyUCalgarySRS](https://docs-pyucalgarysrs.phys.ucalgary.ca/#pyucalgarysrs.PyUCalgarySRS) object. 
                 If not supplied, it will create the object with some settings carried over from the PyUCRio 
@@ -102,23 +127,29 @@ class PyUCRio:
             self.__api_timeout = self.__DEFAULT_API_TIMEOUT
         self.__api_headers = self.__DEFAULT_API_HEADERS
 
+        # initialize the pooled HTTP session parameters (the session is created when first used)
+        self.__http_pool_size = http_pool_size
+        if (http_pool_size is None):
+            self.__http_pool_size = self.__DEFAULT_HTTP_POOL_SIZE
+        self.__http_session = None
+        self.__http_session_lock = threading.Lock()
+        self.__retry_policy = retry_policy
+        if (retry_policy is None):
+            self.__retry_policy = RetryPolicy()
+        self.__download_compression = None
+        self.download_compression = download_compression
+
         # initialize progress bar parameters
         self.__progress_bar_backend = progress_bar_backend
-        self._tqdm = None
-
-        # initialize PyUCalgarySRS object
-        self.__srs_obj = pyucalgarysrs.PyUCalgarySRS(
-            api_headers=self.__api_headers,
-            api_timeout=self.__api_timeout,
-            download_output_root_path=self.download_output_root_path,
-        )
-
-        # initialize progress bar tqdm object (by pulling it from srs_obj)
-        self._tqdm = self.__srs_obj._tqdm
 
-        # initialize sub-modules
-        self.__data = DataManager(self)
-        self.__tools = ToolsManager(self)
+        # initialize the PyUCalgarySRS object and sub-modules (when first used)
+        #
+        # NOTE: settings changed before the PyUCalgarySRS object is created are kept, and
+        # applied to it once it is created.
+        self.__srs_obj = None
+        self.__srs_obj_pending_settings = {}
+        self.__data = None
+        self.__tools = None
 
         # disable certain dependencies warnings
         #
@@ -133,6 +164,8 @@ class PyUCRio:
         """
         Access to the `data` submodule from within a PyUCRio object.
         """
+        if (self.__data is None):
+            self.__data = DataManager(self)
         return self.__data
 
     @property
@@ -140,6 +173,8 @@ class PyUCRio:
         """
         Access to the `tools` submodule from within a PyUCRio object.
         """
+        if (self.__tools is None):
+            self.__tools = ToolsManager(self)
         return self.__tools
 
     # ------------------------------------------
@@ -166,7 +201,7 @@ class PyUCRio:
             if (value[-1] == '/'):
                 value = value[0:-1]
             self.__api_base_url = value
-            self.__srs_obj.api_base_url = value
+            self.__set_srs_obj_setting("api_base_url", value)
 
     @property
     def api_headers(self):
@@ -188,7 +223,7 @@ class PyUCRio:
         if (value is not None):
             new_timeout = value
         self.__api_timeout = new_timeout
-        self.__srs_obj.api_timeout = new_timeout
+        self.__set_srs_obj_setting("api_timeout", new_timeout)
 
     @property
     def download_output_root_path(self):
@@ -201,7 +236,7 @@ class PyUCRio:
     def download_output_root_path(self, value: str):
         self.__download_output_root_path = value
         self.initialize_paths()
-        self.__srs_obj.download_output_root_path = self.__download_output_root_path
+        self.__set_srs_obj_setting("download_output_root_path", self.__download_output_root_path)
 
     @property
     def progress_bar_backend(self):
@@ -219,16 +254,101 @@ class PyUCRio:
         if (value != "auto" and value != "standard" and value != "notebook"):
             raise PyUCRioInitializationError("Invalid progress bar backend. Allowed values are 'auto', 'standard' or 'notebook'.")
         self.__progress_bar_backend = value
-        self.__srs_obj.progress_bar_backend = value
-        self._tqdm = self.__srs_obj._tqdm
+        self.__set_srs_obj_setting("progress_bar_backend", value)
+
+    @property
+    def http_pool_size(self):
+        """
+        Property for the HTTP connection pool size. See above for details.
+        """
+        return self.__http_pool_size
+
+    @http_pool_size.setter
+    def http_pool_size(self, value: Optional[int] = None):
+        if (value is None):
+            value = self.__DEFAULT_HTTP_POOL_SIZE
+        if (value < 1):
+            raise PyUCRioInitializationError("HTTP pool size must be at least 1")
+        self.__http_pool_size = value
+        with self.__http_session_lock:
+            if (self.__http_session is not None):
+                self.__http_session.close()
+            self.__http_session = None
+
+    @property
+    def http_session(self):
+        """
+        The pooled HTTP session used for all API requests and downloads.
+        """
+        if (self.__http_session is None):
+            with self.__http_session_lock:
+                if (self.__http_session is None):
+                    self.__http_session = HTTPSession(self.__http_pool_size)
+        return self.__http_session
+
+    @property
+    def retry_policy(self):
+        """
+        Property for the retry policy. See above for details.
+        """
+        return self.__retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, value: Optional[RetryPolicy] = None):
+        if (value is None):
+            value = RetryPolicy()
+        if (value.max_attempts < 1):
+            raise PyUCRioInitializationError("The retry policy's max_attempts must be at least 1")
+        self.__retry_policy = value
+
+    @property
+    def download_compression(self):
+        """
+        Property for the compression of downloaded files. See above for details.
+        """
+        return self.__download_compression
+
+    @download_compression.setter
+    def download_compression(self, value: Optional[Literal["gzip", "zstd"]] = None):
+        if (value is not None and value not in COMPRESSION_SUFFIXES):
+            raise PyUCRioInitializationError("Invalid download compression. Allowed values are None, 'gzip' or 'zstd'.")
+        if (value == "zstd" and is_zstd_available() is False):
+            raise PyUCRioInitializationError("zstd compression requires Python 3.14+, or the 'zstandard' package")
+        self.__download_compression = value
 
     @property
     def srs_obj(self):
         """
         Property for the PyUCalgarySRS object. See above for details.
         """
+        if (self.__srs_obj is None):
+            srs_obj = pyucalgarysrs.PyUCalgarySRS(
+                api_headers=self.__api_headers,
+                api_timeout=self.__api_timeout,
+                download_output_root_path=self.download_output_root_path,
+            )
+            for name, value in self.__srs_obj_pending_settings.items():
+                setattr(srs_obj, name, value)
+            self.__srs_obj_pending_settings = {}
+            self.__srs_obj = srs_obj
         return self.__srs_obj
 
+    @property
+    def _tqdm(self):
+        """
+        The tqdm object used for progress bars, taken from the PyUCalgarySRS object.
+        """
+        return self.srs_obj._tqdm
+
+    def __set_srs_obj_setting(self, name, value):
+        """
+        Apply a setting to the PyUCalgarySRS object, or keep it until the object is created.
+        """
+        if (self.__srs_obj is None):
+            self.__srs_obj_pending_settings[name] = value
+        else:
+            setattr(self.__srs_obj, name, value)
+
     # -----------------------------
     # special methods
     # -----------------------------
@@ -237,11 +357,14 @@ class PyUCRio:
 
     def __repr__(self) -> str:
         return ("PyUCRio(download_output_root_path='%s', api_base_url='%s', api_timeout=%s, progress_bar_backend='%s', " +
-                "srs_obj=PyUCalgarySRS(...))") % (
+                "http_pool_size=%d, retry_policy=%s, download_compression=%s, srs_obj=PyUCalgarySRS(...))") % (
                     self.__download_output_root_path,
                     self.api_base_url,
                     self.api_timeout,
                     self.progress_bar_backend,
+                    self.http_pool_size,
+                    self.retry_policy,
+                    self.download_compression,
                 )
 
     def pretty_print(self):
@@ -256,6 +379,9 @@ class PyUCRio:
         print("  %-27s: %s" % ("api_base_url", self.api_base_url))
         print("  %-27s: %s" % ("api_timeout", self.api_timeout))
         print("  %-27s: %s" % ("progress_bar_backend", self.progress_bar_backend))
+        print("  %-27s: %s" % ("http_pool_size", self.http_pool_size))
+        print("  %-27s: %s" % ("retry_policy", self.retry_policy))
+        print("  %-27s: %s" % ("download_compression", self.download_compression))
         print("  %-27s: %s" % ("srs_obj", "PyUCalgarySRS(...)"))
 
     # -----------------------------
@@ -276,6 +402,16 @@ class PyUCRio:
         except IOError as e:  # pragma: nocover-ok
             raise PyUCRioInitializationError("Error during output path creation: %s" % str(e)) from e
 
+    def http_connection_stats(self) -> dict:
+        """
+        Get statistics about the reuse of pooled HTTP connections by API requests and downloads.
+
+        Returns:
+            A dictionary with the pool size, and the number of requests made, connections opened,
+            and requests that reused an already open connection.
+        """
+        return self.http_session.stats()
+
     def purge_download_output_root_path(self):
         """
         Delete all files in the `download_output_root_path` directory. Since the
@@ -300,7 +436,7 @@ class PyUCRio:
                     os.remove(item)
 
             # purge pyucalgarysrs path
-            self.__srs_obj.purge_download_output_root_path()
+            self.srs_obj.purge_download_output_root_path()
         except Exception as e:  # pragma: nocover-ok
             raise PyUCRioPurgeError("Error while purging download output root path: %s" % (str(e))) from e
 
@@ -31,13 +31,12 @@ Example:
 # pull in classes (none yet)
 
 # imports for this file
+#
+# NOTE: the functions of this module, and the site_map submodule, are imported when first
+# used. This keeps matplotlib, cartopy, and pyproj from being loaded by `import pyucrio`.
 import datetime
 from pyucalgarysrs.data.classes import Data
-from ._util import set_theme as func_set_theme
-from ._plot import plot as func_plot
-
-# pull in submodules
-from .site_map import SiteMapManager
+from .classes.cross_correlation import CrossCorrelationResult
 
 # typing imports
 from typing import Optional, Tuple, Union, Any, List
@@ -59,8 +58,8 @@ class ToolsManager:
     def __init__(self, ucrio_obj):
         self.__ucrio_obj = ucrio_obj
 
-        # initialize sub-modules
-        self.__site_map = SiteMapManager(self.__ucrio_obj)
+        # initialize sub-modules (when first used)
+        self.__site_map = None
 
     # ------------------------------------------
     # properties for submodule managers
@@ -70,6 +69,9 @@ class ToolsManager:
         """
         Access to the `site_map` submodule from within a PyAuroraX object.
         """
+        if (self.__site_map is None):
+            from .site_map import SiteMapManager
+            self.__site_map = SiteMapManager(self.__ucrio_obj)
         return self.__site_map
 
     def set_theme(self, theme: str) -> None:
@@ -85,6 +87,7 @@ class ToolsManager:
                 Additional themes can be found on the 
                 [matplotlib documentation](https://matplotlib.org/stable/gallery/style_sheets/style_sheets_reference.html)
         """
+        from ._util import set_theme as func_set_theme
         return func_set_theme(theme)
 
     def plot(self,
@@ -186,5 +189,256 @@ class ToolsManager:
         Raises:
             ValueError: issue with supplied parameters.
         """
+        from ._plot import plot as func_plot
         return func_plot(rio_data, absorption, stack_plot, downsample_seconds, hsr_bands, color, figsize, title, date_format, xtitle, ytitle, xrange,
                          yrange, linestyle, returnfig, savefig, savefig_filename, savefig_quality)
+
+    def plot_spectrogram(self,
+                         hsr_data: Data,
+                         absorption: bool = False,
+                         time_bin_seconds: Optional[float] = None,
+                         cmap: str = "viridis",
+                         color_range: Optional[Union[Tuple[float, float], Tuple[int, int]]] = None,
+                         colorbar: bool = True,
+                         figsize: Optional[Tuple[int, int]] = None,
+                         title: Optional[str] = None,
+                         date_format: Optional[str] = None,
+                         xtitle: Optional[str] = None,
+                         ytitle: Optional[str] = None,
+                         xrange: Optional[Tuple[datetime.datetime, datetime.datetime]] = None,
+                         returnfig: bool = False,
+                         savefig: bool = False,
+                         savefig_filename: Optional[str] = None,
+                         savefig_quality: Optional[int] = None) -> Any:
+        """
+        Plot Hyper-Spectral Riometer (HSR) data as a dynamic spectrum (frequency vs. time image). 
+        
+        All bands are assembled into a single (frequency x time) matrix and rendered as one image, 
+        which is much faster than drawing a line for each band, and scales well to multi-day time ranges.
+
+        Args:
+            hsr_data (Data): 
+                The data to be plotted, represented as a single 
+                [`Data`](https://docs-pyucalgarysrs.phys.ucalgary.ca/data/classes.html#pyucalgarysrs.data.classes.Data)
+                object containing HSR data.
+
+            absorption (bool): 
+                Plot absorption data, as opposed to raw data. Defaults to False.
+
+            time_bin_seconds (float): 
+                Average the data into time bins of this size, in seconds, before plotting. Default is the
+                temporal resolution of the data, meaning no averaging will occur. Larger bins are recommended 
+                when plotting multi-day time ranges.
+
+            cmap (str): 
+                The matplotlib colormap to use. Default is `viridis`.
+
+            color_range (list[int | float]): 
+                The [min, max] values to use for the colormap. Default is determined automatically by matplotlib.
+
+            colorbar (bool): 
+                Add a colorbar to the plot. Default is `True`.
+
+            figsize (list | tuple): 
+                The overall figure size. Default is None, determined automatically by matplotlib.
+
+            title (str): 
+                The figure title. Default is no title.
+
+            date_format (str): 
+                The date format to use when plotting, represented as a string. For example, '%H' to format the 
+                times as hours, "%H:%M" to format as hours and minutes, or "%Y-%m-%d" to format as the year-month-day.
+                Default of "%H" to format as hours.
+
+            xtitle (str): 
+                The x-axis title. Default is determined automatically.
+            
+            ytitle (str): 
+                The y-axis title. Default is determined automatically.
+
+            xrange (list[datetime.datetime]): 
+                The start and end time ranges for x-axis plotting. Default is all x-axis values (full range).
+
+            returnfig (bool): 
+                Instead of displaying the image, return the matplotlib figure object. This allows for further plot 
+                manipulation, for example, adding labels or a title in a different location than the default. 
+                
+                Remember - if this parameter is supplied, be sure that you close your plot after finishing work 
+                with it. This can be achieved by doing `plt.close(fig)`. 
+                
+                Note that this method cannot be used in combination with `savefig`.
+
+            savefig (bool): 
+                Save the displayed image to disk instead of displaying it. The parameter savefig_filename is required if 
+                this parameter is set to True. Defaults to `False`.
+
+            savefig_filename (str): 
+                Filename to save the image to. Must be specified if the savefig parameter is set to True.
+
+            savefig_quality (int): 
+                Quality level of the saved image. This can be specified if the savefig_filename is a JPG image. If it
+                is a PNG, quality is ignored. Default quality level for JPGs is matplotlib/Pillow's default of 75%.
+            
+        Returns:
+            The displayed plot, by default. If `savefig` is set to True, nothing will be returned. If `returnfig` is 
+            set to True, the plotting variables `(fig, ax)` will be returned.
+
+        Raises:
+            ValueError: issue with supplied parameters.
+        """
+        from ._plot_spectrogram import plot_spectrogram as func_plot_spectrogram
+        return func_plot_spectrogram(hsr_data, absorption, time_bin_seconds, cmap, color_range, colorbar, figsize, title, date_format, xtitle, ytitle,
+                                     xrange, returnfig, savefig, savefig_filename, savefig_quality)
+
+    def plot_keogram(self,
+                     rio_data: Union[Data, List[Data]],
+                     absorption: bool = True,
+                     hsr_band: Optional[int] = None,
+                     time_resolution_seconds: Optional[float] = None,
+                     cmap: str = "viridis",
+                     color_range: Optional[Union[Tuple[float, float], Tuple[int, int]]] = None,
+                     colorbar: bool = True,
+                     figsize: Optional[Tuple[int, int]] = None,
+                     title: Optional[str] = None,
+                     date_format: Optional[str] = None,
+                     xtitle: Optional[str] = None,
+                     ytitle: Optional[str] = None,
+                     xrange: Optional[Tuple[datetime.datetime, datetime.datetime]] = None,
+                     returnfig: bool = False,
+                     savefig: bool = False,
+                     savefig_filename: Optional[str] = None,
+                     savefig_quality: Optional[int] = None) -> Any:
+        """
+        Plot a chain keogram of riometer data. The data for each site are placed onto a common time 
+        grid, stacked into a single (latitude x time) raster ordered by the geodetic latitude of each
+        site, and rendered as one image. 
+        
+        This is much faster than a stack plot for many sites and/or multi-day time ranges. Site locations 
+        are retrieved using a single `list_observatories()` request for each instrument array.
+
+        Args:
+            rio_data (Data | List[Data]): 
+                The data to be plotted, represented as a single, or list, of 
+                [`Data`](https://docs-pyucalgarysrs.phys.ucalgary.ca/data/classes.html#pyucalgarysrs.data.classes.Data)
+                objects containing riometer data, one for each site.
+
+            absorption (bool): 
+                Plot absorption data, as opposed to raw data. Defaults to True.
+
+            hsr_band (int): 
+                The band index to use, specifically applicable to HSR data. Defaults to the first band.
+
+            time_resolution_seconds (float): 
+                The time resolution of the keogram, in seconds. Data will be averaged into time bins of this 
+                size. Default is the coarsest time resolution of the supplied data.
+
+            cmap (str): 
+                The matplotlib colormap to use. Default is `viridis`.
+
+            color_range (list[int | float]): 
+                The [min, max] values to use for the colormap. Default is determined automatically by matplotlib.
+
+            colorbar (bool): 
+                Add a colorbar to the plot. Default is `True`.
+
+            figsize (list | tuple): 
+                The overall figure size. Default is None, determined automatically by matplotlib.
+
+            title (str): 
+                The figure title. Default is no title.
+
+            date_format (str): 
+                The date format to use when plotting, represented as a string. For example, '%H' to format the 
+                times as hours, "%H:%M" to format as hours and minutes, or "%Y-%m-%d" to format as the year-month-day.
+                Default of "%H" to format as hours.
+
+            xtitle (str): 
+                The x-axis title. Default is determined automatically.
+            
+            ytitle (str): 
+                The y-axis title. Default is determined automatically.
+
+            xrange (list[datetime.datetime]): 
+                The start and end time ranges for x-axis plotting. Default is all x-axis values (full range).
+
+            returnfig (bool): 
+                Instead of displaying the image, return the matplotlib figure object. This allows for further plot 
+                manipulation, for example, adding labels or a title in a different location than the default. 
+                
+                Remember - if this parameter is supplied, be sure that you close your plot after finishing work 
+                with it. This can be achieved by doing `plt.close(fig)`. 
+                
+                Note that this method cannot be used in combination with `savefig`.
+
+            savefig (bool): 
+                Save the displayed image to disk instead of displaying it. The parameter savefig_filename is required if 
+                this parameter is set to True. Defaults to `False`.
+
+            savefig_filename (str): 
+                Filename to save the image to. Must be specified if the savefig parameter is set to True.
+
+            savefig_quality (int): 
+                Quality level of the saved image. This can be specified if the savefig_filename is a JPG image. If it
+                is a PNG, quality is ignored. Default quality level for JPGs is matplotlib/Pillow's default of 75%.
+            
+        Returns:
+            The displayed plot, by default. If `savefig` is set to True, nothing will be returned. If `returnfig` is 
+            set to True, the plotting variables `(fig, ax)` will be returned.
+
+        Raises:
+            ValueError: issue with supplied parameters.
+            pyucrio.exceptions.PyUCRioAPIError: An API error was encountered.
+        """
+        from ._plot_keogram import plot_keogram as func_plot_keogram
+        return func_plot_keogram(self.__ucrio_obj, rio_data, absorption, hsr_band, time_resolution_seconds, cmap, color_range, colorbar, figsize,
+                                 title, date_format, xtitle, ytitle, xrange, returnfig, savefig, savefig_filename, savefig_quality)
+
+    def cross_correlate(self,
+                        rio_data: List[Data],
+                        absorption: bool = False,
+                        hsr_band: Optional[int] = None,
+                        time_resolution_seconds: Optional[float] = None,
+                        max_lag_seconds: Optional[float] = None,
+                        n_parallel: int = 1) -> CrossCorrelationResult:
+        """
+        Compute the cross-correlation between every pair of riometer sites, and estimate the
+        time lag between them. Useful for tracking the propagation of absorption features along
+        a chain of sites.
+
+        The time series for each site are first aligned onto a common time grid covering the
+        overlapping time range of all sites. All pairwise correlations are then computed using
+        FFTs in a single batched operation.
+
+        Args:
+            rio_data (List[Data]): 
+                The data to be correlated, represented as a list of 
+                [`Data`](https://docs-pyucalgarysrs.phys.ucalgary.ca/data/classes.html#pyucalgarysrs.data.classes.Data)
+                objects, one for each site. At least two are required.
+
+            absorption (bool): 
+                Correlate absorption data, as opposed to raw data. Defaults to False.
+
+            hsr_band (int): 
+                The band index to use, specifically applicable to HSR data. Defaults to the first band.
+
+            time_resolution_seconds (float): 
+                The sampling interval of the common time grid, in seconds. Default is the coarsest time
+                resolution of the supplied data.
+
+            max_lag_seconds (float): 
+                The maximum lag to evaluate, in seconds. Default is all possible lags.
+
+            n_parallel (int): 
+                Number of processes to use when correlating the pairs of sites. Default is 1, which performs
+                all work in the current process. This is only beneficial for a large number of sites and/or 
+                long time series.
+
+        Returns:
+            A `pyucrio.tools.classes.cross_correlation.CrossCorrelationResult` object containing the lags, the
+            correlations, and the lag and value of peak correlation for every pair of sites.
+
+        Raises:
+            ValueError: issue with supplied parameters.
+        """
+        from ._cross_correlate import cross_correlate as func_cross_correlate
+        return func_cross_correlate(rio_data, absorption, hsr_band, time_resolution_seconds, max_lag_seconds, n_parallel)
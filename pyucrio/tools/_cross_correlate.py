@@ -0,0 +1,109 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from pyucalgarysrs.data.classes import Data
+from .classes.cross_correlation import CrossCorrelationResult
+from ._util import extract_series, align_series
+from .._util import get_mp_context
+
+
+def __correlate_pairs(spectra_i, spectra_j, nfft, max_lag):
+    """
+    Cross-correlate a batch of pre-computed spectra in a single inverse FFT call, returning
+    the correlation at lags -max_lag..max_lag for each pair.
+    """
+    cc = np.fft.irfft(spectra_i * np.conj(spectra_j), n=nfft, axis=1)
+    return np.concatenate((cc[:, nfft - max_lag:], cc[:, :max_lag + 1]), axis=1)
+
+
+def cross_correlate(rio_data, absorption, hsr_band, time_resolution_seconds, max_lag_seconds, n_parallel):
+    # Convert to single element list if only a single data object is passed in
+    if isinstance(rio_data, Data):
+        rio_data = [rio_data]
+    if (len(rio_data) < 2):
+        raise ValueError("At least two Data objects are required to compute cross-correlations")
+
+    # pull out each site's time series and align them onto a common time grid
+    site_uid_list = []
+    series_list = []
+    for data in rio_data:
+        site, timestamp, values = extract_series(data, absorption, hsr_band)
+        site_uid_list.append(site)
+        series_list.append((timestamp, values))
+    time_grid, aligned, time_resolution_seconds = align_series(series_list, time_resolution_seconds)
+    n_sites, n_samples = aligned.shape
+
+    # determine the lags to evaluate
+    if (max_lag_seconds is None):
+        max_lag = n_samples - 1
+    else:
+        if (max_lag_seconds < 0):
+            raise ValueError("The max_lag_seconds parameter must be greater than or equal to zero")
+        max_lag = min(int(round(max_lag_seconds / time_resolution_seconds)), n_samples - 1)
+
+    # remove the mean of each series, and determine normalization factors
+    aligned = aligned - np.nanmean(aligned, axis=1, keepdims=True)
+    aligned[np.isnan(aligned)] = 0.0
+    norms = np.sqrt(np.sum(aligned**2, axis=1))
+    norms[norms == 0] = np.inf
+
+    # compute the spectra of all series at once
+    #
+    # NOTE: we zero-pad to at least 2N-1 (rounded up to a power of 2) so that the
+    # circular correlation doesn't wrap around.
+    nfft = int(2**np.ceil(np.log2(2 * n_samples - 1)))
+    spectra = np.fft.rfft(aligned, n=nfft, axis=1)
+
+    # correlate every pair of sites
+    idx_i, idx_j = np.triu_indices(n_sites, k=1)
+    if (n_parallel > 1 and len(idx_i) > 1):
+        # split the pairs into chunks, one per worker
+        chunks = np.array_split(np.arange(0, len(idx_i)), min(n_parallel, len(idx_i)))
+        with ProcessPoolExecutor(max_workers=len(chunks), mp_context=get_mp_context()) as executor:
+            futures = [executor.submit(__correlate_pairs, spectra[idx_i[chunk]], spectra[idx_j[chunk]], nfft, max_lag) for chunk in chunks]
+            pair_cc = np.concatenate([future.result() for future in futures], axis=0)
+    else:
+        pair_cc = __correlate_pairs(spectra[idx_i], spectra[idx_j], nfft, max_lag)
+    pair_cc /= (norms[idx_i] * norms[idx_j])[:, np.newaxis]
+
+    # assemble the full correlation matrix
+    #
+    # NOTE: the correlation of j with i is the correlation of i with j, reversed in lag
+    n_lags = 2 * max_lag + 1
+    correlation = np.zeros((n_sites, n_sites, n_lags), dtype=np.float64)
+    correlation[idx_i, idx_j, :] = pair_cc
+    correlation[idx_j, idx_i, :] = pair_cc[:, ::-1]
+    autocorrelation = __correlate_pairs(spectra, spectra, nfft, max_lag) / (norms**2)[:, np.newaxis]
+    correlation[np.arange(n_sites), np.arange(n_sites), :] = autocorrelation
+
+    # find the peaks
+    lags = np.arange(-max_lag, max_lag + 1) * time_resolution_seconds
+    peak_idx = np.argmax(correlation, axis=2)
+    peak_lag = lags[peak_idx]
+    peak_correlation = np.take_along_axis(correlation, peak_idx[:, :, np.newaxis], axis=2)[:, :, 0]
+
+    # return
+    return CrossCorrelationResult(
+        site_uid_list=site_uid_list,
+        start=datetime.datetime.fromtimestamp(time_grid[0], datetime.timezone.utc).replace(tzinfo=None),
+        end=datetime.datetime.fromtimestamp(time_grid[-1], datetime.timezone.utc).replace(tzinfo=None),
+        time_resolution_seconds=time_resolution_seconds,
+        lags=lags,
+        correlation=correlation,
+        peak_lag=peak_lag,
+        peak_correlation=peak_correlation,
+    )
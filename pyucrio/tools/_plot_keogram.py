@@ -0,0 +1,182 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from pyucalgarysrs.data.classes import Data
+from ._util import extract_series, bin_to_grid
+from .._util import show_warning
+
+
+def __get_instrument_array(data):
+    """
+    Determine the instrument array that a Data object is from, using its dataset name.
+    """
+    dataset = data.dataset.name if data.dataset is not None else ""
+    if ("SWAN_HSR" in dataset):
+        return "swan_hsr"
+    elif ("NORSTAR_RIOMETER" in dataset):
+        return "norstar_riometer"
+    else:
+        raise ValueError("Unable to determine the instrument array for dataset '%s'" % (dataset))
+
+
+def plot_keogram(ucrio_obj, rio_data, absorption, hsr_band, time_resolution_seconds, cmap, color_range, colorbar, figsize, title, date_format, xtitle,
+                 ytitle, xrange, returnfig, savefig, savefig_filename, savefig_quality):
+
+    # check return mode
+    if (returnfig is True and savefig is True):
+        raise ValueError("Only one of returnfig or savefig can be set to True")
+    if (returnfig is True and (savefig_filename is not None or savefig_quality is not None)):
+        show_warning("The figure will be returned, but a savefig option parameter was supplied. Consider " +
+                     "removing the savefig option parameter(s) as they will be ignored.")
+    elif (savefig is False and (savefig_filename is not None or savefig_quality is not None)):
+        show_warning("A savefig option parameter was supplied, but the savefig parameter is False. The " +
+                     "savefig option parameters will be ignored.")
+
+    # Convert to single element list if only a single data object is passed in
+    if isinstance(rio_data, Data):
+        rio_data = [rio_data]
+    if (len(rio_data) == 0):
+        raise ValueError("No data was supplied")
+    if (time_resolution_seconds is not None and time_resolution_seconds <= 0):
+        raise ValueError("The time_resolution_seconds parameter must be greater than zero")
+
+    # pull out each site's time series
+    site_uid_list = []
+    instrument_array_list = []
+    series_list = []
+    for data in rio_data:
+        site, timestamp, values = extract_series(data, absorption, hsr_band)
+        sort_idx = np.argsort(timestamp, kind="stable")
+        site_uid_list.append(site)
+        instrument_array_list.append(__get_instrument_array(data))
+        series_list.append((timestamp[sort_idx], values[sort_idx]))
+
+    # get the latitude of each site
+    #
+    # NOTE: we make only a single observatory request for each instrument array
+    site_latitudes = {}
+    for instrument_array in sorted(set(instrument_array_list)):
+        for observatory in ucrio_obj.data.ucalgary.list_observatories(instrument_array):  # type: ignore
+            site_latitudes[(instrument_array, observatory.uid)] = observatory.geodetic_latitude
+    latitudes = []
+    for i, site in enumerate(site_uid_list):
+        instrument_array = instrument_array_list[i]
+        if ((instrument_array, site) not in site_latitudes):
+            raise ValueError("Unable to find the location of site '%s' for instrument array '%s'" % (site, instrument_array))
+        latitudes.append(site_latitudes[(instrument_array, site)])
+
+    # determine the common time grid, covering all of the supplied data
+    if (time_resolution_seconds is None):
+        time_resolution_seconds = 0.0
+        for timestamp, _ in series_list:
+            if (len(timestamp) > 1):
+                time_resolution_seconds = max(time_resolution_seconds, float(np.median(np.diff(timestamp))))
+        if (time_resolution_seconds <= 0):
+            raise ValueError("Unable to determine the time resolution of the supplied data")
+    grid_start = min([timestamp[0] for timestamp, _ in series_list])
+    grid_end = max([timestamp[-1] for timestamp, _ in series_list])
+
+    # stack the sites into a (latitude x time) raster, ordered from south to north
+    lat_order = np.argsort(latitudes, kind="stable")
+    raster = None
+    time_edges = None
+    for row_idx, site_idx in enumerate(lat_order):
+        timestamp, values = series_list[site_idx]
+        time_edges, binned = bin_to_grid(timestamp, values[np.newaxis, :], grid_start, grid_end, time_resolution_seconds)
+        if (raster is None):
+            raster = np.empty((len(lat_order), binned.shape[1]), dtype=np.float64)
+        raster[row_idx, :] = binned[0, :]
+    time_edges = mdates.date2num(np.round(time_edges * 1e6).astype(np.int64).astype("datetime64[us]"))  # type: ignore
+    row_edges = np.arange(0, len(lat_order) + 1) - 0.5
+
+    # set color range
+    vmin = None
+    vmax = None
+    if (color_range is not None):
+        vmin, vmax = color_range
+
+    # render as a single image
+    fig = plt.figure(figsize=figsize)
+    ax = fig.add_axes((0, 0, 1, 1))
+    mesh = ax.pcolormesh(time_edges, row_edges, raster, cmap=cmap, vmin=vmin, vmax=vmax, shading="flat", rasterized=True)
+
+    # label each row with the site and latitude
+    ax.set_yticks(np.arange(0, len(lat_order)))
+    ax.set_yticklabels(["%s (%.1f\N{DEGREE SIGN})" % (site_uid_list[i].upper(), latitudes[i]) for i in lat_order])
+
+    # add colorbar
+    if (colorbar is True):
+        cbar = fig.colorbar(mesh, ax=ax)
+        if (absorption is True):
+            cbar.set_label("Absorption (dB)")
+        elif (set(instrument_array_list) == {"swan_hsr"}):
+            cbar.set_label("Raw Power (dB)")
+        else:
+            cbar.set_label("Raw Signal (V)")
+
+    # add axis titles
+    ax.set_xlabel(("Hour (UTC)" if date_format is None else "Time (UTC)") if xtitle is None else xtitle)
+    ax.set_ylabel("Geodetic Latitude" if ytitle is None else ytitle)
+
+    # format the x-axis (dates) automatically or as requested
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%H' if date_format is None else date_format))
+
+    # set x-range
+    if (xrange is not None):
+        ax.set_xlim(xrange)  # type: ignore
+
+    # add title
+    if (title is not None):
+        ax.set_title(title)
+
+    # save figure or show it
+    if (savefig is True):
+        # check that filename has been set
+        if (savefig_filename is None):
+            raise ValueError("The savefig_filename parameter is missing, but required since savefig was set to True.")
+
+        # save the figure
+        f_extension = os.path.splitext(savefig_filename)[-1].lower()
+        if (".jpg" == f_extension or ".jpeg" == f_extension):
+            # check quality setting
+            if (savefig_quality is not None):  # pragma: nocover-ok
+                plt.savefig(savefig_filename, quality=savefig_quality, bbox_inches="tight")
+            else:
+                plt.savefig(savefig_filename, bbox_inches="tight")
+        else:
+            if (savefig_quality is not None):
+                # quality specified, but output filename is not a JPG, so show a warning
+                show_warning("The savefig_quality parameter was specified, but is only used for saving JPG files. The " +
+                             "savefig_filename parameter was determined to not be a JPG file, so the quality will be ignored")
+            plt.savefig(savefig_filename, bbox_inches="tight")
+
+        # clean up by closing the figure
+        plt.close(fig)
+
+    elif (returnfig is True):
+        # return the figure and axis objects
+        return (fig, ax)
+    else:
+        # show the figure
+        plt.show(fig)
+
+        # cleanup by closing the figure
+        plt.close(fig)
+
+    # return
+    return None
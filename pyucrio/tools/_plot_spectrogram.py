@@ -0,0 +1,158 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from pyucalgarysrs.data.classes import Data, HSRData
+from ._util import bin_to_grid
+from .._util import show_warning
+
+
+def __frequency_edges(frequencies):
+    """
+    Determine the edges of each frequency band, using the midpoints between the
+    band centers.
+    """
+    if (len(frequencies) == 1):
+        return np.array([frequencies[0] - 0.5, frequencies[0] + 0.5])
+    midpoints = (frequencies[1:] + frequencies[:-1]) / 2.0
+    first_edge = frequencies[0] - (midpoints[0] - frequencies[0])
+    last_edge = frequencies[-1] + (frequencies[-1] - midpoints[-1])
+    return np.concatenate(([first_edge], midpoints, [last_edge]))
+
+
+def plot_spectrogram(hsr_data, absorption, time_bin_seconds, cmap, color_range, colorbar, figsize, title, date_format, xtitle, ytitle, xrange,
+                     returnfig, savefig, savefig_filename, savefig_quality):
+
+    # check return mode
+    if (returnfig is True and savefig is True):
+        raise ValueError("Only one of returnfig or savefig can be set to True")
+    if (returnfig is True and (savefig_filename is not None or savefig_quality is not None)):
+        show_warning("The figure will be returned, but a savefig option parameter was supplied. Consider " +
+                     "removing the savefig option parameter(s) as they will be ignored.")
+    elif (savefig is False and (savefig_filename is not None or savefig_quality is not None)):
+        show_warning("A savefig option parameter was supplied, but the savefig parameter is False. The " +
+                     "savefig option parameters will be ignored.")
+
+    # check the data
+    if (isinstance(hsr_data, Data) is False):
+        raise ValueError("A single Data object containing HSR data must be supplied")
+    if (len(hsr_data.data) == 0 or isinstance(hsr_data.data[0], HSRData) is False):
+        raise ValueError("The supplied Data object does not contain HSR data")
+    if (time_bin_seconds is not None and time_bin_seconds <= 0):
+        raise ValueError("The time_bin_seconds parameter must be greater than zero")
+    site = hsr_data.metadata[0]["site_unique_id"] if len(hsr_data.metadata) > 0 else "unknown"
+
+    # assemble the (bands x time) matrix across all records
+    timestamp_list = []
+    matrix_list = []
+    for d in hsr_data.data:
+        if (absorption is True):
+            if (d.absorption is None):
+                raise ValueError("No absorption data available for '%s'" % (hsr_data.dataset.name if hsr_data.dataset is not None else "HSR data"))
+            matrix_list.append(d.absorption)
+        else:
+            matrix_list.append(d.raw_power)
+        timestamp_list.append(d.timestamp)
+    timestamp = np.concatenate(timestamp_list).astype("datetime64[us]").astype(np.int64) / 1e6
+    matrix = np.concatenate(matrix_list, axis=1).astype(np.float64)
+    sort_idx = np.argsort(timestamp, kind="stable")
+    timestamp = timestamp[sort_idx]
+    matrix = matrix[:, sort_idx]
+
+    # order the bands by frequency
+    frequencies = np.array([float(x.split()[0]) for x in hsr_data.data[0].band_central_frequency])
+    band_order = np.argsort(frequencies)
+    frequencies = frequencies[band_order]
+    matrix = matrix[band_order, :]
+
+    # bin the data onto a regular time grid
+    #
+    # NOTE: when no binning is requested, we still put the data onto a regular grid using the
+    # native time resolution, so that any data gaps are rendered as gaps
+    if (time_bin_seconds is None):
+        time_bin_seconds = float(np.median(np.diff(timestamp))) if len(timestamp) > 1 else 1.0
+    time_edges, matrix = bin_to_grid(timestamp, matrix, timestamp[0], timestamp[-1], time_bin_seconds)
+    time_edges = mdates.date2num(np.round(time_edges * 1e6).astype(np.int64).astype("datetime64[us]"))
+    frequency_edges = __frequency_edges(frequencies)
+
+    # set color range
+    vmin = None
+    vmax = None
+    if (color_range is not None):
+        vmin, vmax = color_range
+
+    # render as a single image
+    fig = plt.figure(figsize=figsize)
+    ax = fig.add_axes((0, 0, 1, 1))
+    mesh = ax.pcolormesh(time_edges, frequency_edges, matrix, cmap=cmap, vmin=vmin, vmax=vmax, shading="flat", rasterized=True)
+
+    # add colorbar
+    if (colorbar is True):
+        cbar = fig.colorbar(mesh, ax=ax)
+        cbar.set_label("Absorption (dB)" if absorption is True else "Raw Power (dB)")
+
+    # add axis titles
+    ax.set_xlabel(("Hour (UTC)" if date_format is None else "Time (UTC)") if xtitle is None else xtitle)
+    ax.set_ylabel("%s HSR Frequency (MHz)" % (site.upper()) if ytitle is None else ytitle)
+
+    # format the x-axis (dates) automatically or as requested
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%H' if date_format is None else date_format))
+
+    # set x-range
+    if (xrange is not None):
+        ax.set_xlim(xrange)  # type: ignore
+
+    # add title
+    if (title is not None):
+        ax.set_title(title)
+
+    # save figure or show it
+    if (savefig is True):
+        # check that filename has been set
+        if (savefig_filename is None):
+            raise ValueError("The savefig_filename parameter is missing, but required since savefig was set to True.")
+
+        # save the figure
+        f_extension = os.path.splitext(savefig_filename)[-1].lower()
+        if (".jpg" == f_extension or ".jpeg" == f_extension):
+            # check quality setting
+            if (savefig_quality is not None):  # pragma: nocover-ok
+                plt.savefig(savefig_filename, quality=savefig_quality, bbox_inches="tight")
+            else:
+                plt.savefig(savefig_filename, bbox_inches="tight")
+        else:
+            if (savefig_quality is not None):
+                # quality specified, but output filename is not a JPG, so show a warning
+                show_warning("The savefig_quality parameter was specified, but is only used for saving JPG files. The " +
+                             "savefig_filename parameter was determined to not be a JPG file, so the quality will be ignored")
+            plt.savefig(savefig_filename, bbox_inches="tight")
+
+        # clean up by closing the figure
+        plt.close(fig)
+
+    elif (returnfig is True):
+        # return the figure and axis objects
+        return (fig, ax)
+    else:
+        # show the figure
+        plt.show(fig)
+
+        # cleanup by closing the figure
+        plt.close(fig)
+
+    # return
+    return None
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 
@@ -25,3 +26,121 @@ def set_theme(theme):
         plt.style.use("dark_background")
     else:
         plt.style.use(theme)
+
+
+def extract_series(data, absorption, hsr_band):
+    """
+    Pull a single time series out of a riometer or HSR Data object, concatenating all
+    records (ie. multiple days) together. Returns the site UID, timestamps, and values.
+    """
+    # get dataset and site names
+    dataset = data.dataset.name if data.dataset is not None else "unknown dataset"
+    site = data.metadata[0]["site_unique_id"] if len(data.metadata) > 0 else "unknown"
+
+    # pull out the data array of interest from each record
+    timestamp_list = []
+    value_list = []
+    for d in data.data:
+        if (dataset == "SWAN_HSR_K0_H5"):
+            band_idx = 0 if hsr_band is None else hsr_band
+            if (absorption is True):
+                if (d.absorption is None):
+                    raise ValueError(f"No absorption data available for '{dataset}'")
+                value_list.append(d.absorption[band_idx, :])
+            else:
+                value_list.append(d.raw_power[band_idx, :])
+        else:
+            if (absorption is True):
+                if (d.absorption is None):
+                    raise ValueError(f"No absorption data available for '{dataset}'")
+                value_list.append(d.absorption)
+            else:
+                value_list.append(d.raw_signal)
+        timestamp_list.append(d.timestamp)
+
+    # check that we found something
+    if (len(timestamp_list) == 0):
+        raise ValueError("Received an empty Data object for site '%s' (%s)" % (site, dataset))
+
+    # convert to epoch seconds
+    timestamp = np.concatenate(timestamp_list).astype("datetime64[us]").astype(np.int64) / 1e6
+    values = np.concatenate(value_list).astype(np.float64)
+
+    # return
+    return site, timestamp, values
+
+
+def align_series(series_list, time_resolution_seconds):
+    """
+    Resample a list of (timestamp, values) pairs onto a single common time grid covering
+    the overlapping time range of all series. Missing values are linearly interpolated.
+
+    Returns the common time grid (epoch seconds), the aligned 2D array (series x time), and
+    the time resolution used.
+    """
+    # determine time resolution, using the coarsest series if not supplied
+    if (time_resolution_seconds is None):
+        time_resolution_seconds = 0.0
+        for timestamp, _ in series_list:
+            if (len(timestamp) > 1):
+                time_resolution_seconds = max(time_resolution_seconds, float(np.median(np.diff(timestamp))))
+        if (time_resolution_seconds <= 0):
+            raise ValueError("Unable to determine the time resolution of the supplied data")
+
+    # determine overlapping time range
+    start = max([timestamp[0] for timestamp, _ in series_list])
+    end = min([timestamp[-1] for timestamp, _ in series_list])
+    if (end <= start):
+        raise ValueError("The supplied data do not overlap in time")
+    time_grid = np.arange(start, end + time_resolution_seconds / 2.0, time_resolution_seconds)
+
+    # resample each series onto the grid, skipping over any missing values
+    aligned = np.empty((len(series_list), len(time_grid)), dtype=np.float64)
+    for i, (timestamp, values) in enumerate(series_list):
+        valid_idx = np.isfinite(values)
+        if (np.count_nonzero(valid_idx) == 0):
+            aligned[i, :] = np.nan
+        else:
+            sort_idx = np.argsort(timestamp[valid_idx], kind="stable")
+            aligned[i, :] = np.interp(time_grid, timestamp[valid_idx][sort_idx], values[valid_idx][sort_idx])
+
+    # return
+    return time_grid, aligned, time_resolution_seconds
+
+
+def bin_to_grid(timestamp, matrix, start, end, time_bin_seconds):
+    """
+    Average a (rows x time) matrix into regular time bins spanning the start and end times (epoch
+    seconds). Bins with no data are filled with NaN, so that any data gaps are shown as gaps when
+    rendered as an image. The timestamps must be sorted.
+
+    Returns the bin edges (epoch seconds) and the binned matrix.
+    """
+    # determine bin for each sample, dropping any outside of the grid
+    n_bins = int(np.floor((end - start) / time_bin_seconds)) + 1
+    bin_idx = np.floor((timestamp - start) / time_bin_seconds).astype(np.int64)
+    in_grid = (bin_idx >= 0) & (bin_idx < n_bins)
+    bin_idx = bin_idx[in_grid]
+    matrix = matrix[:, in_grid]
+
+    # sum and count the finite values in each bin
+    #
+    # NOTE: the timestamps are sorted, so each bin is a contiguous slice of samples and we
+    # can reduce them all in a single pass
+    sums = np.zeros((matrix.shape[0], n_bins), dtype=np.float64)
+    counts = np.zeros((matrix.shape[0], n_bins), dtype=np.int64)
+    if (len(bin_idx) > 0):
+        finite_mask = np.isfinite(matrix)
+        used_bins, bin_starts = np.unique(bin_idx, return_index=True)
+        sums[:, used_bins] = np.add.reduceat(np.where(finite_mask, matrix, 0.0), bin_starts, axis=1)
+        counts[:, used_bins] = np.add.reduceat(finite_mask.astype(np.int64), bin_starts, axis=1)
+
+    # compute the averages
+    with np.errstate(invalid="ignore", divide="ignore"):
+        binned = np.where(counts > 0, sums / counts, np.nan)
+
+    # set bin edges
+    bin_edges = start + np.arange(0, n_bins + 1) * time_bin_seconds
+
+    # return
+    return bin_edges, binned
@@ -0,0 +1,174 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Memoized conversion of magnetic contour lines from AACGM to geographic coordinates.
+
+Contour lines are sampled on a fixed grid (see `_contours.get_sampling_grid()`), so we cache
+the converted coordinates of each line, for each grid point that has been converted so far. Lines
+are keyed by the date, line type (constant latitude or longitude), value, and sampling grid. The
+cache is kept in memory, and can optionally be backed by files on disk.
+
+NOTE: the AACGM coefficients are evaluated at the start of the day. Their variation within a day
+is far smaller than anything visible on a map.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import os
+import hashlib
+import datetime
+import threading
+import aacgmv2
+import numpy as np
+from collections import OrderedDict
+from ._contours import get_sampling_grid
+
+# cache of converted lines
+__LINE_CACHE_MAX_SIZE = 512
+__line_cache = OrderedDict()
+__line_cache_lock = threading.Lock()
+
+
+def __disk_cache_filename(cache_dir, key):
+    return os.path.join(cache_dir, "%s.npz" % (hashlib.sha256(repr(key).encode()).hexdigest()[0:32]))
+
+
+def __read_disk_cache(cache_filename, n_points):
+    """
+    Read a line from the on-disk cache, returning None if it is not available.
+    """
+    if (os.path.exists(cache_filename) is False):
+        return None
+    try:
+        with np.load(cache_filename) as npz:
+            entry = {"geo_lat": npz["geo_lat"], "geo_lon": npz["geo_lon"], "converted": npz["converted"]}
+        if (len(entry["converted"]) != n_points):
+            return None
+        return entry
+    except Exception:
+        # corrupt or incompatible file, we'll regenerate it
+        return None
+
+
+def __write_disk_cache(cache_filename, entry):
+    """
+    Write a line to the on-disk cache.
+
+    NOTE: we write to a temporary file first and then move it into place, so that concurrent
+    readers never see a partially written file.
+    """
+    os.makedirs(os.path.dirname(cache_filename), exist_ok=True)
+    tmp_filename = "%s.%d.tmp" % (cache_filename, os.getpid())
+    with open(tmp_filename, "wb") as fp:
+        np.savez(fp, geo_lat=entry["geo_lat"], geo_lon=entry["geo_lon"], converted=entry["converted"])
+    os.replace(tmp_filename, cache_filename)
+
+
+def __get_entry(key, n_points, cache_dir):
+    """
+    Get the cache entry for a line, from memory or disk, or create a new one.
+    """
+    with __line_cache_lock:
+        if (key in __line_cache):
+            __line_cache.move_to_end(key)
+            return __line_cache[key]
+
+    entry = None
+    if (cache_dir is not None):
+        entry = __read_disk_cache(__disk_cache_filename(cache_dir, key), n_points)
+    if (entry is None):
+        entry = {
+            "geo_lat": np.full(n_points, np.nan, dtype=np.float64),
+            "geo_lon": np.full(n_points, np.nan, dtype=np.float64),
+            "converted": np.zeros(n_points, dtype=bool),
+        }
+
+    # add to cache, evicting the least recently used entry if necessary
+    with __line_cache_lock:
+        __line_cache[key] = entry
+        if (len(__line_cache) > __LINE_CACHE_MAX_SIZE):
+            __line_cache.popitem(last=False)
+    return entry
+
+
+def convert_mag_lines(line_type, values, t, timestamp, t_start, t_stop, min_step, cache_dir=None):
+    """
+    Convert points on magnetic lines of constant latitude (line_type="lat", with `t` being the
+    magnetic longitudes) or constant longitude (line_type="lon", with `t` being the magnetic
+    latitudes) to geographic coordinates. All points must be on the sampling grid for the
+    `t_start`, `t_stop`, and `min_step` values.
+
+    All points that haven't been converted before are converted in a single call. Returns the
+    geographic latitudes and longitudes.
+    """
+    # determine the grid index of each point
+    n_intervals, fine_step = get_sampling_grid(t_start, t_stop, min_step)
+    grid_idx = np.rint((np.asarray(t) - t_start) / fine_step).astype(np.int64)
+    values = np.asarray(values, dtype=np.float64)
+
+    # look up the cached values for each line
+    epoch = timestamp.date() if isinstance(timestamp, datetime.datetime) else timestamp
+    geo_lat = np.empty(len(values), dtype=np.float64)
+    geo_lon = np.empty(len(values), dtype=np.float64)
+    missing = np.zeros(len(values), dtype=bool)
+    entries = {}
+    for value in np.unique(values):
+        key = (epoch.isoformat(), line_type, round(float(value), 6), float(t_start), float(t_stop), n_intervals)
+        entries[value] = (key, __get_entry(key, n_intervals + 1, cache_dir))
+        line_idx = np.nonzero(values == value)[0]
+        entry = entries[value][1]
+        geo_lat[line_idx] = entry["geo_lat"][grid_idx[line_idx]]
+        geo_lon[line_idx] = entry["geo_lon"][grid_idx[line_idx]]
+        missing[line_idx] = ~entry["converted"][grid_idx[line_idx]]
+
+    # convert all missing points at once
+    if (np.count_nonzero(missing) > 0):
+        t_missing = t_start + grid_idx[missing] * fine_step
+        if (line_type == "lat"):
+            mag_lat = values[missing]
+            mag_lon = t_missing
+        else:
+            mag_lat = t_missing
+            mag_lon = values[missing]
+        converted_lat, converted_lon, _ = aacgmv2.convert_latlon_arr(
+            mag_lat,
+            mag_lon,
+            mag_lat * 0.0,
+            datetime.datetime.combine(epoch, datetime.time()),
+            method_code="A2G",
+        )
+        geo_lat[missing] = converted_lat
+        geo_lon[missing] = converted_lon
+
+        # update the cache
+        missing_idx = np.nonzero(missing)[0]
+        for value in np.unique(values[missing]):
+            key, entry = entries[value]
+            line_idx = missing_idx[values[missing_idx] == value]
+            entry["geo_lat"][grid_idx[line_idx]] = geo_lat[line_idx]
+            entry["geo_lon"][grid_idx[line_idx]] = geo_lon[line_idx]
+            entry["converted"][grid_idx[line_idx]] = True
+            if (cache_dir is not None):
+                __write_disk_cache(__disk_cache_filename(cache_dir, key), entry)
+
+    # return
+    return geo_lat, geo_lon
+
+
+def clear_cache():
+    """
+    Clear the in-memory magnetic contour cache.
+    """
+    with __line_cache_lock:
+        __line_cache.clear()
@@ -0,0 +1,145 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Writers for streaming already-rendered RGBA frames to an animation file.
+
+Matplotlib's animation writers grab each frame using `savefig()`, which redraws the
+entire figure. Since we blit each frame ourselves, we write the rendered pixel buffers
+directly instead.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import os
+import shutil
+import tempfile
+import subprocess  # nosec
+import numpy as np
+import matplotlib
+from PIL import Image
+
+
+class GifFrameWriter:
+    """
+    Write frames to an animated GIF file.
+
+    NOTE: the frames are kept in memory (as palette-based images), and the file is only written
+    when closed, since Pillow writes all frames of an animated GIF at once.
+    """
+
+    def __init__(self, filename, fps):
+        self.__filename = filename
+        self.__duration_ms = int(round(1000.0 / fps))
+        self.__frames = []
+
+    def write(self, frame):
+        # quantize now, so that we only keep the palette-based frame in memory
+        self.__frames.append(Image.fromarray(frame[:, :, :3]).quantize())
+
+    def close(self, aborted=False):
+        """
+        Write the file, unless the writing of frames was aborted.
+        """
+        if (aborted is True or len(self.__frames) == 0):
+            self.__frames = []
+            return
+        self.__frames[0].save(
+            self.__filename,
+            save_all=True,
+            append_images=self.__frames[1:],
+            duration=self.__duration_ms,
+            loop=0,
+        )
+        self.__frames = []
+
+
+class FFMpegFrameWriter:
+    """
+    Write frames to a video file (ie. mp4), by piping raw frames to ffmpeg.
+    """
+
+    def __init__(self, filename, fps, width, height):
+        ffmpeg_path = shutil.which(matplotlib.rcParams["animation.ffmpeg_path"])
+        if (ffmpeg_path is None):
+            raise ValueError("Unable to find ffmpeg, which is required to write '%s'. Install ffmpeg, " % (os.path.basename(filename)) +
+                             "or use a .gif output filename instead.")
+        command = [
+            ffmpeg_path,
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgba",
+            "-s",
+            "%dx%d" % (width, height),
+            "-r",
+            str(fps),
+            "-i",
+            "-",
+            "-vf",
+            "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-pix_fmt",
+            "yuv420p",
+            filename,
+        ]
+        # NOTE: ffmpeg's messages are written to a temporary file rather than a pipe, since a full
+        # pipe that isn't read until the end would block ffmpeg, and so the writing of frames
+        self.__stderr = tempfile.TemporaryFile()
+        self.__proc = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=self.__stderr)  # nosec
+        self.__closed = False
+
+    def write(self, frame):
+        try:
+            self.__proc.stdin.write(np.ascontiguousarray(frame).tobytes())  # type: ignore
+        except BrokenPipeError:
+            # ffmpeg exited early, report why
+            raise ValueError("Error writing animation using ffmpeg: %s" % (self.__finish())) from None
+
+    def close(self, aborted=False):
+        """
+        Finish writing the file. Errors are raised, unless the writing of frames was aborted by
+        another error, to not hide that error.
+        """
+        stderr = self.__finish()
+        if (stderr is not None and aborted is False):
+            raise ValueError("Error writing animation using ffmpeg: %s" % (stderr))
+
+    def __finish(self):
+        """
+        Wait for ffmpeg to finish. Returns its error messages if it failed, or None.
+        """
+        if (self.__closed is True):
+            return None
+        self.__closed = True
+        try:
+            self.__proc.stdin.close()  # type: ignore
+        except BrokenPipeError:
+            pass
+        self.__proc.wait()
+        self.__stderr.seek(0)
+        stderr = self.__stderr.read().decode(errors="replace").strip()
+        self.__stderr.close()
+        return stderr if self.__proc.returncode != 0 else None
+
+
+def open_frame_writer(filename, fps, width, height):
+    """
+    Open the appropriate frame writer for the output filename.
+    """
+    if (os.path.splitext(filename)[-1].lower() == ".gif"):
+        return GifFrameWriter(filename, fps)
+    else:
+        return FFMpegFrameWriter(filename, fps, width, height)
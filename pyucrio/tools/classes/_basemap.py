@@ -0,0 +1,157 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Cached Natural Earth basemap geometries (ocean, land, borders), already clipped to the
+visible map area and projected into the map projection.
+
+Loading the shapefiles and projecting every polygon into the map projection is the bulk of
+the cost of rendering a map. We do it once per projection, extent, and resolution, and keep
+the result in a process-wide cache, optionally backed by an on-disk cache.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import os
+import hashlib
+import threading
+import shapely
+import numpy as np
+import cartopy.crs
+import cartopy.feature
+from collections import OrderedDict
+
+# the basemap features
+FEATURES = {
+    "ocean": cartopy.feature.OCEAN,
+    "land": cartopy.feature.LAND,
+    "borders": cartopy.feature.BORDERS,
+}
+
+# cache of geometries
+__GEOMETRY_CACHE_MAX_SIZE = 16
+__geometry_cache = OrderedDict()
+__geometry_cache_lock = threading.Lock()
+
+
+def __project_feature(feature, scale, lonlat_extent, cartopy_projection, projected_extent):
+    """
+    Load the geometries of a feature intersecting the visible area, and project them into
+    the map projection, clipped to the visible area.
+    """
+    geometries = []
+    x0, x1, y0, y1 = projected_extent
+    for geometry in feature.with_scale(scale).intersecting_geometries(lonlat_extent):
+        projected = cartopy_projection.project_geometry(geometry, feature.crs)
+        clipped = shapely.clip_by_rect(projected, x0, y0, x1, y1)
+        if (clipped.is_empty is False):
+            geometries.append(clipped)
+    return geometries
+
+
+def __read_disk_cache(cache_filename):
+    """
+    Read geometries from the on-disk cache, returning None if they are not available.
+    """
+    if (os.path.exists(cache_filename) is False):
+        return None
+    try:
+        geometries = {}
+        with np.load(cache_filename) as npz:
+            for name in FEATURES.keys():
+                wkb = npz["%s_wkb" % (name)].tobytes()
+                offsets = npz["%s_offsets" % (name)]
+                geometries[name] = list(shapely.from_wkb([wkb[offsets[i]:offsets[i + 1]] for i in range(0, len(offsets) - 1)]))
+        return geometries
+    except Exception:
+        # corrupt or incompatible file, we'll regenerate it
+        return None
+
+
+def __write_disk_cache(cache_filename, geometries):
+    """
+    Write geometries to the on-disk cache, as the concatenated WKB of each feature's geometries
+    and the offsets of each geometry in it.
+
+    NOTE: we write to a temporary file first and then move it into place, so that concurrent
+    readers never see a partially written file.
+    """
+    os.makedirs(os.path.dirname(cache_filename), exist_ok=True)
+    arrays = {}
+    for name, geometry_list in geometries.items():
+        wkb_list = [bytes(x) for x in shapely.to_wkb(geometry_list)]
+        arrays["%s_wkb" % (name)] = np.frombuffer(b"".join(wkb_list), dtype=np.uint8)
+        arrays["%s_offsets" % (name)] = np.cumsum([0] + [len(x) for x in wkb_list], dtype=np.int64)
+    tmp_filename = "%s.%d.tmp" % (cache_filename, os.getpid())
+    with open(tmp_filename, "wb") as fp:
+        np.savez(fp, **arrays)
+    os.replace(tmp_filename, cache_filename)
+
+
+def get_basemap_geometries(ax, cartopy_projection, map_extent, cache_dir=None):
+    """
+    Retrieve the projected basemap geometries for the visible area of the axes, loading and
+    caching them if they do not exist yet.
+
+    Returns a dictionary of feature name to a list of geometries, in the map projection.
+    """
+    # determine the visible area, and the Natural Earth resolution to use
+    #
+    # NOTE: this is the same as what cartopy does when drawing a feature
+    projected_extent = tuple(ax.get_extent())
+    lonlat_extent = tuple(ax.get_extent(crs=cartopy.crs.PlateCarree()))
+    scale = cartopy.feature.AdaptiveScaler("110m", (("50m", 50), ("10m", 15))).scale_from_extent(lonlat_extent)
+
+    # check the cache
+    cache_key = (
+        type(cartopy_projection).__name__,
+        cartopy_projection.srs,
+        tuple([round(float(x), 6) for x in map_extent]),
+        scale,
+    )
+    with __geometry_cache_lock:
+        if (cache_key in __geometry_cache):
+            __geometry_cache.move_to_end(cache_key)
+            return __geometry_cache[cache_key]
+
+    # check the disk cache
+    geometries = None
+    cache_filename = None
+    if (cache_dir is not None):
+        cache_filename = os.path.join(cache_dir, "%s.npz" % (hashlib.sha256(repr(cache_key).encode()).hexdigest()[0:32]))
+        geometries = __read_disk_cache(cache_filename)
+
+    # generate the geometries
+    if (geometries is None):
+        geometries = {}
+        for name, feature in FEATURES.items():
+            geometries[name] = __project_feature(feature, scale, lonlat_extent, cartopy_projection, projected_extent)
+        if (cache_filename is not None):
+            __write_disk_cache(cache_filename, geometries)
+
+    # add to cache, evicting the least recently used entry if necessary
+    with __geometry_cache_lock:
+        __geometry_cache[cache_key] = geometries
+        if (len(__geometry_cache) > __GEOMETRY_CACHE_MAX_SIZE):
+            __geometry_cache.popitem(last=False)
+
+    # return
+    return geometries
+
+
+def clear_cache():
+    """
+    Clear the in-memory basemap geometry cache.
+    """
+    with __geometry_cache_lock:
+        __geometry_cache.clear()
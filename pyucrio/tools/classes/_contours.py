@@ -0,0 +1,161 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Adaptive sampling of contour lines in a map projection.
+
+A contour is a curve `t -> (x, y)` (ie. a line of constant latitude parameterized by
+longitude). We sample it coarsely, and then only refine the intervals that are visible
+on the map and where the projected curve deviates from a straight line, down to a
+minimum step. All sampled points lie on a fixed grid of `t` values, so that conversions
+can be memoized.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import numpy as np
+
+# number of times the coarse step is halved to reach the minimum step
+__REFINEMENT_LEVELS = 4
+
+# allowed deviation of the drawn line from the true curve, as a fraction of the visible area's size
+__TOLERANCE_FRACTION = 5e-4
+
+
+def __interval_visible(x0, y0, x1, y1, bbox):
+    """
+    Determine which intervals may be visible within the bounding box. Intervals crossing the edge
+    of the projection (one end not finite) are visible if their finite end is.
+    """
+    if (bbox is None):
+        return np.isfinite(x0) | np.isfinite(x1)
+    bx0, bx1, by0, by1 = bbox
+    with np.errstate(invalid="ignore"):
+        x_min = np.fmin(x0, x1)
+        x_max = np.fmax(x0, x1)
+        y_min = np.fmin(y0, y1)
+        y_max = np.fmax(y0, y1)
+        return (x_min <= bx1) & (x_max >= bx0) & (y_min <= by1) & (y_max >= by0)
+
+
+def get_sampling_grid(t_start, t_stop, min_step):
+    """
+    Get the finest grid that contours are sampled on, as the number of intervals and the step. All
+    sampled points are on this grid, with the coarse sampling using every 2^N'th point.
+    """
+    n_intervals = int(np.ceil((t_stop - t_start) / (min_step * 2**__REFINEMENT_LEVELS))) * 2**__REFINEMENT_LEVELS
+    return n_intervals, (t_stop - t_start) / n_intervals
+
+
+def __evaluate(func, values, t):
+    x, y = func(values, t)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x[~np.isfinite(x) | ~np.isfinite(y)] = np.nan
+    y[np.isnan(x)] = np.nan
+    return x, y
+
+
+def sample_contours(func, values, t_start, t_stop, min_step, projected_bbox=None):
+    """
+    Adaptively sample a set of curves `func(values, t) -> (x, y)` between `t_start` and `t_stop`, 
+    with a smallest step of `min_step`. For example, lines of constant latitude, with `values` being 
+    the latitudes and `t` being the longitude. All curves are evaluated together, so `func` is called
+    only once per refinement level.
+
+    If a projected bounding box (x0, x1, y0, y1) is given, only the parts of the curves within it
+    are refined and returned. Parts of the curves that are not returned, or not visible in the
+    projection, are separated by NaN values.
+
+    Returns a list of (x, y) tuples, one for each value.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if (len(values) == 0):
+        return []
+
+    # coarse sampling of all curves
+    #
+    # NOTE: we keep track of the point index on the finest grid (k), and which curve each point
+    # belongs to (c). Intervals between different curves are never refined or drawn.
+    n_intervals, fine_step = get_sampling_grid(t_start, t_stop, min_step)
+    coarse_k = np.arange(0, n_intervals + 1, 2**__REFINEMENT_LEVELS)
+    k = np.tile(coarse_k, len(values))
+    c = np.repeat(np.arange(0, len(values)), len(coarse_k))
+    x, y = __evaluate(func, values[c], t_start + k * fine_step)
+
+    # set the tolerance, based on the size of the visible area
+    if (projected_bbox is not None):
+        size = np.hypot(projected_bbox[1] - projected_bbox[0], projected_bbox[3] - projected_bbox[2])
+    elif (np.any(np.isfinite(x))):
+        size = np.hypot(np.nanmax(x) - np.nanmin(x), np.nanmax(y) - np.nanmin(y))
+    else:
+        size = 0.0
+    tolerance = __TOLERANCE_FRACTION * size
+
+    # refine the intervals where the projected curve is not straight
+    #
+    # NOTE: intervals that were found to be straight enough are not checked again
+    active = c[:-1] == c[1:]
+    for _ in range(0, __REFINEMENT_LEVELS):
+        candidate_idx = np.nonzero(active & __interval_visible(x[:-1], y[:-1], x[1:], y[1:], projected_bbox))[0]
+        if (len(candidate_idx) == 0):
+            break
+
+        # evaluate the midpoints
+        k_mid = (k[candidate_idx] + k[candidate_idx + 1]) // 2
+        c_mid = c[candidate_idx]
+        x_mid, y_mid = __evaluate(func, values[c_mid], t_start + k_mid * fine_step)
+
+        # determine which midpoints are needed
+        #
+        # NOTE: intervals crossing the edge of the projection are always refined
+        with np.errstate(invalid="ignore"):
+            deviation = np.hypot(x_mid - (x[candidate_idx] + x[candidate_idx + 1]) / 2.0, y_mid - (y[candidate_idx] + y[candidate_idx + 1]) / 2.0)
+        n_finite = np.isfinite(x[candidate_idx]).astype(int) + np.isfinite(x[candidate_idx + 1]).astype(int) + np.isfinite(x_mid).astype(int)
+        refine_idx = (deviation > tolerance) | ((n_finite > 0) & (n_finite < 3))
+        active[:] = False
+        if (np.count_nonzero(refine_idx) == 0):
+            break
+
+        # insert the midpoints, splitting each refined interval into two
+        #
+        # NOTE: intervals that are already at the finest step can't be split any further
+        insert_at = candidate_idx[refine_idx] + 1
+        active[candidate_idx[refine_idx]] = True
+        active = np.insert(active, insert_at, True)
+        k = np.insert(k, insert_at, k_mid[refine_idx])
+        c = np.insert(c, insert_at, c_mid[refine_idx])
+        x = np.insert(x, insert_at, x_mid[refine_idx])
+        y = np.insert(y, insert_at, y_mid[refine_idx])
+        active &= (k[1:] - k[:-1]) > 1
+
+    # remove the parts that are not visible
+    #
+    # NOTE: we keep the ends of each visible interval, and separate the runs of kept points with a NaN
+    visible = __interval_visible(x[:-1], y[:-1], x[1:], y[1:], projected_bbox) & (c[:-1] == c[1:])
+    keep = np.zeros(len(x), dtype=bool)
+    keep[:-1] |= visible
+    keep[1:] |= visible
+    keep &= np.isfinite(x)
+    curve_bounds = np.searchsorted(c, np.arange(0, len(values) + 1))
+    xy_list = []
+    for i in range(0, len(values)):
+        keep_idx = curve_bounds[i] + np.nonzero(keep[curve_bounds[i]:curve_bounds[i + 1]])[0]
+        if (len(keep_idx) == 0):
+            xy_list.append((np.empty(0), np.empty(0)))
+            continue
+        gap_idx = np.nonzero(~visible[keep_idx[:-1]] | (np.diff(keep_idx) > 1))[0] + 1
+        xy_list.append((np.insert(x[keep_idx], gap_idx, np.nan), np.insert(y[keep_idx], gap_idx, np.nan)))
+
+    # return
+    return xy_list
@@ -0,0 +1,167 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Spatial interpolation of per-site values onto a projected grid.
+
+The site to grid weight matrix only depends on the site locations, the grid, and the
+projection. We compute it once and keep it in a process-wide cache, so that interpolating
+many frames of data is just a matrix product.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import threading
+import numpy as np
+import cartopy.crs
+from collections import OrderedDict
+from ._projection import get_projected_extent
+
+# cache of weight matrices
+__WEIGHTS_CACHE_MAX_SIZE = 32
+__weights_cache = OrderedDict()
+__weights_cache_lock = threading.Lock()
+
+# mean radius of the Earth
+__EARTH_RADIUS_KM = 6371.0
+
+
+def __to_unit_vectors(latitude, longitude):
+    lat = np.deg2rad(np.asarray(latitude, dtype=np.float64))
+    lon = np.deg2rad(np.asarray(longitude, dtype=np.float64))
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def __nearest_site_distance(grid_lons, grid_lats, site_lons, site_lats):
+    """
+    Compute the great-circle distance (km) from each grid point to the nearest site. Grid points
+    that aren't on the globe are at an infinite distance.
+
+    NOTE: the distance is computed on the globe rather than in the projection, so that it is
+    correct whatever the units of the projection (ie. degrees for PlateCarree).
+    """
+    nearest_distance = np.full(len(grid_lons), np.inf, dtype=np.float64)
+    on_globe = np.isfinite(grid_lons) & np.isfinite(grid_lats)
+    cos_angle = np.clip(__to_unit_vectors(grid_lats[on_globe], grid_lons[on_globe]) @ __to_unit_vectors(site_lats, site_lons).T, -1.0, 1.0)
+    nearest_distance[on_globe] = __EARTH_RADIUS_KM * np.arccos(np.max(cos_angle, axis=1))
+    return nearest_distance
+
+
+def __compute_weights(site_x, site_y, grid_x, grid_y, method, power):
+    """
+    Compute the (n_grid_points x n_sites) matrix mapping site values to grid values.
+    """
+    # distance between every grid point and every site
+    distances = np.hypot(grid_x[:, np.newaxis] - site_x[np.newaxis, :], grid_y[:, np.newaxis] - site_y[np.newaxis, :])
+
+    if (method == "idw"):
+        # inverse distance weighting, with grid points exactly on a site taking that site's value
+        with np.errstate(divide="ignore"):
+            weights = 1.0 / distances**power
+        on_site = ~np.isfinite(weights)
+        on_site_rows = np.any(on_site, axis=1)
+        weights[on_site_rows, :] = on_site[on_site_rows, :].astype(np.float64)
+        weights /= np.sum(weights, axis=1, keepdims=True)
+    else:
+        # radial basis function interpolation, using a linear kernel with a constant term
+        #
+        # NOTE: the interpolant is grid = [phi_grid, 1] @ inv(A) @ [values, 0], so the weight
+        # matrix is the first n_sites columns of [phi_grid, 1] @ inv(A)
+        n_sites = len(site_x)
+        site_distances = np.hypot(site_x[:, np.newaxis] - site_x[np.newaxis, :], site_y[:, np.newaxis] - site_y[np.newaxis, :])
+        system = np.zeros((n_sites + 1, n_sites + 1), dtype=np.float64)
+        system[:n_sites, :n_sites] = site_distances
+        system[:n_sites, n_sites] = 1.0
+        system[n_sites, :n_sites] = 1.0
+        grid_terms = np.concatenate((distances, np.ones((distances.shape[0], 1))), axis=1)
+        weights = (grid_terms @ np.linalg.pinv(system))[:, :n_sites]
+
+    # return
+    return weights
+
+
+def get_interpolation_weights(site_lats, site_lons, cartopy_projection, map_extent, grid_size, method, power):
+    """
+    Retrieve the interpolation grid and weight matrix for a set of sites, computing and caching it
+    if it does not exist yet.
+
+    Returns the grid x and y coordinates (projected, 1D), the (n_grid_points x n_sites) weight matrix,
+    a mask of valid grid points (those inside the visible part of the projection), and the great-circle
+    distance (km) from each grid point to the nearest site.
+    """
+    # check parameters
+    if (method not in ["idw", "rbf"]):
+        raise ValueError("Interpolation method '%s' is not supported. Valid values are 'idw' or 'rbf'." % (method))
+    if (len(site_lats) == 0):
+        raise ValueError("At least one site is required for interpolation")
+    if (method == "rbf" and len(site_lats) < 2):
+        raise ValueError("At least two sites are required for RBF interpolation")
+
+    # check the cache
+    cache_key = (
+        tuple(np.round(site_lats, 6)),
+        tuple(np.round(site_lons, 6)),
+        cartopy_projection.srs,
+        tuple([float(x) for x in map_extent]),
+        tuple(grid_size),
+        method,
+        float(power),
+    )
+    with __weights_cache_lock:
+        if (cache_key in __weights_cache):
+            __weights_cache.move_to_end(cache_key)
+            return __weights_cache[cache_key]
+
+    # create the grid
+    x0, x1, y0, y1 = get_projected_extent(cartopy_projection, map_extent)
+    grid_x = np.linspace(x0, x1, grid_size[0])
+    grid_y = np.linspace(y0, y1, grid_size[1])
+    mesh_x, mesh_y = np.meshgrid(grid_x, grid_y)
+    mesh_x = mesh_x.ravel()
+    mesh_y = mesh_y.ravel()
+
+    # determine which grid points are actually on the globe
+    lonlat = cartopy.crs.Geodetic().transform_points(cartopy_projection, mesh_x, mesh_y)
+    valid_mask = np.isfinite(lonlat[:, 0]) & np.isfinite(lonlat[:, 1])
+
+    # project the sites
+    site_xyz = cartopy_projection.transform_points(cartopy.crs.Geodetic(), np.asarray(site_lons, dtype=np.float64),
+                                                   np.asarray(site_lats, dtype=np.float64))
+    site_x = site_xyz[:, 0]
+    site_y = site_xyz[:, 1]
+    if (not np.all(np.isfinite(site_x) & np.isfinite(site_y))):
+        raise ValueError("One or more sites are not visible in the map projection")
+
+    # compute the weights
+    weights = __compute_weights(site_x, site_y, mesh_x, mesh_y, method, power)
+    weights[~valid_mask, :] = 0.0
+    nearest_distance = __nearest_site_distance(lonlat[:, 0], lonlat[:, 1], np.asarray(site_lons, dtype=np.float64),
+                                               np.asarray(site_lats, dtype=np.float64))
+
+    # add to cache, evicting the least recently used entry if necessary
+    result = (grid_x, grid_y, weights, valid_mask, nearest_distance)
+    with __weights_cache_lock:
+        __weights_cache[cache_key] = result
+        if (len(__weights_cache) > __WEIGHTS_CACHE_MAX_SIZE):
+            __weights_cache.popitem(last=False)
+
+    # return
+    return result
+
+
+def clear_cache():
+    """
+    Clear the interpolation weights cache.
+    """
+    with __weights_cache_lock:
+        __weights_cache.clear()
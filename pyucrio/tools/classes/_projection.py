@@ -0,0 +1,89 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Helpers for working with map projections.
+
+NOTE: This is a private module only meant for use within the library.
+"""
+
+import threading
+import pyproj
+import numpy as np
+import cartopy.crs
+from collections import OrderedDict
+
+# cache of transformers
+__TRANSFORMER_CACHE_MAX_SIZE = 16
+__transformer_cache = OrderedDict()
+__transformer_cache_lock = threading.Lock()
+
+
+def get_projected_extent(cartopy_projection, map_extent):
+    """
+    Determine the projected bounding box of a [min_lon, max_lon, min_lat, max_lat] extent, by
+    projecting densely sampled points along its boundary.
+    """
+    min_lon, max_lon, min_lat, max_lat = map_extent
+    n_points = 100
+    boundary_lons = np.concatenate((
+        np.linspace(min_lon, max_lon, n_points),
+        np.full(n_points, max_lon),
+        np.linspace(max_lon, min_lon, n_points),
+        np.full(n_points, min_lon),
+    ))
+    boundary_lats = np.concatenate((
+        np.full(n_points, min_lat),
+        np.linspace(min_lat, max_lat, n_points),
+        np.full(n_points, max_lat),
+        np.linspace(max_lat, min_lat, n_points),
+    ))
+    xyz = cartopy_projection.transform_points(cartopy.crs.Geodetic(), boundary_lons, boundary_lats)
+    finite_idx = np.isfinite(xyz[:, 0]) & np.isfinite(xyz[:, 1])
+    if (np.count_nonzero(finite_idx) == 0):
+        raise ValueError("The map extent is not visible in the map projection")
+    return (
+        float(np.min(xyz[finite_idx, 0])),
+        float(np.max(xyz[finite_idx, 0])),
+        float(np.min(xyz[finite_idx, 1])),
+        float(np.max(xyz[finite_idx, 1])),
+    )
+
+
+def get_geodetic_transformer(cartopy_projection):
+    """
+    Get a transformer from geodetic coordinates (lon, lat) into the map projection.
+
+    Creating the CRS objects and transformer is expensive, so transformers are cached,
+    keyed by the WKT of the map projection.
+    """
+    # check the cache
+    cache_key = cartopy_projection.to_wkt()
+    with __transformer_cache_lock:
+        if (cache_key in __transformer_cache):
+            __transformer_cache.move_to_end(cache_key)
+            return __transformer_cache[cache_key]
+
+    # create the transformer
+    source_proj = pyproj.CRS.from_user_input(cartopy.crs.Geodetic())
+    target_proj = pyproj.CRS.from_user_input(cartopy_projection)
+    transformer = pyproj.Transformer.from_crs(source_proj, target_proj, always_xy=True)
+
+    # add to cache, evicting the least recently used entry if necessary
+    with __transformer_cache_lock:
+        __transformer_cache[cache_key] = transformer
+        if (len(__transformer_cache) > __TRANSFORMER_CACHE_MAX_SIZE):
+            __transformer_cache.popitem(last=False)
+
+    # return
+    return transformer
@@ -0,0 +1,89 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Class representation for the results of a cross-correlation analysis.
+"""
+
+import datetime
+from dataclasses import dataclass
+from typing import List
+from numpy import ndarray
+
+
+@dataclass
+class CrossCorrelationResult:
+    """
+    Class representation for the pairwise cross-correlation of riometer site time series.
+
+    Attributes:
+        site_uid_list (List[str]): 
+            The sites included in the analysis, in the order used to index all matrices.
+
+        start (datetime.datetime): 
+            Start of the common (overlapping) time range that was analyzed.
+
+        end (datetime.datetime): 
+            End of the common (overlapping) time range that was analyzed.
+
+        time_resolution_seconds (float): 
+            Sampling interval of the aligned time series, in seconds.
+
+        lags (ndarray): 
+            The lags evaluated, in seconds.
+
+        correlation (ndarray): 
+            Normalized cross-correlation for every pair of sites, with shape (n_sites, n_sites, n_lags).
+            Element `[i, j, k]` is the correlation of site `i` with site `j` lagged by `lags[k]`.
+
+        peak_lag (ndarray): 
+            Lag (in seconds) of peak correlation for every pair of sites, with shape (n_sites, n_sites). A
+            positive value at `[i, j]` means that variations at site `i` occur after those at site `j`.
+
+        peak_correlation (ndarray): 
+            The peak correlation for every pair of sites, with shape (n_sites, n_sites).
+    """
+    site_uid_list: List[str]
+    start: datetime.datetime
+    end: datetime.datetime
+    time_resolution_seconds: float
+    lags: ndarray
+    correlation: ndarray
+    peak_lag: ndarray
+    peak_correlation: ndarray
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return "CrossCorrelationResult(site_uid_list=%s, start=%s, end=%s, time_resolution_seconds=%s, lags=array(dims=%s), ...)" % (
+            self.site_uid_list,
+            self.start.__repr__(),
+            self.end.__repr__(),
+            self.time_resolution_seconds,
+            self.lags.shape,
+        )
+
+    def pretty_print(self):
+        """
+        A special print output for this class.
+        """
+        print("CrossCorrelationResult:")
+        print("  %-24s: %s" % ("site_uid_list", self.site_uid_list))
+        print("  %-24s: %s" % ("start", self.start))
+        print("  %-24s: %s" % ("end", self.end))
+        print("  %-24s: %s" % ("time_resolution_seconds", self.time_resolution_seconds))
+        print("  %-24s: array(dims=%s, dtype=%s)" % ("lags", self.lags.shape, self.lags.dtype))
+        print("  %-24s: array(dims=%s, dtype=%s)" % ("correlation", self.correlation.shape, self.correlation.dtype))
+        print("  %-24s: array(dims=%s, dtype=%s)" % ("peak_lag", self.peak_lag.shape, self.peak_lag.dtype))
+        print("  %-24s: array(dims=%s, dtype=%s)" % ("peak_correlation", self.peak_correlation.shape, self.peak_correlation.dtype))
@@ -17,16 +17,24 @@ Class representation for a FoV map.
 
 import os
 import datetime
-import pyproj
 import aacgmv2
+import matplotlib.cm
+import matplotlib.collections
 import matplotlib.colors
 import numpy as np
 import matplotlib.pyplot as plt
 import cartopy.feature
 import cartopy.crs
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from typing import List, Dict, Tuple, Sequence, Union, Optional, Any
 from numpy import ndarray
 from ..._util import show_warning
+from ._interpolation import get_interpolation_weights
+from ._animation import open_frame_writer
+from ._basemap import get_basemap_geometries
+from ._contours import sample_contours
+from ._aacgm import convert_mag_lines
+from ._projection import get_projected_extent, get_geodetic_transformer
 
 
 class SiteMap:
@@ -61,13 +69,28 @@ class SiteMap:
             Int specifying the marker size to associate with each set of sites for plotting.
             Default is 1.
         
-        contour_data (Dict[str, List[Any]]): 
-            Generated contour data.
+        contour_data (Dict[str, Any]): 
+            Generated contour data, added using the `add_geo_contours()` and `add_mag_contours()` methods.
+            The projected coordinates of all contours are concatenated into the `coords` array (n_points x 2),
+            with contour `i` spanning `coords[offsets[i]:offsets[i + 1]]`. The `color`, `linewidth`, 
+            `linestyle`, `marker`, and `zorder` entries give the style of each contour.
+
+        interpolation_data (Dict[str, Any]): 
+            Interpolated site values and rendering settings, added using the `add_interpolation()` method.
     """
 
-    def __init__(self, cartopy_projection: cartopy.crs.Projection, site_uid_list: List[List[str]], site_locations: List[Dict[str, ndarray]],
-                 instrument_array: List[str], data_availability: Optional[List[Dict[str, bool]]], color: List[str], symbol: List[str],
-                 sym_size: List[int], contour_data, ucrio_obj):
+    def __init__(self,
+                 cartopy_projection: cartopy.crs.Projection,
+                 site_uid_list: List[List[str]],
+                 site_locations: List[Dict[str, ndarray]],
+                 instrument_array: List[str],
+                 data_availability: Optional[List[Dict[str, bool]]],
+                 color: List[str],
+                 symbol: List[str],
+                 sym_size: List[int],
+                 contour_data,
+                 ucrio_obj,
+                 interpolation_data: Optional[Dict[str, Any]] = None):
 
         # Public vars
         self.cartopy_projection = cartopy_projection
@@ -79,6 +102,7 @@ class SiteMap:
         self.sym_size = sym_size
         self.symbol = symbol
         self.contour_data = contour_data
+        self.interpolation_data = interpolation_data
 
         # Private vars
         self.__ucrio_obj = ucrio_obj
@@ -184,6 +208,311 @@ class SiteMap:
         else:
             self.data_availability = data_availability_list
 
+    def __get_site_coordinates(self, site_uids: Optional[List[str]] = None):
+        """
+        Get the site UIDs, latitudes, and longitudes of the sites in this object, across
+        all instrument arrays. If site UIDs are given, only those sites are returned, in 
+        the same order.
+        """
+        # gather all sites
+        all_sites = {}
+        for i in range(0, len(self.site_uid_list)):
+            for site in self.site_uid_list[i]:
+                if (site not in all_sites):
+                    all_sites[site] = self.site_locations[i][site]
+
+        # filter
+        if (site_uids is None):
+            site_uids = list(all_sites.keys())
+        lats = np.empty(len(site_uids), dtype=np.float64)
+        lons = np.empty(len(site_uids), dtype=np.float64)
+        for i, site in enumerate(site_uids):
+            if (site not in all_sites):
+                raise ValueError("Site '%s' is not included in this SiteMap object" % (site))
+            lats[i] = float(np.squeeze(all_sites[site][0]))
+            lons[i] = float(np.squeeze(all_sites[site][1]))
+
+        # return
+        return site_uids, lats, lons
+
+    def __get_site_instrument_index(self, site_uids: List[str]) -> List[int]:
+        """
+        Get the index of the instrument array that each site belongs to.
+        """
+        site_instrument_idx = []
+        for site in site_uids:
+            for i in range(0, len(self.site_uid_list)):
+                if (site in self.site_uid_list[i]):
+                    site_instrument_idx.append(i)
+                    break
+        return site_instrument_idx
+
+    def interpolate(self,
+                    values: Union[Dict[str, float], ndarray],
+                    map_extent: Sequence[Union[float, int]],
+                    grid_size: Tuple[int, int] = (200, 200),
+                    method: str = "idw",
+                    power: float = 2.0,
+                    max_distance_km: Optional[float] = None) -> Tuple[ndarray, ndarray, ndarray]:
+        """
+        Interpolate per-site values (ie. absorption) onto a regular grid in the map projection. 
+        
+        The weights mapping the sites onto the grid only depend on the site locations, grid, and 
+        projection. They are computed once and cached, so interpolating many timestamps (either by
+        repeated calls, or by supplying a 2D array of values) is a single matrix product.
+
+        Args:
+            values (Dict[str, float] or ndarray): 
+                The values to interpolate. Either a dictionary of site UID to value, or an array 
+                ordered the same as all sites in `site_uid_list` (flattened across instrument arrays). 
+                A 2D array of shape (n_timestamps, n_sites), or a dictionary of site UID to an array
+                of values, can be supplied to interpolate many timestamps at once. NaN values are not 
+                supported.
+
+            map_extent (List[int]): 
+                Latitude/longitude range to cover with the interpolation grid. This is a list of 4 integers 
+                and/or floats, in the order of [min_lon, max_lon, min_lat, max_lat].
+
+            grid_size (Tuple[int, int]): 
+                Number of grid points in the x and y directions. Default is `(200, 200)`.
+
+            method (str): 
+                The interpolation method, either `idw` (inverse distance weighting) or `rbf` (radial basis 
+                function, using a linear kernel). Default is `idw`.
+
+            power (float): 
+                The power parameter used for inverse distance weighting. Default is `2.0`.
+
+            max_distance_km (float): 
+                Grid points further than this great-circle distance from the nearest site are set to NaN. 
+                Default is to not limit the distance.
+
+        Returns:
+            A tuple of the grid x coordinates (1D), grid y coordinates (1D), and the interpolated values. The 
+            interpolated values have shape (n_y, n_x) for a single timestamp, or (n_timestamps, n_y, n_x) if
+            a 2D array of values was supplied. Coordinates are in the map projection.
+
+        Raises:
+            ValueError: issues encountered with supplied parameters.
+        """
+        # get the values and site coordinates
+        if (isinstance(values, dict)):
+            site_uids, lats, lons = self.__get_site_coordinates(list(values.keys()))
+            values_arr = np.stack([np.asarray(values[x], dtype=np.float64) for x in site_uids], axis=-1)
+        else:
+            site_uids, lats, lons = self.__get_site_coordinates()
+            values_arr = np.asarray(values, dtype=np.float64)
+        if (values_arr.shape[-1] != len(site_uids)):
+            raise ValueError("Number of values (%d) does not match the number of sites (%d)" % (values_arr.shape[-1], len(site_uids)))
+
+        # get the weights
+        grid_x, grid_y, weights, valid_mask, nearest_distance = get_interpolation_weights(
+            lats,
+            lons,
+            self.cartopy_projection,
+            map_extent,
+            grid_size,
+            method,
+            power,
+        )
+
+        # interpolate
+        grid = (weights @ values_arr.T).T
+        invalid_mask = ~valid_mask
+        if (max_distance_km is not None):
+            invalid_mask = invalid_mask | (nearest_distance > max_distance_km)
+        grid[..., invalid_mask] = np.nan
+        grid = grid.reshape(values_arr.shape[:-1] + (len(grid_y), len(grid_x)))
+
+        # return
+        return grid_x, grid_y, grid
+
+    def add_interpolation(self,
+                          values: Dict[str, float],
+                          map_extent: Sequence[Union[float, int]],
+                          grid_size: Tuple[int, int] = (200, 200),
+                          method: str = "idw",
+                          power: float = 2.0,
+                          max_distance_km: Optional[float] = None,
+                          cmap: str = "viridis",
+                          color_range: Optional[Union[Tuple[float, float], Tuple[int, int]]] = None,
+                          alpha: float = 0.7,
+                          colorbar: bool = True,
+                          colorbar_title: Optional[str] = "Absorption (dB)"):
+        """
+        Add an interpolated field of per-site values (ie. absorption) to the SiteMap, which will be
+        drawn between the land and the sites when plotting. See `interpolate()` for further details.
+
+        Args:
+            values (Dict[str, float]): 
+                The values to interpolate, as a dictionary of site UID to value.
+
+            map_extent (List[int]): 
+                Latitude/longitude range to cover with the interpolation grid. This is a list of 4 integers 
+                and/or floats, in the order of [min_lon, max_lon, min_lat, max_lat].
+
+            grid_size (Tuple[int, int]): 
+                Number of grid points in the x and y directions. Default is `(200, 200)`.
+
+            method (str): 
+                The interpolation method, either `idw` (inverse distance weighting) or `rbf` (radial basis 
+                function, using a linear kernel). Default is `idw`.
+
+            power (float): 
+                The power parameter used for inverse distance weighting. Default is `2.0`.
+
+            max_distance_km (float): 
+                Grid points further than this great-circle distance from the nearest site are not drawn. 
+                Default is to not limit the distance.
+
+            cmap (str): 
+                The matplotlib colormap to use. Default is `viridis`.
+
+            color_range (list[int | float]): 
+                The [min, max] values to use for the colormap. Default is determined automatically by matplotlib.
+
+            alpha (float): 
+                The transparency of the interpolated field. Default is `0.7`.
+
+            colorbar (bool): 
+                Add a colorbar when plotting. Default is `True`.
+
+            colorbar_title (str): 
+                The colorbar title. Default is `Absorption (dB)`.
+
+        Returns:
+            The object's interpolation_data parameter is populated appropriately.
+
+        Raises:
+            ValueError: issues encountered with supplied parameters.
+        """
+        # interpolate
+        grid_x, grid_y, grid = self.interpolate(values, map_extent, grid_size=grid_size, method=method, power=power, max_distance_km=max_distance_km)
+
+        # set color range
+        vmin = None
+        vmax = None
+        if (color_range is not None):
+            vmin, vmax = color_range
+
+        # set interpolation data
+        self.interpolation_data = {
+            "x": grid_x,
+            "y": grid_y,
+            "grid": np.ma.masked_invalid(grid),
+            "cmap": cmap,
+            "vmin": vmin,
+            "vmax": vmax,
+            "alpha": alpha,
+            "colorbar": colorbar,
+            "colorbar_title": colorbar_title,
+        }
+
+    def __create_figure(self, map_extent, figsize, ocean_color, land_color, land_edgecolor, borders_color, borders_disable, basemap_disk_cache):
+        """
+        Create the figure and map axes, with the ocean, land, and borders added.
+        """
+        # Initialize figure
+        fig = plt.figure(figsize=figsize)
+        ax = fig.add_axes((0, 0, 1, 1), projection=self.cartopy_projection)
+        ax.set_extent(map_extent, crs=cartopy.crs.Geodetic())  # type: ignore
+
+        # get the basemap geometries, already projected into the map projection
+        cache_dir = self.__get_cache_dir("basemap_cache") if basemap_disk_cache is True else None
+        geometries = get_basemap_geometries(ax, self.cartopy_projection, map_extent, cache_dir=cache_dir)
+
+        # Add ocean
+        #
+        # NOTE: we use the default ocean color
+        ocean_kwargs = dict(cartopy.feature.OCEAN.kwargs, zorder=0)
+        if (ocean_color is not None):
+            ocean_kwargs["facecolor"] = ocean_color
+        ax.add_geometries(geometries["ocean"], self.cartopy_projection, **ocean_kwargs)  # type: ignore
+
+        # add land
+        land_kwargs = dict(cartopy.feature.LAND.kwargs, zorder=0)
+        land_kwargs.update({"facecolor": land_color, "edgecolor": land_edgecolor})
+        ax.add_geometries(geometries["land"], self.cartopy_projection, **land_kwargs)  # type: ignore
+
+        # add borders
+        if (borders_disable is False):
+            borders_kwargs = dict(cartopy.feature.BORDERS.kwargs, zorder=0)
+            borders_kwargs["edgecolor"] = borders_color
+            ax.add_geometries(geometries["borders"], self.cartopy_projection, **borders_kwargs)  # type: ignore
+
+        # return
+        return fig, ax
+
+    def __append_contours(self, xy_list, color, linewidth, linestyle, marker, zorder):
+        """
+        Add contours to the contour data, all sharing the same style.
+        """
+        if (len(xy_list) == 0):
+            return
+
+        # concatenate the new contours
+        #
+        # NOTE: points that are not visible in the projection are stored as NaN, which
+        # matplotlib renders as gaps in the line
+        coords = np.concatenate([np.column_stack((np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))) for x, y in xy_list])
+        coords[~np.isfinite(coords)] = np.nan
+        lengths = np.array([len(x) for x, _ in xy_list], dtype=np.int64)
+
+        # Initialize contour data dict if it doesn't exist yet
+        if self.contour_data is None:
+            self.contour_data = {
+                "coords": np.empty((0, 2), dtype=np.float64),
+                "offsets": np.zeros(1, dtype=np.int64),
+                "color": [],
+                "linewidth": np.empty(0, dtype=np.float64),
+                "linestyle": [],
+                "marker": [],
+                "zorder": np.empty(0, dtype=np.int64),
+            }
+
+        # add the contours and their style
+        n_contours = len(xy_list)
+        self.contour_data["offsets"] = np.concatenate((self.contour_data["offsets"], self.contour_data["offsets"][-1] + np.cumsum(lengths)))
+        self.contour_data["coords"] = np.concatenate((self.contour_data["coords"], coords))
+        self.contour_data["color"].extend([color] * n_contours)
+        self.contour_data["linewidth"] = np.concatenate((self.contour_data["linewidth"], np.full(n_contours, linewidth, dtype=np.float64)))
+        self.contour_data["linestyle"].extend([linestyle] * n_contours)
+        self.contour_data["marker"].extend([marker] * n_contours)
+        self.contour_data["zorder"] = np.concatenate((self.contour_data["zorder"], np.full(n_contours, zorder, dtype=np.int64)))
+
+    def __plot_contours(self, ax):
+        """
+        Plot all of the contour data included in the object, with a single LineCollection
+        for each distinct contour style.
+        """
+        if self.contour_data is None:
+            return
+
+        # group the contours by style
+        groups = {}
+        for i in range(0, len(self.contour_data["color"])):
+            style = (
+                self.contour_data["color"][i],
+                float(self.contour_data["linewidth"][i]),
+                self.contour_data["linestyle"][i],
+                self.contour_data["marker"][i],
+                int(self.contour_data["zorder"][i]),
+            )
+            groups.setdefault(style, []).append(i)
+
+        # plot each group
+        coords = self.contour_data["coords"]
+        offsets = self.contour_data["offsets"]
+        for (color, linewidth, linestyle, marker, zorder), idx_list in groups.items():
+            segments = [coords[offsets[i]:offsets[i + 1]] for i in idx_list]
+            ax.add_collection(
+                matplotlib.collections.LineCollection(segments, colors=color, linewidths=linewidth, linestyles=linestyle, zorder=zorder),
+                autolim=False,
+            )
+            if (marker != ""):
+                points = np.concatenate(segments)
+                ax.plot(points[:, 0], points[:, 1], color=color, linestyle="none", marker=marker, zorder=zorder)
+
     def plot(self,
              map_extent: Sequence[Union[float, int]],
              label: bool = True,
@@ -196,6 +525,7 @@ class SiteMap:
              land_edgecolor: str = "#8A8A8A",
              borders_color: str = "#AEAEAE",
              borders_disable: bool = False,
+             basemap_disk_cache: bool = False,
              returnfig: bool = False,
              savefig: bool = False,
              savefig_filename: Optional[str] = None,
@@ -247,6 +577,12 @@ class SiteMap:
             borders_disable (bool): 
                 Disbale rendering of the borders. Default is `False`.
 
+            basemap_disk_cache (bool): 
+                The ocean, land, and borders are projected into the map projection once, and re-used for
+                any subsequent maps of the same projection and extent. Enable this to also save them in 
+                the `basemap_cache` directory within the `download_output_root_path`, so that they are 
+                re-used across sessions. Default is `False`.
+
             returnfig (bool): 
                 Instead of displaying the image, return the matplotlib figure object. This allows for further plot 
                 manipulation, for example, adding labels or a title in a different location than the default. 
@@ -286,27 +622,8 @@ class SiteMap:
                          stacklevel=1)
 
         # Initialize figure
-        fig = plt.figure(figsize=figsize)
-        ax = fig.add_axes((0, 0, 1, 1), projection=self.cartopy_projection)
-        ax.set_extent(map_extent, crs=cartopy.crs.Geodetic())  # type: ignore
-
-        # Add ocean
-        #
-        # NOTE: we use the default ocean color
-        if (ocean_color is not None):
-            ax.add_feature(  # type: ignore
-                cartopy.feature.OCEAN, facecolor=ocean_color, zorder=0)
-        else:
-            ax.add_feature(cartopy.feature.OCEAN, zorder=0)  # type: ignore
-
-        # add land
-        ax.add_feature(  # type: ignore
-            cartopy.feature.LAND, facecolor=land_color, edgecolor=land_edgecolor, zorder=0)
-
-        # add borders
-        if (borders_disable is False):
-            ax.add_feature(  # type: ignore
-                cartopy.feature.BORDERS, edgecolor=borders_color, zorder=0)
+        fig, ax = self.__create_figure(map_extent, figsize, ocean_color, land_color, land_edgecolor, borders_color, borders_disable,
+                                       basemap_disk_cache)
 
         # iterate through each instrument array included
         for i, _ in enumerate(self.instrument_array):
@@ -324,62 +641,73 @@ class SiteMap:
 
             site_locations = self.site_locations[i]
 
+            # determine which sites to plot
+            if (enforce_data_availability is True and self.data_availability is None):
+                raise ValueError("Before plotting FOV object with enforce_data_availability=True, " +
+                                 "FOVData.add_availability(...) must be called for all included FOVData objects.")
+            plot_sites = []
             for site in self.site_uid_list[i]:
-
-                if (self.data_availability is not None):
-
-                    if (enforce_data_availability is True) and (self.data_availability[i] is not None) and (site in self.data_availability[i].keys()):
-                        if (self.data_availability[i][site] is False):
-                            continue
-
-                if (enforce_data_availability is True and self.data_availability is None):
-                    raise ValueError("Before plotting FOV object with enforce_data_availability=True, " +
-                                     "FOVData.add_availability(...) must be called for all included FOVData objects.")
-
-                latlon = site_locations[site]
-
-                ax.plot(np.squeeze(latlon[1]),
-                        np.squeeze(latlon[0]),
-                        color=color,
-                        zorder=1,
-                        marker=symbol,
-                        markersize=sym_size,
-                        transform=cartopy.crs.Geodetic())
-
-                # Add site_uid labels to the FoV plot, in the center of each ASI FoV
-                if label:
-                    center_lat = latlon[0] + 1.0
-                    center_lon = latlon[1]
-
-                    if (upper_label is True):
-                        ax.text(center_lon,
-                                center_lat,
-                                site.upper(),
-                                ha="center",
-                                va="center",
-                                color=color,
-                                transform=cartopy.crs.Geodetic(),
-                                clip_on=True)
-                    else:
-                        ax.text(center_lon,
-                                center_lat,
-                                site.lower(),
-                                ha="center",
-                                va="center",
-                                color=color,
-                                transform=cartopy.crs.Geodetic(),
-                                clip_on=True)
+                if (enforce_data_availability is True) and (self.data_availability[i]
+                                                            is not None) and (site in self.data_availability[i].keys()):  # type: ignore
+                    if (self.data_availability[i][site] is False):  # type: ignore
+                        continue
+                plot_sites.append(site)
+            if (len(plot_sites) == 0):
+                continue
+
+            # project all of the sites, and their label positions, at once
+            #
+            # NOTE: labels are placed 1 degree north of each site
+            lats = np.array([float(np.squeeze(site_locations[site][0])) for site in plot_sites])
+            lons = np.array([float(np.squeeze(site_locations[site][1])) for site in plot_sites])
+            xyz = self.cartopy_projection.transform_points(cartopy.crs.Geodetic(), np.concatenate((lons, lons)), np.concatenate((lats, lats + 1.0)))
+            site_xy = xyz[0:len(plot_sites), 0:2]
+            label_xy = xyz[len(plot_sites):, 0:2]
+            visible_idx = np.all(np.isfinite(site_xy), axis=1)
+
+            # plot the sites as a single collection
+            ax.scatter(site_xy[visible_idx, 0],
+                       site_xy[visible_idx, 1],
+                       color=color,
+                       zorder=1,
+                       marker=symbol,
+                       s=sym_size**2,
+                       transform=self.cartopy_projection)
+
+            # Add site_uid labels to the FoV plot, in the center of each ASI FoV
+            if label:
+                for j, site in enumerate(plot_sites):
+                    # NOTE: sites on the far side of the globe can't be projected, and aren't labelled
+                    if (not visible_idx[j] or not np.all(np.isfinite(label_xy[j]))):
+                        continue
+                    ax.text(label_xy[j, 0],
+                            label_xy[j, 1],
+                            site.upper() if upper_label is True else site.lower(),
+                            ha="center",
+                            va="center",
+                            color=color,
+                            transform=self.cartopy_projection,
+                            clip_on=True)
+
+        # Plot the interpolated values, above the land but beneath the sites
+        if self.interpolation_data is not None:
+            mesh = ax.pcolormesh(self.interpolation_data["x"],
+                                 self.interpolation_data["y"],
+                                 self.interpolation_data["grid"],
+                                 cmap=self.interpolation_data["cmap"],
+                                 vmin=self.interpolation_data["vmin"],
+                                 vmax=self.interpolation_data["vmax"],
+                                 alpha=self.interpolation_data["alpha"],
+                                 shading="nearest",
+                                 zorder=0.5,
+                                 transform=self.cartopy_projection)
+            if (self.interpolation_data["colorbar"] is True):
+                cbar = fig.colorbar(mesh, ax=ax, shrink=0.7)
+                if (self.interpolation_data["colorbar_title"] is not None):
+                    cbar.set_label(self.interpolation_data["colorbar_title"])
 
         # Go through and plot all of the contour data included in the Object
-        if self.contour_data is not None:
-            for i in range(len(self.contour_data["x"])):
-                ax.plot(self.contour_data["x"][i],
-                        self.contour_data["y"][i],
-                        color=self.contour_data["color"][i],
-                        linewidth=self.contour_data["linewidth"][i],
-                        linestyle=self.contour_data["linestyle"][i],
-                        marker=self.contour_data["marker"][i],
-                        zorder=self.contour_data["zorder"][i])
+        self.__plot_contours(ax)
 
         # set title
         if (title is not None):
@@ -422,6 +750,313 @@ class SiteMap:
         # return
         return None
 
+    def animate(self,
+                map_extent: Sequence[Union[float, int]],
+                values: Union[Dict[str, ndarray], ndarray],
+                output_filename: str,
+                timestamps: Optional[Sequence[datetime.datetime]] = None,
+                fps: int = 10,
+                dpi: int = 100,
+                cmap: str = "viridis",
+                color_range: Optional[Union[Tuple[float, float], Tuple[int, int]]] = None,
+                sym_size: Optional[int] = None,
+                interpolate: bool = False,
+                grid_size: Tuple[int, int] = (100, 100),
+                method: str = "idw",
+                power: float = 2.0,
+                max_distance_km: Optional[float] = None,
+                alpha: float = 0.7,
+                label: bool = True,
+                upper_label: bool = False,
+                figsize: Optional[Tuple[int, int]] = None,
+                title: Optional[str] = None,
+                timestamp_format: str = "%Y-%m-%d %H:%M:%S UTC",
+                colorbar: bool = True,
+                colorbar_title: Optional[str] = "Absorption (dB)",
+                ocean_color: Optional[str] = None,
+                land_color: str = "gray",
+                land_edgecolor: str = "#8A8A8A",
+                borders_color: str = "#AEAEAE",
+                borders_disable: bool = False,
+                basemap_disk_cache: bool = False) -> None:
+        """
+        Generate an animation of per-site values (ie. absorption) on the SiteMap, and save it to disk.
+
+        The map background (ocean, land, borders, labels, and contours) is rendered only once. For each
+        frame, only the site markers (coloured by value), the interpolated field, and the timestamp are
+        redrawn on top of it. For video formats, each frame is piped straight to ffmpeg. GIF frames are 
+        kept in memory (as palette-based images) until the animation is complete, since the file is 
+        written all at once. 
+
+        Args:
+            map_extent (List[int]): 
+                Latitude/longitude range to be visible on the rendered map. This is a list of 4 integers 
+                and/or floats, in the order of [min_lon, max_lon, min_lat, max_lat].
+
+            values (Dict[str, ndarray] or ndarray): 
+                The values for each frame. Either a dictionary of site UID to an array of values (one per 
+                frame), or an array of shape (n_frames, n_sites) with the sites ordered the same as all sites 
+                in `site_uid_list` (flattened across instrument arrays). NaN values are drawn using the
+                colormap's "bad" colour, and excluded from the interpolation.
+
+            output_filename (str): 
+                Filename to save the animation to. Files ending in `.gif` are written directly, any other 
+                video format (ie. `.mp4`) requires ffmpeg to be installed.
+
+            timestamps (List[datetime.datetime]): 
+                The timestamp of each frame, displayed in the corner of the map. Default is no timestamp.
+
+            fps (int): 
+                Frames per second of the animation. Default is `10`.
+
+            dpi (int): 
+                Resolution of the animation frames, in dots per inch. Default is `100`.
+
+            cmap (str): 
+                The matplotlib colormap to use. Default is `viridis`.
+
+            color_range (list[int | float]): 
+                The [min, max] values to use for the colormap. Default is the range of all supplied values.
+
+            sym_size (int): 
+                Marker size of the sites. Default is the marker size of each instrument array.
+
+            interpolate (bool): 
+                Interpolate the values between sites, and draw them beneath the site markers. See 
+                `interpolate()` for further details. Default is `False`.
+
+            grid_size (Tuple[int, int]): 
+                Number of grid points in the x and y directions, used if interpolating. Default is `(100, 100)`.
+
+            method (str): 
+                The interpolation method, either `idw` or `rbf`. Default is `idw`.
+
+            power (float): 
+                The power parameter used for inverse distance weighting. Default is `2.0`.
+
+            max_distance_km (float): 
+                Interpolated grid points further than this great-circle distance from the nearest site are not 
+                drawn. Default is to not limit the distance.
+
+            alpha (float): 
+                The transparency of the interpolated field. Default is `0.7`.
+
+            label (bool): 
+                Specifies that individual sites will be labelled with their site_uid.
+            
+            upper_label (bool): 
+                Plots site labels in uppercase
+
+            figsize (tuple): 
+                The matplotlib figure size to use when plotting. For example `figsize=(14,4)`.
+
+            title (str): 
+                The title to display above the map. Default is no title.
+
+            timestamp_format (str): 
+                The format of the timestamp displayed on each frame. Default is `%Y-%m-%d %H:%M:%S UTC`.
+
+            colorbar (bool): 
+                Add a colorbar. Default is `True`.
+
+            colorbar_title (str): 
+                The colorbar title. Default is `Absorption (dB)`.
+
+            ocean_color (str): 
+                Colour of the ocean. Default is cartopy's default shade of blue.
+            
+            land_color (str): 
+                Colour of the land. Default is `gray`.
+
+            land_edgecolor (str): 
+                Color of the land edges. Default is `#8A8A8A`.
+
+            borders_color (str): 
+                Color of the country borders. Default is `AEAEAE`.
+            
+            borders_disable (bool): 
+                Disbale rendering of the borders. Default is `False`.
+
+            basemap_disk_cache (bool): 
+                Save the projected ocean, land, and borders to disk, so that they are re-used across 
+                sessions. See `plot()` for further details. Default is `False`.
+
+        Returns:
+            None. The animation is saved to disk.
+
+        Raises:
+            ValueError: issues encountered with supplied parameters.
+        """
+        # get the values and site coordinates
+        if (isinstance(values, dict)):
+            site_uids, lats, lons = self.__get_site_coordinates(list(values.keys()))
+            values_arr = np.stack([np.asarray(values[x], dtype=np.float64) for x in site_uids], axis=-1)
+        else:
+            site_uids, lats, lons = self.__get_site_coordinates()
+            values_arr = np.asarray(values, dtype=np.float64)
+        if (values_arr.ndim != 2 or values_arr.shape[1] != len(site_uids)):
+            raise ValueError("Values must have the shape (n_frames, n_sites), with %d sites" % (len(site_uids)))
+        n_frames = values_arr.shape[0]
+        if (n_frames == 0):
+            raise ValueError("At least one frame of values is required")
+        if (timestamps is not None and len(timestamps) != n_frames):
+            raise ValueError("Number of timestamps (%d) does not match the number of frames (%d)" % (len(timestamps), n_frames))
+
+        # set color range
+        if (color_range is not None):
+            vmin, vmax = color_range
+        else:
+            vmin = float(np.nanmin(values_arr)) if np.any(np.isfinite(values_arr)) else 0.0
+            vmax = float(np.nanmax(values_arr)) if np.any(np.isfinite(values_arr)) else 1.0
+        norm = matplotlib.colors.Normalize(vmin=vmin, vmax=vmax)
+
+        # get the interpolated field for all frames at once
+        #
+        # NOTE: NaN values are not supported by the interpolation, so sites with missing values
+        # in a frame are excluded from that frame using the cached weights of the remaining sites
+        grid = None
+        grid_x = None
+        grid_y = None
+        if (interpolate is True):
+            grid = np.full((n_frames, grid_size[1], grid_size[0]), np.nan, dtype=np.float64)
+            finite_mask = np.isfinite(values_arr)
+            for mask in np.unique(finite_mask, axis=0):
+                if (np.count_nonzero(mask) == 0 or (method == "rbf" and np.count_nonzero(mask) < 2)):
+                    continue
+                frame_idx = np.all(finite_mask == mask, axis=1)
+                frame_values = {site_uids[i]: values_arr[frame_idx, i] for i in np.nonzero(mask)[0]}
+                grid_x, grid_y, grid[frame_idx] = self.interpolate(frame_values,
+                                                                   map_extent,
+                                                                   grid_size=grid_size,
+                                                                   method=method,
+                                                                   power=power,
+                                                                   max_distance_km=max_distance_km)
+
+        # render the map background
+        fig, ax = self.__create_figure(map_extent, figsize, ocean_color, land_color, land_edgecolor, borders_color, borders_disable,
+                                       basemap_disk_cache)
+        fig.set_dpi(dpi)
+        self.__plot_contours(ax)
+        if (title is not None):
+            ax.set_title(title)
+        if (colorbar is True):
+            cbar = fig.colorbar(matplotlib.cm.ScalarMappable(norm=norm, cmap=cmap), ax=ax, shrink=0.7)
+            if (colorbar_title is not None):
+                cbar.set_label(colorbar_title)
+
+        # create the animated artists, which are excluded from the background
+        animated_artists = []
+        mesh = None
+        if (grid is not None):
+            mesh = ax.pcolormesh(grid_x,
+                                 grid_y,
+                                 np.ma.masked_invalid(grid[0]),
+                                 cmap=cmap,
+                                 norm=norm,
+                                 alpha=alpha,
+                                 shading="nearest",
+                                 zorder=0.5,
+                                 transform=self.cartopy_projection,
+                                 animated=True)
+            animated_artists.append(mesh)
+        site_instrument_idx = self.__get_site_instrument_index(site_uids)
+        scatters = []
+        for i in sorted(set(site_instrument_idx)):
+            idx = np.nonzero(np.array(site_instrument_idx) == i)[0]
+            size = self.sym_size[i] if sym_size is None else sym_size
+            size = size[0] if isinstance(size, list) else size
+            symbol = self.symbol[i][0] if isinstance(self.symbol[i], list) else self.symbol[i]
+            scatter = ax.scatter(lons[idx],
+                                 lats[idx],
+                                 c=values_arr[0, idx],
+                                 cmap=cmap,
+                                 norm=norm,
+                                 s=size**2,
+                                 marker=symbol,
+                                 edgecolors="black",
+                                 plotnonfinite=True,
+                                 zorder=1,
+                                 transform=cartopy.crs.PlateCarree(),
+                                 animated=True)
+            scatters.append((idx, scatter))
+            animated_artists.append(scatter)
+
+        # add the site labels, which are drawn above the interpolated field
+        if (label is True):
+            for site, lat, lon in zip(site_uids, lats, lons, strict=True):
+                animated_artists.append(
+                    ax.text(lon,
+                            lat + 1.0,
+                            site.upper() if upper_label is True else site.lower(),
+                            ha="center",
+                            va="center",
+                            transform=cartopy.crs.Geodetic(),
+                            clip_on=True,
+                            animated=True))
+
+        # add the timestamp
+        timestamp_text = None
+        if (timestamps is not None):
+            timestamp_text = ax.text(0.01,
+                                     0.01,
+                                     "",
+                                     ha="left",
+                                     va="bottom",
+                                     transform=ax.transAxes,
+                                     bbox={
+                                         "facecolor": "white",
+                                         "alpha": 0.7
+                                     },
+                                     animated=True)
+            animated_artists.append(timestamp_text)
+
+        # draw the background once, and save it
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        background = canvas.copy_from_bbox(fig.bbox)
+        width, height = canvas.get_width_height()
+
+        # render each frame on top of the background
+        #
+        # NOTE: if rendering a frame fails, the writer is told the animation was aborted, so that it
+        # doesn't raise its own errors over that one
+        writer = open_frame_writer(output_filename, fps, width, height)
+        aborted = True
+        try:
+            for frame_idx in range(0, n_frames):
+                canvas.restore_region(background)
+                if (mesh is not None):
+                    mesh.set_array(np.ma.masked_invalid(grid[frame_idx]))  # type: ignore
+                for idx, scatter in scatters:
+                    scatter.set_array(values_arr[frame_idx, idx])
+                if (timestamp_text is not None):
+                    timestamp_text.set_text(timestamps[frame_idx].strftime(timestamp_format))  # type: ignore
+                for artist in animated_artists:
+                    ax.draw_artist(artist)
+                writer.write(np.asarray(canvas.buffer_rgba()))
+            aborted = False
+        finally:
+            plt.close(fig)
+            writer.close(aborted=aborted)
+
+    def __get_contour_bbox(self, map_extent):
+        """
+        Get the projected area to generate contours within, for a map extent, with a small margin.
+        """
+        if (map_extent is None):
+            return None
+        x0, x1, y0, y1 = get_projected_extent(self.cartopy_projection, map_extent)
+        margin = 0.05 * max(x1 - x0, y1 - y0)
+        return (x0 - margin, x1 + margin, y0 - margin, y1 + margin)
+
+    def __get_cache_dir(self, name):
+        """
+        Get the path of an on-disk cache directory, within the download output root path.
+        """
+        if (self.__ucrio_obj is None):
+            raise ValueError("On-disk caching requires the SiteMap to be associated with a PyUCRio object")
+        return os.path.join(self.__ucrio_obj.download_output_root_path, name)
+
     def add_geo_contours(self,
                          lats: Optional[Union[ndarray, list]] = None,
                          lons: Optional[Union[ndarray, list]] = None,
@@ -431,7 +1066,8 @@ class SiteMap:
                          linewidth: Union[float, int] = 1,
                          linestyle: str = "solid",
                          marker: str = "",
-                         bring_to_front: bool = False):
+                         bring_to_front: bool = False,
+                         map_extent: Optional[Sequence[Union[float, int]]] = None):
         """
         Add geographic contours to a FoV map.
 
@@ -463,6 +1099,12 @@ class SiteMap:
             bring_to_front (bool): 
                 Plots the contour on top of all other currently plotted objects.
 
+            map_extent (List[int]): 
+                Latitude/longitude range of the map that the contours will be plotted on. This is a list of 4 
+                integers and/or floats, in the order of [min_lon, max_lon, min_lat, max_lat]. Lines of constant 
+                latitude or longitude are only generated within (and slightly beyond) this area. Default is the
+                full globe.
+
         Returns:
             The object's contour_data parameter is populated appropriately.
 
@@ -501,14 +1143,12 @@ class SiteMap:
             if isinstance(constant_lons, (float, int)):
                 constant_lons = [constant_lons]
 
-        # Initialize contour data dict if it doesn't exist yet
-        if self.contour_data is None:
-            self.contour_data = {"x": [], "y": [], "color": [], "linewidth": [], "linestyle": [], "marker": [], "zorder": []}
+        # Initialize list of contours to add
+        xy_list = []
 
-        # Obtain the Fov map's projection
-        source_proj = pyproj.CRS.from_user_input(cartopy.crs.Geodetic())
-        mosaic_proj = pyproj.CRS.from_user_input(self.cartopy_projection)
-        transformer = pyproj.Transformer.from_crs(source_proj, mosaic_proj, always_xy=True)
+        # Obtain the transformer into the Fov map's projection
+        transformer = get_geodetic_transformer(self.cartopy_projection)
+        projected_bbox = self.__get_contour_bbox(map_extent)
 
         # First handling manually supplied lat/lon arrays
         if (lats is not None) and (lons is not None):
@@ -523,60 +1163,38 @@ class SiteMap:
 
             # Create specified contour from geographic coords
             x, y = transformer.transform(lons, lats)
-            # Add contour to dict, along with color and linewidth
-            self.contour_data["x"].append(x)
-            self.contour_data["y"].append(y)
-            self.contour_data["color"].append(color)
-            self.contour_data["linewidth"].append(linewidth)
-            self.contour_data["linestyle"].append(linestyle)
-            self.contour_data["marker"].append(marker)
-            self.contour_data["zorder"].append(int(bring_to_front))
-
-        # Next handling lines of constant latitude
+
+            # Add contour to the list
+            xy_list.append((x, y))
+
+        # Next handling lines of constant latitude, sampled adaptively along the longitudinal
+        # domain (full globe)
         if constant_lats is not None:
-            # Generate longitudinal domain of the lat line (full globe)
-            lon_domain = np.arange(-180, 180 + 0.2, 0.2)
-
-            # Iterate through all lines of constant lat requested
-            for lat in constant_lats:
-                # Create line of constant lat
-                const_lat_x, const_lat_y = (lon_domain, lon_domain * 0 + lat)
-                sort_idx = np.argsort(const_lat_x)
-                const_lat_y = const_lat_y[sort_idx]
-                const_lat_x = const_lat_x[sort_idx]
-                const_lat_x, const_lat_y = transformer.transform(const_lat_x, const_lat_y)
-
-                # Add contour to dict, along with color and linewidth
-                self.contour_data["x"].append(const_lat_x)
-                self.contour_data["y"].append(const_lat_y)
-                self.contour_data["color"].append(color)
-                self.contour_data["linewidth"].append(linewidth)
-                self.contour_data["linestyle"].append(linestyle)
-                self.contour_data["marker"].append(marker)
-                self.contour_data["zorder"].append(int(bring_to_front))
-
-        # Now handling lines of constant longitude
+            xy_list.extend(
+                sample_contours(
+                    lambda lats, lons: transformer.transform(lons, lats),
+                    constant_lats,
+                    -180.0,
+                    180.0,
+                    0.2,
+                    projected_bbox=projected_bbox,
+                ))
+
+        # Now handling lines of constant longitude, sampled adaptively along the latitudinal
+        # domain (full globe)
         if constant_lons is not None:
-            # Generate latitudinal domain of the lon line (full globe)
-            lat_domain = np.arange(-90, 90 + 0.1, 0.1)
-
-            # Iterate through all lines of constant lon requested
-            for lon in constant_lons:
-                # Create line of constant lon and add to dict
-                const_lon_x, const_lon_y = (lat_domain * 0 + lon, lat_domain)
-                sort_idx = np.argsort(const_lon_y)
-                const_lon_x = const_lon_x[sort_idx]
-                const_lon_y = const_lon_y[sort_idx]
-                const_lon_x, const_lon_y = transformer.transform(const_lon_x, const_lon_y)
-
-                # Add contour to dict, along with color and linewidth
-                self.contour_data["x"].append(const_lon_x)
-                self.contour_data["y"].append(const_lon_y)
-                self.contour_data["color"].append(color)
-                self.contour_data["linewidth"].append(linewidth)
-                self.contour_data["linestyle"].append(linestyle)
-                self.contour_data["marker"].append(marker)
-                self.contour_data["zorder"].append(int(bring_to_front))
+            xy_list.extend(
+                sample_contours(
+                    lambda lons, lats: transformer.transform(lons, lats),
+                    constant_lons,
+                    -90.0,
+                    90.0,
+                    0.1,
+                    projected_bbox=projected_bbox,
+                ))
+
+        # Add the contours to the contour data
+        self.__append_contours(xy_list, color, linewidth, linestyle, marker, int(bring_to_front))
 
     def add_mag_contours(self,
                          timestamp: datetime.datetime,
@@ -588,7 +1206,9 @@ class SiteMap:
                          linewidth: Union[float, int] = 1,
                          linestyle: str = "solid",
                          marker: str = "",
-                         bring_to_front: bool = False):
+                         bring_to_front: bool = False,
+                         map_extent: Optional[Sequence[Union[float, int]]] = None,
+                         aacgm_disk_cache: bool = False):
         """
         Add geomagnetic contours to a FoV map.
 
@@ -623,6 +1243,18 @@ class SiteMap:
             bring_to_front (bool): 
                 Plots the contour on top of all other currently plotted objects.
 
+            map_extent (List[int]): 
+                Latitude/longitude range of the map that the contours will be plotted on. This is a list of 4 
+                integers and/or floats, in the order of [min_lon, max_lon, min_lat, max_lat]. Lines of constant 
+                latitude or longitude are only generated within (and slightly beyond) this area. Default is the
+                full globe.
+
+            aacgm_disk_cache (bool): 
+                Lines of constant magnetic latitude/longitude are converted to geographic coordinates once per 
+                day, and re-used for any subsequent contours. Enable this to also save them in the `aacgm_cache` 
+                directory within the `download_output_root_path`, so that they are re-used across sessions. 
+                Default is `False`.
+
         Returns:
             The object's contour_data parameter is populated appropriately.
 
@@ -657,14 +1289,12 @@ class SiteMap:
             if isinstance(constant_lons, (float, int)):
                 constant_lons = [constant_lons]
 
-        # Initialize contour data dict if it doesn't exist yet
-        if self.contour_data is None:
-            self.contour_data = {"x": [], "y": [], "color": [], "linewidth": [], "linestyle": [], "marker": [], "zorder": []}
+        # Initialize list of contours to add
+        xy_list = []
 
-        # Obtain the FoV map's projection
-        source_proj = pyproj.CRS.from_user_input(cartopy.crs.Geodetic())
-        mosaic_proj = pyproj.CRS.from_user_input(self.cartopy_projection)
-        transformer = pyproj.Transformer.from_crs(source_proj, mosaic_proj, always_xy=True)
+        # Obtain the transformer into the FoV map's projection
+        transformer = get_geodetic_transformer(self.cartopy_projection)
+        projected_bbox = self.__get_contour_bbox(map_extent)
 
         # First handling manually supplied lat/lon arrays
         if (lats is not None) and (lons is not None):
@@ -681,59 +1311,31 @@ class SiteMap:
             y, x, alt = aacgmv2.convert_latlon_arr(lats, lons, lats * 0.0, timestamp, method_code="A2G")
             x, y = transformer.transform(x, y)
 
-            # Add contour to dict, along with color and linewidth
-            self.contour_data["x"].append(x)
-            self.contour_data["y"].append(y)
-            self.contour_data["color"].append(color)
-            self.contour_data["linewidth"].append(linewidth)
-            self.contour_data["linestyle"].append(linestyle)
-            self.contour_data["marker"].append(marker)
-            self.contour_data["zorder"].append(int(bring_to_front))
+            # Add contour to the list
+            xy_list.append((x, y))
 
-        # Next handling lines of constant latitude
+        # Next handling lines of constant latitude, sampled adaptively along the longitudinal
+        # domain (full globe)
+        #
+        # NOTE: the conversions from magnetic coordinates are memoized
+        cache_dir = self.__get_cache_dir("aacgm_cache") if aacgm_disk_cache is True else None
         if constant_lats is not None:
-            # Generate longitudinal domain of the lat line (full globe)
-            lon_domain = np.arange(-180, 180 + 0.2, 0.2)
-
-            # iterate through all lines of constant lat requested
-            for lat in constant_lats:
-                # Create line of constant lat from magnetic coords
-                const_lat_x, const_lat_y = (lon_domain, lon_domain * 0 + lat)
-                const_lat_y, const_lat_x, alt = aacgmv2.convert_latlon_arr(const_lat_y, const_lat_x, const_lat_x * 0.0, timestamp, method_code="A2G")
-                sort_idx = np.argsort(const_lat_x)
-                const_lat_y = const_lat_y[sort_idx]
-                const_lat_x = const_lat_x[sort_idx]
-                const_lat_x, const_lat_y = transformer.transform(const_lat_x, const_lat_y)
-
-                # Add contour to dict, along with color and linewidth
-                self.contour_data["x"].append(const_lat_x)
-                self.contour_data["y"].append(const_lat_y)
-                self.contour_data["color"].append(color)
-                self.contour_data["linewidth"].append(linewidth)
-                self.contour_data["linestyle"].append(linestyle)
-                self.contour_data["marker"].append(marker)
-                self.contour_data["zorder"].append(int(bring_to_front))
-
-        # Now handling lines of constant longitude
+
+            def convert_lat_lines(mag_lats, mag_lons):
+                geo_lats, geo_lons = convert_mag_lines("lat", mag_lats, mag_lons, timestamp, -180.0, 180.0, 0.2, cache_dir=cache_dir)
+                return transformer.transform(geo_lons, geo_lats)
+
+            xy_list.extend(sample_contours(convert_lat_lines, constant_lats, -180.0, 180.0, 0.2, projected_bbox=projected_bbox))
+
+        # Now handling lines of constant longitude, sampled adaptively along the latitudinal
+        # domain (full globe)
         if constant_lons is not None:
-            # Generate latitudinal domain of the lon line (full globe)
-            lat_domain = np.arange(-90, 90 + 0.1, 0.1)
-
-            # iterate through all lines of constant lon requested
-            for lon in constant_lons:
-                # Create line of constant lon from magnetic coords
-                const_lon_x, const_lon_y = (lat_domain * 0 + lon, lat_domain)
-                const_lon_y, const_lon_x, alt = aacgmv2.convert_latlon_arr(const_lon_y, const_lon_x, const_lon_x * 0.0, timestamp, method_code="A2G")
-                sort_idx = np.argsort(const_lon_y)
-                const_lon_x = const_lon_x[sort_idx]
-                const_lon_y = const_lon_y[sort_idx]
-                const_lon_x, const_lon_y = transformer.transform(const_lon_x, const_lon_y)
-
-                # Add contour to dict, along with color and linewidth
-                self.contour_data["x"].append(const_lon_x)
-                self.contour_data["y"].append(const_lon_y)
-                self.contour_data["color"].append(color)
-                self.contour_data["linewidth"].append(linewidth)
-                self.contour_data["linestyle"].append(linestyle)
-                self.contour_data["marker"].append(marker)
-                self.contour_data["zorder"].append(int(bring_to_front))
+
+            def convert_lon_lines(mag_lons, mag_lats):
+                geo_lats, geo_lons = convert_mag_lines("lon", mag_lons, mag_lats, timestamp, -90.0, 90.0, 0.1, cache_dir=cache_dir)
+                return transformer.transform(geo_lons, geo_lats)
+
+            xy_list.extend(sample_contours(convert_lon_lines, constant_lons, -90.0, 90.0, 0.1, projected_bbox=projected_bbox))
+
+        # Add the contours to the contour data
+        self.__append_contours(xy_list, color, linewidth, linestyle, marker, int(bring_to_front))
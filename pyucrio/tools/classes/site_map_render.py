@@ -0,0 +1,125 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Class representations for batch rendering of site maps.
+"""
+
+import datetime
+import cartopy.crs
+from dataclasses import dataclass
+from typing import List, Dict, Sequence, Union, Optional, Any
+
+
+@dataclass
+class SiteMapRenderSpec:
+    """
+    Specification of a single site map to render using `rio.tools.site_map.render_many()`.
+
+    Attributes:
+        output_filename (str): 
+            Filename to save the rendered map to.
+
+        cartopy_projection (cartopy.crs.Projection): 
+            The cartopy projection to use for the map.
+
+        map_extent (List[int]): 
+            Latitude/longitude range to be visible on the rendered map. This is a list of 4 integers
+            and/or floats, in the order of [min_lon, max_lon, min_lat, max_lat].
+
+        instrument_array (str or List[str]): 
+            The instrument array(s) to include in the map.
+
+        site_uid_list (List[str] or List[List[str]]): 
+            The sites to include in the map, for each instrument array. Default is all sites.
+
+        color (str or List[str]): 
+            The matplotlib color of the sites, for each instrument array. Default is `black`.
+
+        symbol (str or List[str]): 
+            The matplotlib marker of the sites, for each instrument array. Default is `o`.
+
+        sym_size (int or List[int]): 
+            The marker size of the sites, for each instrument array. Default is `1`.
+
+        availability_dataset_name (str or List[str]): 
+            The dataset to check data availability with, for each instrument array. If supplied, only
+            sites with data between `availability_start` and `availability_end` are drawn. Default is
+            to not check data availability.
+
+        availability_start (datetime.datetime): 
+            Start of the data availability window.
+
+        availability_end (datetime.datetime): 
+            End of the data availability window.
+
+        plot_kwargs (Dict[str, Any]): 
+            Any additional keyword arguments to pass to `SiteMap.plot()`, such as `title` or `figsize`.
+    """
+    output_filename: str
+    cartopy_projection: cartopy.crs.Projection
+    map_extent: Sequence[Union[float, int]]
+    instrument_array: Union[str, List[str]]
+    site_uid_list: Optional[Union[List[str], List[List[str]]]] = None
+    color: Union[str, List[str]] = "black"
+    symbol: Union[str, List[str]] = "o"
+    sym_size: Union[int, List[int]] = 1
+    availability_dataset_name: Optional[Union[str, List[str]]] = None
+    availability_start: Optional[datetime.datetime] = None
+    availability_end: Optional[datetime.datetime] = None
+    plot_kwargs: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class SiteMapRenderResult:
+    """
+    Result of rendering a single site map using `rio.tools.site_map.render_many()`.
+
+    Attributes:
+        output_filename (str): 
+            Filename the map was saved to.
+
+        success (bool): 
+            Whether the map was rendered successfully.
+
+        duration_seconds (float): 
+            Time taken to render the map (including checking data availability), in seconds.
+
+        error (str): 
+            The error encountered, if the map was not rendered successfully.
+    """
+    output_filename: str
+    success: bool
+    duration_seconds: float
+    error: Optional[str] = None
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return "SiteMapRenderResult(output_filename='%s', success=%s, duration_seconds=%.3f, error=%s)" % (
+            self.output_filename,
+            self.success,
+            self.duration_seconds,
+            self.error.__repr__(),
+        )
+
+    def pretty_print(self):
+        """
+        A special print output for this class.
+        """
+        print("SiteMapRenderResult:")
+        print("  %-18s: %s" % ("output_filename", self.output_filename))
+        print("  %-18s: %s" % ("success", self.success))
+        print("  %-18s: %.3f" % ("duration_seconds", self.duration_seconds))
+        print("  %-18s: %s" % ("error", self.error))
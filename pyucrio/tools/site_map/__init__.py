@@ -16,9 +16,11 @@ Obtain FoVs of ASIs and create plots.
 """
 
 import cartopy.crs
-from typing import Optional, List, Literal, Union
+from typing import Optional, List, Literal, Union, Dict, Any
 from ..classes.site_map import SiteMap
+from ..classes.site_map_render import SiteMapRenderSpec, SiteMapRenderResult
 from ._create_map import create_map as func_create_map
+from ._render_many import render_many as func_render_many
 
 __all__ = ["SiteMapManager"]
 
@@ -72,3 +74,33 @@ class SiteMapManager:
             pyaurorax.exceptions.AuroraXError: general issue encountered
         """
         return func_create_map(self.__ucrio_obj, cartopy_projection, site_uid_list, instrument_array, color, symbol, sym_size)
+
+    def render_many(self, specs: List[Union[SiteMapRenderSpec, Dict[str, Any]]], n_parallel: int = 1) -> List[SiteMapRenderResult]:
+        """
+        Render and save many site maps, optionally in parallel.
+
+        The observatories of each instrument array are retrieved only once for all maps. Maps are 
+        grouped by projection and extent, so that each group renders using the same cached basemap 
+        (see `SiteMap.plot()`), and groups are rendered across a pool of processes. To also share 
+        the basemaps between processes and sessions, include `basemap_disk_cache=True` in each map's
+        `plot_kwargs`.
+
+        Args:
+            specs (List[SiteMapRenderSpec]): 
+                The maps to render. Each can be a `pyucrio.tools.classes.site_map_render.SiteMapRenderSpec`
+                object, or a dictionary of its attributes.
+
+            n_parallel (int): 
+                Number of maps to render in parallel, using separate processes. Default is `1`, which 
+                renders all maps in this process.
+
+        Returns:
+            A list of `pyucrio.tools.classes.site_map_render.SiteMapRenderResult` objects, one for each 
+            map specification (in the same order), giving whether the map was rendered and how long it 
+            took. Errors encountered while rendering a map are included in its result, rather than raised.
+
+        Raises:
+            ValueError: issues encountered with supplied parameters
+            pyucrio.exceptions.PyUCRioAPIError: an API error was encountered
+        """
+        return func_render_many(self.__ucrio_obj, specs, n_parallel)
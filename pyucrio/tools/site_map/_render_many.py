@@ -0,0 +1,200 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from ..classes.site_map import SiteMap
+from ..classes.site_map_render import SiteMapRenderSpec, SiteMapRenderResult
+from ..._util import get_mp_context
+
+
+def __as_list(value, n):
+    """
+    Convert a per-instrument-array parameter to a list with one item per instrument array.
+    """
+    if (isinstance(value, list)):
+        return value
+    return [value] * n
+
+
+def __resolve_sites(ucrio_obj, spec, observatory_cache):
+    """
+    Determine the site UIDs and locations for a map specification.
+
+    NOTE: we request the observatories of each instrument array only once for all maps.
+    """
+    instrument_array = __as_list(spec.instrument_array, 1)
+    site_uid_list = spec.site_uid_list
+    if (site_uid_list is not None and len(site_uid_list) > 0 and isinstance(site_uid_list[0], str)):
+        site_uid_list = [site_uid_list]
+
+    instrument_sites = []
+    instrument_site_locations = []
+    for k, instrument in enumerate(instrument_array):
+        if (instrument not in observatory_cache):
+            observatory_cache[instrument] = {
+                r.uid: (r.geodetic_latitude, r.geodetic_longitude)
+                for r in ucrio_obj.data.ucalgary.list_observatories(instrument)
+            }
+        observatories = observatory_cache[instrument]
+
+        if (site_uid_list is None):
+            site_uids = list(observatories.keys())
+        else:
+            site_uids = site_uid_list[k]  # type: ignore
+        site_dict = {}
+        for site in site_uids:
+            if (site not in observatories):
+                raise ValueError(f'Could not find requested site_uid "{site}" for instrument_array "{instrument}".')
+            site_dict[site] = observatories[site]
+        instrument_sites.append(list(site_dict.keys()))
+        instrument_site_locations.append(site_dict)
+
+    # return
+    return instrument_array, instrument_sites, instrument_site_locations
+
+
+def __get_ucrio_config(ucrio_obj):
+    """
+    Get the settings of a PyUCRio object, to create the same object in worker processes.
+    """
+    return {
+        "download_output_root_path": ucrio_obj.download_output_root_path,
+        "api_base_url": ucrio_obj.api_base_url,
+        "api_timeout": ucrio_obj.api_timeout,
+        "progress_bar_backend": ucrio_obj.progress_bar_backend,
+        "http_pool_size": ucrio_obj.http_pool_size,
+        "retry_policy": ucrio_obj.retry_policy,
+        "download_compression": ucrio_obj.download_compression,
+    }
+
+
+def __render_task(task, ucrio_obj, ucrio_config, in_worker):
+    """
+    Render a group of maps, returning the index and result of each.
+
+    When running in a worker process, `ucrio_obj` is None and a PyUCRio object is created
+    using `ucrio_config`, so that maps can check data availability and use the on-disk caches.
+    """
+    # create the PyUCRio object if needed
+    #
+    # NOTE: this is imported here to avoid a circular import. Creating the object is cheap, since
+    # everything it holds is created on first use.
+    if (ucrio_obj is None):
+        from ...pyucrio import PyUCRio
+        ucrio_obj = PyUCRio(**ucrio_config)
+
+    # render off-screen
+    #
+    # NOTE: when rendering in this process, the previous backend is restored once done
+    previous_backend = plt.get_backend()
+    plt.switch_backend("Agg")
+    try:
+        return __render_maps(task, ucrio_obj)
+    finally:
+        if (in_worker is False):
+            plt.switch_backend(previous_backend)
+
+
+def __render_maps(task, ucrio_obj):
+    """
+    Render a group of maps, using the current backend.
+    """
+    results = []
+    for idx, spec, instrument_array, site_uid_list, site_locations in task:
+        start_time = time.perf_counter()
+        try:
+            # create the map
+            n_instruments = len(instrument_array)
+            site_map = SiteMap(
+                cartopy_projection=spec.cartopy_projection,
+                site_uid_list=site_uid_list,
+                site_locations=site_locations,
+                instrument_array=instrument_array,
+                data_availability=None,
+                color=__as_list(spec.color, n_instruments),
+                symbol=__as_list(spec.symbol, n_instruments),
+                sym_size=__as_list(spec.sym_size, n_instruments),
+                contour_data=None,
+                ucrio_obj=ucrio_obj,
+            )
+
+            # check data availability
+            plot_kwargs = dict(spec.plot_kwargs) if spec.plot_kwargs is not None else {}
+            if (spec.availability_dataset_name is not None):
+                if (spec.availability_start is None or spec.availability_end is None):
+                    raise ValueError("The availability_start and availability_end must be supplied to check data availability")
+                site_map.add_availability(spec.availability_dataset_name, spec.availability_start, spec.availability_end)
+                plot_kwargs.setdefault("enforce_data_availability", True)
+
+            # render
+            site_map.plot(spec.map_extent, savefig=True, savefig_filename=spec.output_filename, **plot_kwargs)
+            results.append((idx, SiteMapRenderResult(spec.output_filename, True, time.perf_counter() - start_time)))
+        except Exception as e:
+            plt.close("all")
+            results.append((idx, SiteMapRenderResult(spec.output_filename, False, time.perf_counter() - start_time, error=str(e))))
+
+    # return
+    return results
+
+
+def render_many(ucrio_obj, specs, n_parallel):
+    # check parameters
+    if (n_parallel < 1):
+        raise ValueError("The n_parallel parameter must be at least 1")
+    specs = [SiteMapRenderSpec(**x) if isinstance(x, dict) else x for x in specs]
+    if (len(specs) == 0):
+        return []
+
+    # resolve the sites of every map
+    observatory_cache = {}
+    resolved = []
+    for idx, spec in enumerate(specs):
+        instrument_array, site_uid_list, site_locations = __resolve_sites(ucrio_obj, spec, observatory_cache)
+        resolved.append((idx, spec, instrument_array, site_uid_list, site_locations))
+
+    # group the maps by projection and extent, so that each group renders using the same
+    # cached basemap
+    groups = {}
+    for item in resolved:
+        spec = item[1]
+        key = (spec.cartopy_projection.to_wkt(), tuple([float(x) for x in spec.map_extent]))
+        groups.setdefault(key, []).append(item)
+    tasks = list(groups.values())
+
+    # split the largest groups if there aren't enough to keep every worker busy
+    while (len(tasks) < n_parallel):
+        tasks.sort(key=len, reverse=True)
+        if (len(tasks[0]) < 2):
+            break
+        largest = tasks.pop(0)
+        tasks.extend([largest[:len(largest) // 2], largest[len(largest) // 2:]])
+
+    # render
+    results = [None] * len(specs)
+    if (n_parallel == 1 or len(tasks) == 1):
+        for task in tasks:
+            for idx, result in __render_task(task, ucrio_obj, None, False):
+                results[idx] = result
+    else:
+        ucrio_config = __get_ucrio_config(ucrio_obj)
+        with ProcessPoolExecutor(max_workers=min(n_parallel, len(tasks)), mp_context=get_mp_context()) as executor:
+            futures = [executor.submit(__render_task, task, None, ucrio_config, True) for task in tasks]
+            for future in futures:
+                for idx, result in future.result():
+                    results[idx] = result
+
+    # return
+    return results
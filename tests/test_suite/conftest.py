@@ -13,14 +13,24 @@
 # limitations under the License.
 
 import gc
+import json
 import glob
+import socket
 import shutil
 import copy
 import pytest
 import datetime
+import threading
+import numpy as np
 import pyucalgarysrs
 import pyucrio
+import cartopy.crs
+from pyucrio.tools.classes.site_map import SiteMap
+from pyucalgarysrs.data import Data, Dataset
+from pyucalgarysrs.data.classes import RiometerData, HSRData
 from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from matplotlib import pyplot as plt
 
 
@@ -136,6 +146,216 @@ def hsr_k0_data_list(api_url):
     return hsr_data_list
 
 
+@pytest.fixture(scope="session")
+def synthetic_rio_k2_data_list():
+    # init
+    #
+    # NOTE: we build a day of 5-second K2 data for a few sites, each containing the same
+    # absorption event arriving with a different delay. This allows for testing analysis
+    # functions without needing to download data.
+    dataset = Dataset(
+        name="NORSTAR_RIOMETER_K2_TXT",
+        short_description="synthetic",
+        long_description="synthetic",
+        data_tree_url="",
+        file_listing_supported=True,
+        file_reading_supported=True,
+        level="L2",
+        supported_libraries=["pyucrio"],
+        file_time_resolution="1day",
+    )
+    start_dt = datetime.datetime(2023, 11, 5, 0, 0)
+    timestamp = np.array([start_dt + datetime.timedelta(seconds=5 * i) for i in range(0, 17280)])
+    seconds = np.arange(0, 17280) * 5.0
+    site_delays = {"rabb": 0, "chur": 300, "gill": 600}
+    rng = np.random.default_rng(seed=0)
+
+    # create the data objects
+    rio_data_list = []
+    for site, delay in site_delays.items():
+        absorption = 2.0 * np.exp(-0.5 * ((seconds - 43200.0 - delay) / 900.0)**2) + rng.normal(0, 0.05, seconds.shape)
+        raw_signal = 2.5 - absorption / 10.0
+        rio_data_list.append(
+            Data(
+                data=[RiometerData(timestamp=timestamp, raw_signal=raw_signal.astype(np.float32), absorption=absorption.astype(np.float32))],
+                timestamp=[start_dt],
+                metadata=[{
+                    "site_unique_id": site
+                }],
+                problematic_files=[],
+                calibrated_data=None,
+                dataset=dataset,
+            ))
+
+    # return
+    return rio_data_list
+
+
+@pytest.fixture(scope="session")
+def synthetic_hsr_k0_data():
+    # init
+    #
+    # NOTE: we build two hours of 1-second HSR data, with a 10-minute data gap in the middle
+    dataset = Dataset(
+        name="SWAN_HSR_K0_H5",
+        short_description="synthetic",
+        long_description="synthetic",
+        data_tree_url="",
+        file_listing_supported=True,
+        file_reading_supported=True,
+        level="L0",
+        supported_libraries=["pyucrio"],
+        file_time_resolution="1hr",
+    )
+    start_dt = datetime.datetime(2023, 11, 5, 4, 0)
+    n_bands = 12
+    band_central_frequency = ["%.1f MHz" % (20.0 + 1.5 * i) for i in range(0, n_bands)]
+    band_passband = ["0.5 MHz"] * n_bands
+    rng = np.random.default_rng(seed=0)
+
+    # create one record per hour
+    records = []
+    for hour in range(0, 2):
+        n_seconds = 3600 if hour == 0 else 3000
+        gap_seconds = 0 if hour == 0 else 600
+        timestamp = np.array([start_dt + datetime.timedelta(hours=hour, seconds=gap_seconds + i) for i in range(0, n_seconds)])
+        raw_power = rng.normal(-60, 1, (n_bands, n_seconds)).astype(np.float32)
+        records.append(HSRData(timestamp=timestamp, raw_power=raw_power, band_central_frequency=band_central_frequency, band_passband=band_passband))
+
+    # return
+    return Data(
+        data=records,
+        timestamp=[r.timestamp[0] for r in records],
+        metadata=[{
+            "site_unique_id": "russ"
+        }, {
+            "site_unique_id": "russ"
+        }],
+        problematic_files=[],
+        calibrated_data=None,
+        dataset=dataset,
+    )
+
+
+@pytest.fixture(scope="function")
+def synthetic_site_map(rio):
+    # init
+    #
+    # NOTE: we build the SiteMap object directly with known site locations, so that
+    # it can be used without needing to query the API
+    projection_obj = cartopy.crs.NearsidePerspective(central_longitude=-100.0, central_latitude=55.0)
+    site_locations = {
+        "gill": (56.38, -94.64),
+        "chur": (58.76, -94.08),
+        "rabb": (58.22, -103.68),
+        "pina": (50.20, -96.04),
+    }
+
+    # return
+    return SiteMap(
+        projection_obj,
+        [list(site_locations.keys())],
+        [site_locations],  # type: ignore
+        ["norstar_riometer"],
+        None,
+        ["red"],
+        ["o"],
+        [5],
+        None,
+        rio,
+    )
+
+
+class LocalHTTPServer:
+    """
+    A local keep-alive HTTP server, to test API and download requests without the network.
+
+    Routes map a path to a function receiving the request handler, and returning the status
+    code, headers, and body of the response.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.connections = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # NOTE: without this, small responses are delayed by the interaction of Nagle's algorithm and delayed ACKs
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with server.lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                with server.lock:
+                    server.requests.append({"path": url.path, "params": parse_qs(url.query), "headers": dict(self.headers)})
+                if (url.path in server.routes):
+                    status, headers, body = server.routes[url.path](self)
+                else:
+                    status, headers, body = 404, {"Content-Type": "application/json"}, json.dumps({"detail": "Not Found"}).encode()
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                if ("Content-Length" not in headers):
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = "http://127.0.0.1:%d" % (self.httpd.server_address[1])
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def add_json(self, path, obj, status=200):
+        self.routes[path] = lambda handler: (status, {"Content-Type": "application/json"}, json.dumps(obj).encode())
+
+    def add_file(self, path, content, content_type="application/octet-stream", ranges=True, truncate=None, headers=None):
+        """
+        Serve a file, supporting range requests unless 'ranges' is False. Use 'truncate' to drop
+        the connection after that many bytes of the response body, and 'headers' to send extra
+        headers.
+        """
+
+        def route(handler):
+            status, body = 200, content
+            headers_sent = {"Content-Type": content_type, **(headers if headers is not None else {})}
+            range_header = handler.headers.get("Range")
+            if (ranges is True and range_header is not None):
+                start = int(range_header.removeprefix("bytes=").split("-")[0])
+                if (start >= len(content)):
+                    return 416, {"Content-Range": "bytes */%d" % (len(content))}, b""
+                status, body = 206, content[start:]
+                headers_sent["Content-Range"] = "bytes %d-%d/%d" % (start, len(content) - 1, len(content))
+            if (truncate is not None):
+                headers_sent["Content-Length"] = str(len(body))
+                body = body[0:truncate]
+                handler.close_connection = True
+            return status, headers_sent, body
+
+        self.routes[path] = route
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture(scope="function")
+def local_server():
+    server = LocalHTTPServer()
+    yield server
+    server.close()
+
+
 def pytest_sessionfinish(session, exitstatus):
     """
     Called after whole test run finished, right before
@@ -0,0 +1,123 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import datetime
+import numpy as np
+import pyucrio
+from pyucalgarysrs.data import FileListingResponse, Observatory
+from pyucrio.data.ucalgary._availability import clear_cache
+from unittest.mock import patch
+
+URL_PREFIX = "https://data.phys.ucalgary.ca/sort_by_project/SWAN/hsr/k0"
+URLS = [
+    "%s/2024/02/01/20240201_mean-hsr_k0_v01.h5" % (URL_PREFIX),
+    "%s/2024/02/01/20240201_gill-hsr_k0_v01.h5" % (URL_PREFIX),
+    "%s/2024/02/03/20240203_gill-hsr_k0_v01.h5" % (URL_PREFIX),
+    "%s/2024/02/03/20240203_other-hsr_k0_v01.h5" % (URL_PREFIX),
+]
+OBSERVATORIES = [
+    Observatory(uid="gill", full_name="Gillam", geodetic_latitude=56.38, geodetic_longitude=-94.64),
+    Observatory(uid="mean", full_name="Meanook", geodetic_latitude=54.60, geodetic_longitude=-113.35),
+]
+
+
+def __listing(dataset_name, start, end, site_uid=None, timeout=None, shard_size=None, n_parallel=4):
+    urls = [x for x in URLS if start.date() <= datetime.datetime.strptime(x.split("/")[-1][0:8], "%Y%m%d").date() <= end.date()]
+    return FileListingResponse(urls=urls, path_prefix="", count=len(urls), dataset=None)  # type: ignore
+
+
+@pytest.mark.data
+@pytest.mark.parametrize("n_parallel", [1, 2])
+def test_availability_matrix(rio, n_parallel):
+    clear_cache()
+    start = datetime.datetime(2024, 2, 1)
+    end = datetime.datetime(2024, 2, 3, 23, 59, 59)
+    with patch.object(rio.data.ucalgary, "list_observatories", return_value=OBSERVATORIES) as mock_observatories:
+        with patch.object(rio.data.ucalgary, "get_urls", side_effect=__listing) as mock_get_urls:
+            matrix = rio.data.ucalgary.availability_matrix("SWAN_HSR_K0_H5", start, end, n_parallel=n_parallel)
+            assert mock_observatories.call_count == 1
+            assert mock_get_urls.call_count == 1
+
+            # the listing is split into a shard of whole days for each parallel request
+            assert mock_get_urls.call_args.kwargs["n_parallel"] == n_parallel
+            assert mock_get_urls.call_args.kwargs["shard_size"] == (None if n_parallel == 1 else datetime.timedelta(days=2))
+
+            # calling again uses the cache
+            matrix2 = rio.data.ucalgary.availability_matrix("SWAN_HSR_K0_H5", start, end, n_parallel=n_parallel)
+            assert mock_observatories.call_count == 1
+            assert mock_get_urls.call_count == 1
+
+    assert isinstance(matrix, pyucrio.data.ucalgary.AvailabilityMatrix) is True
+    assert matrix.site_uid_list == ["gill", "mean"]
+    assert matrix.timestamps == [datetime.datetime(2024, 2, 1), datetime.datetime(2024, 2, 2), datetime.datetime(2024, 2, 3)]
+    np.testing.assert_array_equal(matrix.available, [[True, False, True], [True, False, False]])
+    np.testing.assert_array_equal(matrix2.available, matrix.available)
+
+
+@pytest.mark.data
+def test_availability_matrix_hourly(rio, capsys):
+    clear_cache()
+    start = datetime.datetime(2024, 2, 1, 12)
+    end = datetime.datetime(2024, 2, 3, 1)
+    with patch.object(rio.data.ucalgary, "get_urls", side_effect=__listing):
+        matrix = rio.data.ucalgary.availability_matrix("SWAN_HSR_K0_H5", start, end, site_uids=["mean", "gill"], resolution="hour")
+
+    # daily files count for every hour of the day
+    assert matrix.site_uid_list == ["mean", "gill"]
+    assert len(matrix.timestamps) == 38
+    assert matrix.timestamps[0] == start
+    assert matrix.available.shape == (2, 38)
+    np.testing.assert_array_equal(matrix.available[0, :], np.arange(0, 38) < 12)
+    np.testing.assert_array_equal(matrix.available[1, :], (np.arange(0, 38) < 12) | (np.arange(0, 38) >= 36))
+
+    # check __str__, __repr__, and pretty_print
+    assert "AvailabilityMatrix(" in str(matrix)
+    assert isinstance(repr(matrix), str) is True
+    matrix.pretty_print()
+    assert capsys.readouterr().out != ""
+
+
+@pytest.mark.data
+@patch("matplotlib.pyplot.show")
+def test_availability_matrix_plot(mock_show, plot_cleanup, rio, tmp_path):
+    clear_cache()
+    start = datetime.datetime(2024, 2, 1)
+    end = datetime.datetime(2024, 2, 3)
+    with patch.object(rio.data.ucalgary, "get_urls", side_effect=__listing):
+        matrix = rio.data.ucalgary.availability_matrix("SWAN_HSR_K0_H5", start, end, site_uids=["gill", "mean"])
+
+    matrix.plot(title="some title")
+    assert mock_show.call_count == 1
+
+    fig, ax = matrix.plot(returnfig=True)
+    assert [x.get_text() for x in ax.get_yticklabels()] == ["GILL", "MEAN"]
+
+    matrix.plot(savefig=True, savefig_filename=str(tmp_path / "availability.png"))
+    assert (tmp_path / "availability.png").exists() is True
+
+
+@pytest.mark.data
+def test_availability_matrix_errors(rio):
+    start = datetime.datetime(2024, 2, 1)
+    end = datetime.datetime(2024, 2, 3)
+    with pytest.raises(ValueError) as e_info:
+        rio.data.ucalgary.availability_matrix("SWAN_HSR_K0_H5", start, end, resolution="minute")
+    assert "resolution" in str(e_info)
+    with pytest.raises(ValueError) as e_info:
+        rio.data.ucalgary.availability_matrix("SWAN_HSR_K0_H5", end, start)
+    assert "after the start" in str(e_info)
+    with pytest.raises(ValueError) as e_info:
+        rio.data.ucalgary.availability_matrix("SOME_DATASET", start, end, use_cache=False)
+    assert "Unable to determine the instrument array" in str(e_info)
@@ -0,0 +1,175 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import gzip
+import pytest
+import datetime
+import numpy as np
+import pyucrio
+from pyucalgarysrs.data import Dataset, FileListingResponse
+from pyucrio.data.ucalgary import _verification
+from pyucrio.data.ucalgary._compression import is_zstd_available
+
+DATASET = Dataset(
+    name="NORSTAR_RIOMETER_K0_TXT",
+    short_description="NORSTAR riometer K0 data",
+    long_description="NORSTAR riometer K0 data",
+    data_tree_url="https://data.phys.ucalgary.ca/sort_by_project/GO-Canada/GO-Rio/txt",
+    file_listing_supported=True,
+    file_reading_supported=True,
+    level="K0",
+    supported_libraries=["pyucalgarysrs", "pyucrio"],
+    file_time_resolution="1 day",
+)
+
+
+def __k0_file_content(site, date):
+    lines = [
+        "# ---- NORSTAR riometer K0 data ----",
+        "# Version: 1",
+        "# Site unique ID: %s" % (site.upper()),
+        "# ------------------------------",
+    ]
+    for i in range(0, 720):
+        timestamp = date + datetime.timedelta(seconds=5 * i)
+        lines.append("%s %.3f" % (timestamp.strftime("%d/%m/%y %H:%M:%S"), 2.5 + 0.001 * i))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def __k0_filename(site, date):
+    return "norstar_k0_rio-%s_%s_v01.txt" % (site, date.strftime("%Y%m%d"))
+
+
+@pytest.mark.data
+def test_download_compression_settings():
+    rio = pyucrio.PyUCRio(download_compression="gzip")
+    assert rio.download_compression == "gzip"
+    assert "download_compression=gzip" in str(rio)
+    rio.download_compression = None
+    assert rio.download_compression is None
+
+    with pytest.raises(pyucrio.PyUCRioInitializationError):
+        rio.download_compression = "lzma"  # type: ignore
+    if (is_zstd_available() is False):
+        with pytest.raises(pyucrio.PyUCRioInitializationError) as e_info:
+            rio.download_compression = "zstd"
+        assert "zstandard" in str(e_info)
+
+
+@pytest.mark.data
+def test_download_compression(local_server, tmp_path):
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path / "download"), api_base_url=local_server.url, download_compression="gzip")
+    dates = [datetime.datetime(2023, 11, 5), datetime.datetime(2023, 11, 6)]
+    names = [__k0_filename("gill", x) for x in dates]
+    contents = [__k0_file_content("gill", x) for x in dates]
+    for name, content in zip(names, contents, strict=True):
+        local_server.add_file("/data/%s" % (name), content, content_type="text/plain")
+    listing = FileListingResponse(
+        urls=[local_server.url + "/data/%s" % (x) for x in names],
+        path_prefix=local_server.url + "/data",
+        count=len(names),
+        dataset=DATASET,
+        total_bytes=sum([len(x) for x in contents]),
+    )
+
+    # files are stored compressed, and verified
+    res = rio.data.ucalgary.download_using_urls(listing, progress_bar_disable=True)
+    assert [os.path.basename(x) for x in res.filenames] == [x + ".gz" for x in names]
+    assert sorted(os.listdir(os.path.join(str(tmp_path / "download"), DATASET.name))) == sorted([x + ".gz" for x in names])
+    for filename, content in zip(res.filenames, contents, strict=True):
+        assert os.path.getsize(filename) < len(content) / 2
+        with gzip.open(filename, "rb") as fp:
+            assert fp.read() == content
+        assert _verification.is_valid(rio, filename) is True
+
+    # and found by later downloads
+    res = rio.data.ucalgary.download_using_urls(listing, progress_bar_disable=True)
+    assert res.total_bytes == 0
+    assert res.count == 2
+
+    # which are read the same as uncompressed files, in the worker processes or not
+    plain_filenames = []
+    for name, content in zip(names, contents, strict=True):
+        plain_filenames.append(str(tmp_path / name))
+        with open(plain_filenames[-1], "wb") as fp:
+            fp.write(content)
+    expected = rio.data.ucalgary.readers.read_norstar_riometer(plain_filenames)
+    for n_parallel in [1, 2]:
+        data = rio.data.ucalgary.read(DATASET, res.filenames, n_parallel=n_parallel)
+        assert data.problematic_files == []
+        assert data.timestamp == expected.timestamp
+        assert data.metadata == expected.metadata
+        assert data.metadata[0]["site_unique_id"] == "gill"
+        for i in range(0, len(expected.data)):
+            assert np.array_equal(data.data[i].timestamp, expected.data[i].timestamp)
+            assert np.array_equal(data.data[i].raw_signal, expected.data[i].raw_signal)
+
+    # mixed with uncompressed files, and filtered by time
+    data = rio.data.ucalgary.readers.read_norstar_riometer(
+        [res.filenames[0], plain_filenames[1]],
+        start_time=datetime.datetime(2023, 11, 5, 0, 30),
+        end_time=datetime.datetime(2023, 11, 6, 0, 10),
+    )
+    assert len(data.data) == 2
+    assert data.data[0].timestamp[0] == datetime.datetime(2023, 11, 5, 0, 30)
+    assert data.data[1].timestamp[-1] == datetime.datetime(2023, 11, 6, 0, 10)
+
+
+@pytest.mark.data
+def test_read_compressed_problematic(tmp_path):
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path))
+    filename = str(tmp_path / (__k0_filename("gill", datetime.datetime(2023, 11, 5)) + ".gz"))
+    with open(filename, "wb") as fp:
+        fp.write(b"not gzip data")
+
+    # problems are reported for the compressed file
+    data = rio.data.ucalgary.readers.read_norstar_riometer(filename, quiet=True)
+    assert len(data.problematic_files) == 1
+    assert data.problematic_files[0].filename == filename
+    assert "error decompressing file" in data.problematic_files[0].error_message
+
+
+@pytest.mark.data
+def test_read_compressed_k2(tmp_path):
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path))
+    date = datetime.datetime(2023, 11, 5)
+    lines = [
+        "# ---- NORSTAR riometer K2 data ----",
+        "# Version: 1",
+        "# Site unique ID: GILL",
+        "# ------------------------------",
+    ]
+    for i in range(0, 720):
+        timestamp = date + datetime.timedelta(seconds=5 * i)
+        lines.append("%s %.3f %.3f" % (timestamp.strftime("%d/%m/%y %H:%M:%S"), 0.01 * i, 2.5 + 0.001 * i))
+    lines.append("05/11/23 24:00:00 0.000 2.500")  # UT24 records are dropped
+    content = ("\n".join(lines) + "\n").encode()
+    name = "norstar_k2_rio-gill_%s_v01.txt" % (date.strftime("%Y%m%d"))
+    plain_filename = str(tmp_path / name)
+    with open(plain_filename, "wb") as fp:
+        fp.write(content)
+    with gzip.open(plain_filename + ".gz", "wb") as fp:
+        fp.write(content)
+
+    # the compressed file is read the same as the uncompressed one
+    expected = rio.srs_obj.data.readers.read_norstar_riometer(plain_filename, end_time=datetime.datetime(2023, 11, 5, 0, 30))
+    data = rio.data.ucalgary.readers.read_norstar_riometer(plain_filename + ".gz", end_time=datetime.datetime(2023, 11, 5, 0, 30))
+    assert data.problematic_files == []
+    assert data.timestamp == expected.timestamp
+    assert data.metadata == expected.metadata
+    assert len(data.data[0].timestamp) == 361
+    assert np.array_equal(data.data[0].timestamp, expected.data[0].timestamp)
+    assert np.array_equal(data.data[0].raw_signal, expected.data[0].raw_signal)
+    assert np.array_equal(data.data[0].absorption, expected.data[0].absorption)
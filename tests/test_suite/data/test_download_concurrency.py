@@ -0,0 +1,102 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import pytest
+import pyucrio
+from pyucalgarysrs.data import Dataset, FileListingResponse
+from pyucrio.data.ucalgary._concurrency import ConcurrencyController
+
+DATASET = Dataset(
+    name="NORSTAR_RIOMETER_K0_TXT",
+    short_description="NORSTAR riometer K0 data",
+    long_description="NORSTAR riometer K0 data",
+    data_tree_url="https://data.phys.ucalgary.ca/sort_by_project/GO-Canada/GO-Rio/txt",
+    file_listing_supported=True,
+    file_reading_supported=True,
+    level="K0",
+    supported_libraries=["pyucalgarysrs", "pyucrio"],
+    file_time_resolution="1 day",
+)
+N_FILES = 80
+
+
+@pytest.fixture(scope="function")
+def slow_listing(local_server):
+    # small files, where the latency of each request dominates
+    def route(handler):
+        time.sleep(0.04)
+        return 200, {"Content-Type": "text/plain"}, b"0123456789" * 100
+
+    for i in range(0, N_FILES):
+        local_server.routes["/data/file_%02d.txt" % (i)] = route
+    return FileListingResponse(
+        urls=[local_server.url + "/data/file_%02d.txt" % (i) for i in range(0, N_FILES)],
+        path_prefix=local_server.url + "/data",
+        count=N_FILES,
+        dataset=DATASET,
+        total_bytes=N_FILES * 1000,
+    )
+
+
+@pytest.mark.data
+def test_download_concurrency_auto(local_server, slow_listing, tmp_path):
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url)
+
+    # the level grows while the throughput improves
+    res = rio.data.ucalgary.download_using_urls(slow_listing, n_parallel="auto", progress_bar_disable=True)
+    assert res.count == N_FILES
+    assert res.n_parallel > 4
+    assert res.throughput_mb_per_second > 0
+    assert "n_parallel=%d" % (res.n_parallel) in str(res)
+
+    # and is limited by the HTTP pool size
+    rio.http_pool_size = 2
+    res = rio.data.ucalgary.download_using_urls(slow_listing, n_parallel="auto", overwrite=True, progress_bar_disable=True)
+    assert res.count == N_FILES
+    assert res.n_parallel <= 2
+
+
+@pytest.mark.data
+def test_download_concurrency_fixed(local_server, slow_listing, tmp_path):
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url)
+    res = rio.data.ucalgary.download_using_urls(slow_listing, n_parallel=3, progress_bar_disable=True)
+    assert res.count == N_FILES
+    assert res.n_parallel == 3
+
+    for n_parallel in [0, "some_value", 2.5]:
+        with pytest.raises(ValueError) as e_info:
+            rio.data.ucalgary.download_using_urls(slow_listing, n_parallel=n_parallel)  # type: ignore
+        assert "n_parallel" in str(e_info)
+
+
+@pytest.mark.data
+def test_concurrency_controller():
+    # failures halve the level
+    controller = ConcurrencyController(8, 1, 32)
+    for _ in range(0, 8):
+        controller.record(1000, 0.1, False)
+    assert controller.limit == 9
+    for _ in range(0, 9):
+        controller.record(0, 0.1, True)
+    assert controller.limit == 4
+    for _ in range(0, 4):
+        controller.record(0, 0.1, True)
+    assert controller.limit == 2
+
+    # fixed levels never change
+    controller = ConcurrencyController(5, 5, 5)
+    for _ in range(0, 20):
+        controller.record(1000, 0.1, False)
+    assert controller.limit == 5
@@ -0,0 +1,227 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import json
+import time
+import socket
+import pytest
+import pyucrio
+import subprocess
+import threading
+from pyucalgarysrs.data import Dataset, FileListingResponse
+from unittest.mock import patch
+from pyucrio._filelock import FileLock
+from pyucrio.data.ucalgary import RetryPolicy
+
+DATASET = Dataset(
+    name="NORSTAR_RIOMETER_K0_TXT",
+    short_description="NORSTAR riometer K0 data",
+    long_description="NORSTAR riometer K0 data",
+    data_tree_url="https://data.phys.ucalgary.ca/sort_by_project/GO-Canada/GO-Rio/txt",
+    file_listing_supported=True,
+    file_reading_supported=True,
+    level="K0",
+    supported_libraries=["pyucalgarysrs", "pyucrio"],
+    file_time_resolution="1 day",
+)
+FILE_PATH = "/data/2023/11/05/norstar_k0_rio-gill_20231105_v01.txt"
+FILE_CONTENT = b"0123456789" * 10000
+
+
+@pytest.fixture(scope="function")
+def lock_setup(local_server, tmp_path):
+    # a slow file, so that downloads overlap
+    def route(handler):
+        time.sleep(0.5)
+        return 200, {"Content-Type": "text/plain"}, FILE_CONTENT
+
+    local_server.routes[FILE_PATH] = route
+    listing = FileListingResponse(
+        urls=[local_server.url + FILE_PATH],
+        path_prefix=local_server.url + "/data",
+        count=1,
+        dataset=DATASET,
+        total_bytes=len(FILE_CONTENT),
+    )
+    filename = os.path.join(str(tmp_path), DATASET.name, FILE_PATH.removeprefix("/data/"))
+    return listing, filename
+
+
+def __write_lock(filename, host, pid, age=0.0):
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename + ".lock", "w") as fp:
+        json.dump({"host": host, "pid": pid, "thread": 0}, fp)
+    mtime = time.time() - age
+    os.utime(filename + ".lock", (mtime, mtime))
+
+
+@pytest.mark.data
+def test_download_lock_shared_path(local_server, lock_setup, tmp_path):
+    listing, filename = lock_setup
+
+    # two downloaders sharing the same path, as two pipeline processes would
+    results = []
+
+    def download():
+        rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url)
+        results.append(rio.data.ucalgary.download_using_urls(listing, progress_bar_disable=True))
+
+    threads = [threading.Thread(target=download) for _ in range(0, 2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # the file was only downloaded once, and the other downloader waited for it
+    assert len([x for x in local_server.requests if x["path"] == FILE_PATH]) == 1
+    assert sorted([x.total_bytes for x in results]) == [0, len(FILE_CONTENT)]
+    for res in results:
+        assert [str(x) for x in res.filenames] == [filename]
+    with open(filename, "rb") as fp:
+        assert fp.read() == FILE_CONTENT
+    assert sorted(os.listdir(os.path.dirname(filename))) == [os.path.basename(filename)]
+
+
+@pytest.mark.data
+def test_download_lock_held(local_server, lock_setup, tmp_path):
+    listing, filename = lock_setup
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url)
+
+    # a live process is downloading the file, and finishes while we wait
+    __write_lock(filename, socket.gethostname(), os.getpid())
+
+    def finish():
+        time.sleep(0.5)
+        with open(filename, "wb") as fp:
+            fp.write(FILE_CONTENT)
+        os.remove(filename + ".lock")
+
+    t = threading.Thread(target=finish)
+    t.start()
+    start = time.perf_counter()
+    res = rio.data.ucalgary.download_using_urls(listing, progress_bar_disable=True)
+    t.join()
+    assert time.perf_counter() - start >= 0.5
+    assert res.count == 1
+    assert res.total_bytes == 0
+    assert len(local_server.requests) == 0
+
+
+@pytest.mark.data
+def test_download_lock_stale(local_server, lock_setup, tmp_path):
+    listing, filename = lock_setup
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url)
+
+    # the process that held the lock no longer exists
+    if (os.name == "posix"):
+        p = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, check=True)
+        __write_lock(filename, socket.gethostname(), int(p.stdout))
+        res = rio.data.ucalgary.download_using_urls(listing, progress_bar_disable=True)
+        assert res.total_bytes == len(FILE_CONTENT)
+        assert os.path.exists(filename + ".lock") is False
+
+    # a process on another machine stopped refreshing the lock
+    __write_lock(filename, "some-other-host", 1, age=3600.0)
+    res = rio.data.ucalgary.download_using_urls(listing, overwrite=True, progress_bar_disable=True)
+    assert res.total_bytes == len(FILE_CONTENT)
+    assert sorted(os.listdir(os.path.dirname(filename))) == [os.path.basename(filename)]
+
+
+@pytest.mark.data
+def test_file_lock(tmp_path):
+    filename = str(tmp_path / "file.txt.lock")
+    lock = FileLock(filename)
+    other_lock = FileLock(filename)
+
+    # only one owner at a time
+    assert lock.acquire() is True
+    assert other_lock.acquire() is False
+    with open(filename, "r") as fp:
+        owner = json.load(fp)
+    assert owner["host"] == socket.gethostname()
+    assert owner["pid"] == os.getpid()
+
+    # a live lock on another machine isn't taken over
+    lock.release()
+    __write_lock(filename.removesuffix(".lock"), "some-other-host", 1)
+    assert lock.acquire() is False
+
+    # until it goes stale
+    __write_lock(filename.removesuffix(".lock"), "some-other-host", 1, age=3600.0)
+    assert lock.acquire() is True
+    lock.release()
+    assert os.listdir(str(tmp_path)) == []
+
+
+@pytest.mark.data
+def test_download_lock_wait_limit(local_server, lock_setup, tmp_path):
+    listing, filename = lock_setup
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url)
+
+    # a live process holds the lock, but makes no progress
+    __write_lock(filename, socket.gethostname(), os.getpid())
+    start = time.perf_counter()
+    with pytest.warns(UserWarning, match="1 of 1 files could not be downloaded"):
+        res = rio.data.ucalgary.download_using_urls(listing, timeout=1, progress_bar_disable=True)
+    assert 1.0 <= time.perf_counter() - start < 5.0
+    assert res.count == 0
+    assert "Timed out waiting" in res.failed[0].error
+    assert len(local_server.requests) == 0
+
+    # or the deadline passes
+    rio.retry_policy = RetryPolicy(deadline=0.5)
+    start = time.perf_counter()
+    with pytest.warns(UserWarning, match="1 of 1 files could not be downloaded"):
+        res = rio.data.ucalgary.download_using_urls(listing, timeout=60, progress_bar_disable=True)
+    assert time.perf_counter() - start < 5.0
+    assert "Timed out waiting" in res.failed[0].error
+    rio.retry_policy = None
+
+    # a process making progress is waited for, even if it takes longer than the timeout
+    def progress():
+        for _ in range(0, 6):
+            with open(filename + ".part", "ab") as fp:
+                fp.write(FILE_CONTENT[0:1000])
+            time.sleep(0.3)
+        os.replace(filename + ".part", filename)
+        os.remove(filename + ".lock")
+
+    t = threading.Thread(target=progress)
+    t.start()
+    res = rio.data.ucalgary.download_using_urls(listing, timeout=1, progress_bar_disable=True)
+    t.join()
+    assert res.count == 1
+    assert res.total_bytes == 0
+    assert len(local_server.requests) == 0
+
+
+@pytest.mark.data
+def test_file_lock_heartbeat(tmp_path):
+    filename = str(tmp_path / "file.txt.lock")
+    with patch.object(FileLock, "_FileLock__REFRESH_SECONDS", 0.1):
+        lock = FileLock(filename)
+        assert lock.acquire() is True
+
+        # the lock is kept fresh while held, without the owner doing anything
+        os.utime(filename, (time.time() - 3600.0, time.time() - 3600.0))
+        time.sleep(0.5)
+        assert time.time() - os.path.getmtime(filename) < 5.0
+        assert FileLock(filename).acquire() is False
+
+        # and no longer once released
+        lock.release()
+        time.sleep(0.3)
+        assert os.path.exists(filename) is False
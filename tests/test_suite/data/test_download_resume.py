@@ -0,0 +1,114 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+import pyucrio
+from pyucalgarysrs.data import Dataset, FileListingResponse
+
+DATASET = Dataset(
+    name="SWAN_HSR_K0_H5",
+    short_description="SWAN HSR K0 data",
+    long_description="SWAN Hyper Spectral Riometer K0 data",
+    data_tree_url="https://data.phys.ucalgary.ca/sort_by_project/SWAN/hsr/k0",
+    file_listing_supported=True,
+    file_reading_supported=True,
+    level="K0",
+    supported_libraries=["pyucalgarysrs", "pyucrio"],
+    file_time_resolution="1 hour",
+)
+FILE_PATH = "/data/2023/11/05/20231105_04_gill_hsr_k0_v01.h5"
+FILE_CONTENT = bytes(range(0, 256)) * 4096
+
+
+@pytest.fixture(scope="function")
+def resume_setup(local_server, tmp_path):
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url)
+    listing = FileListingResponse(
+        urls=[local_server.url + FILE_PATH],
+        path_prefix=local_server.url + "/data",
+        count=1,
+        dataset=DATASET,
+        total_bytes=len(FILE_CONTENT),
+    )
+    filename = os.path.join(str(tmp_path), DATASET.name, FILE_PATH.removeprefix("/data/"))
+    return rio, listing, filename
+
+
+@pytest.mark.data
+def test_download_resume(resume_setup, local_server):
+    rio, listing, filename = resume_setup
+
+    # the connection is dropped part way through, leaving a partial file
+    rio.retry_policy = pyucrio.data.ucalgary.RetryPolicy(max_attempts=1)
+    local_server.add_file(FILE_PATH, FILE_CONTENT, truncate=300000)
+    with pytest.warns(UserWarning):
+        res = rio.data.ucalgary.download_using_urls(listing, progress_bar_disable=True)
+    assert res.count == 0
+    assert len(res.failed) == 1
+    assert os.path.exists(filename) is False
+    part_size = os.path.getsize(filename + ".part")
+    assert 0 < part_size <= 300000
+
+    # the next download only retrieves the missing bytes
+    local_server.add_file(FILE_PATH, FILE_CONTENT)
+    res = rio.data.ucalgary.download_using_urls(listing)
+    assert local_server.requests[-1]["headers"]["range"] == "bytes=%d-" % (part_size)
+    assert res.total_bytes == len(FILE_CONTENT) - part_size
+    assert [str(x) for x in res.filenames] == [filename]
+    assert os.path.exists(filename + ".part") is False
+    with open(filename, "rb") as fp:
+        assert fp.read() == FILE_CONTENT
+
+
+@pytest.mark.data
+def test_download_resume_server_responses(resume_setup, local_server):
+    rio, listing, filename = resume_setup
+    os.makedirs(os.path.dirname(filename))
+
+    # the partial file was already complete
+    with open(filename + ".part", "wb") as fp:
+        fp.write(FILE_CONTENT)
+    local_server.add_file(FILE_PATH, FILE_CONTENT)
+    res = rio.data.ucalgary.download_using_urls(listing, progress_bar_disable=True)
+    assert res.total_bytes == 0
+    with open(filename, "rb") as fp:
+        assert fp.read() == FILE_CONTENT
+
+    # the partial file is larger than the file on the server, so we start over
+    os.remove(filename)
+    with open(filename + ".part", "wb") as fp:
+        fp.write(FILE_CONTENT + b"extra")
+    res = rio.data.ucalgary.download_using_urls(listing, progress_bar_disable=True)
+    assert res.total_bytes == len(FILE_CONTENT)
+    with open(filename, "rb") as fp:
+        assert fp.read() == FILE_CONTENT
+
+    # the server doesn't support range requests, so we start over
+    os.remove(filename)
+    with open(filename + ".part", "wb") as fp:
+        fp.write(b"some other content")
+    local_server.add_file(FILE_PATH, FILE_CONTENT, ranges=False)
+    res = rio.data.ucalgary.download_using_urls(listing, progress_bar_disable=True)
+    assert res.total_bytes == len(FILE_CONTENT)
+    with open(filename, "rb") as fp:
+        assert fp.read() == FILE_CONTENT
+
+    # overwriting ignores any partial file
+    with open(filename + ".part", "wb") as fp:
+        fp.write(FILE_CONTENT[0:1000])
+    local_server.add_file(FILE_PATH, FILE_CONTENT)
+    res = rio.data.ucalgary.download_using_urls(listing, overwrite=True, progress_bar_disable=True)
+    assert "range" not in local_server.requests[-1]["headers"]
+    assert res.total_bytes == len(FILE_CONTENT)
@@ -0,0 +1,166 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import base64
+import hashlib
+import pytest
+import pyucrio
+from pyucalgarysrs.data import Dataset, FileListingResponse
+from pyucrio.data.ucalgary import _verification
+
+DATASET = Dataset(
+    name="NORSTAR_RIOMETER_K0_TXT",
+    short_description="NORSTAR riometer K0 data",
+    long_description="NORSTAR riometer K0 data",
+    data_tree_url="https://data.phys.ucalgary.ca/sort_by_project/GO-Canada/GO-Rio/txt",
+    file_listing_supported=True,
+    file_reading_supported=True,
+    level="K0",
+    supported_libraries=["pyucalgarysrs", "pyucrio"],
+    file_time_resolution="1 day",
+)
+FILE_CONTENT = b"0123456789" * 20000
+
+
+def __listing(local_server, names):
+    return FileListingResponse(
+        urls=[local_server.url + "/data/%s" % (x) for x in names],
+        path_prefix=local_server.url + "/data",
+        count=len(names),
+        dataset=DATASET,
+        total_bytes=len(FILE_CONTENT) * len(names),
+    )
+
+
+def __repr_digest(content):
+    return {"Repr-Digest": "sha-256=:%s:" % (base64.b64encode(hashlib.sha256(content).digest()).decode())}
+
+
+@pytest.mark.data
+def test_download_verification(local_server, tmp_path):
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url)
+    local_server.add_file("/data/digest.txt", FILE_CONTENT, headers=__repr_digest(FILE_CONTENT))
+    local_server.add_file("/data/md5.txt", FILE_CONTENT, headers={"Content-MD5": base64.b64encode(hashlib.md5(FILE_CONTENT).digest()).decode()})
+    local_server.add_file("/data/plain.txt", FILE_CONTENT)
+
+    # files are checked against what the server sent, and recorded in the index
+    res = rio.data.ucalgary.download_using_urls(__listing(local_server, ["digest.txt", "md5.txt", "plain.txt"]), progress_bar_disable=True)
+    assert res.count == 3
+    verified_by = {}
+    for filename in res.filenames:
+        entry = _verification.lookup(rio, filename)
+        assert entry is not None
+        assert entry["sha256"] == hashlib.sha256(FILE_CONTENT).hexdigest()
+        assert entry["size"] == len(FILE_CONTENT)
+        assert _verification.is_valid(rio, filename) is True
+        verified_by[os.path.basename(filename)] = entry["verified_by"]
+    assert verified_by == {"digest.txt": "size,sha256", "md5.txt": "size,md5", "plain.txt": "size"}
+
+    # changed files are no longer valid
+    with open(res.filenames[0], "ab") as fp:
+        fp.write(b"extra")
+    assert _verification.is_valid(rio, res.filenames[0]) is False
+    assert _verification.is_valid(rio, str(tmp_path / "not_downloaded.txt")) is False
+
+
+@pytest.mark.data
+def test_download_verification_mismatch(local_server, tmp_path):
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url)
+    responses = {"n": 0}
+
+    def corrupt_once_route(handler):
+        responses["n"] += 1
+        body = FILE_CONTENT if responses["n"] > 1 else FILE_CONTENT[:-1] + b"x"
+        return 200, {"Content-Type": "text/plain", **__repr_digest(FILE_CONTENT)}, body
+
+    # a corrupt download is retried from the start
+    local_server.routes["/data/corrupt_once.txt"] = corrupt_once_route
+    res = rio.data.ucalgary.download_using_urls(__listing(local_server, ["corrupt_once.txt"]), progress_bar_disable=True)
+    assert res.count == 1
+    assert responses["n"] == 2
+    with open(res.filenames[0], "rb") as fp:
+        assert fp.read() == FILE_CONTENT
+
+    # and reported if it never matches
+    local_server.add_file("/data/corrupt.txt", FILE_CONTENT, headers=__repr_digest(b"other content"))
+    with pytest.warns(UserWarning, match="1 of 1 files could not be downloaded"):
+        res = rio.data.ucalgary.download_using_urls(__listing(local_server, ["corrupt.txt"]), progress_bar_disable=True)
+    assert res.count == 0
+    assert "failed sha256 checksum verification" in res.failed[0].error
+    filename = os.path.join(str(tmp_path), DATASET.name, "corrupt.txt")
+    assert os.path.exists(filename) is False
+    assert os.path.exists(filename + ".part") is False
+    assert _verification.lookup(rio, filename) is None
+
+
+@pytest.mark.data
+def test_download_verification_resume(local_server, tmp_path):
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url)
+    filename = os.path.join(str(tmp_path), DATASET.name, "resumed.txt")
+    os.makedirs(os.path.dirname(filename))
+
+    # the checksum includes the part downloaded previously
+    with open(filename + ".part", "wb") as fp:
+        fp.write(FILE_CONTENT[0:50000])
+    local_server.add_file("/data/resumed.txt", FILE_CONTENT, headers=__repr_digest(FILE_CONTENT))
+    res = rio.data.ucalgary.download_using_urls(__listing(local_server, ["resumed.txt"]), progress_bar_disable=True)
+    assert res.total_bytes == len(FILE_CONTENT) - 50000
+    assert _verification.lookup(rio, filename)["verified_by"] == "size,sha256"
+
+    # a corrupt partial file is caught, and downloaded again
+    os.remove(filename)
+    with open(filename + ".part", "wb") as fp:
+        fp.write(b"x" * 50000)
+    res = rio.data.ucalgary.download_using_urls(__listing(local_server, ["resumed.txt"]), progress_bar_disable=True)
+    assert "range" not in local_server.requests[-1]["headers"]
+    with open(filename, "rb") as fp:
+        assert fp.read() == FILE_CONTENT
+
+
+@pytest.mark.data
+def test_download_overwrite_if_invalid(local_server, tmp_path):
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url)
+    names = ["valid.txt", "changed.txt", "unknown.txt"]
+    for name in names:
+        local_server.add_file("/data/%s" % (name), FILE_CONTENT)
+    listing = __listing(local_server, names)
+    res = rio.data.ucalgary.download_using_urls(listing, progress_bar_disable=True)
+    assert res.count == 3
+
+    # a file that was changed, and one that isn't in the index
+    with open(os.path.join(str(tmp_path), DATASET.name, "changed.txt"), "wb") as fp:
+        fp.write(b"corrupt")
+    os.remove(_verification.get_index_filename(rio))
+    _verification.record(rio, os.path.join(str(tmp_path), DATASET.name, "valid.txt"), "", "size")
+    _verification.record(rio, os.path.join(str(tmp_path), DATASET.name, "changed.txt"), "", "size")
+    with open(os.path.join(str(tmp_path), DATASET.name, "changed.txt"), "ab") as fp:
+        fp.write(b" since")
+
+    # only the files not known to be valid are downloaded again
+    n_requests = len(local_server.requests)
+    res = rio.data.ucalgary.download_using_urls(listing, overwrite="if_invalid", progress_bar_disable=True)
+    assert res.count == 3
+    assert res.total_bytes == 2 * len(FILE_CONTENT)
+    assert sorted([x["path"] for x in local_server.requests[n_requests:]]) == ["/data/changed.txt", "/data/unknown.txt"]
+    for filename in res.filenames:
+        assert _verification.is_valid(rio, filename) is True
+
+    # and nothing is downloaded once they are all valid
+    res = rio.data.ucalgary.download_using_urls(listing, overwrite="if_invalid", progress_bar_disable=True)
+    assert res.total_bytes == 0
+
+    with pytest.raises(ValueError) as e_info:
+        rio.data.ucalgary.download_using_urls(listing, overwrite="some_value")  # type: ignore
+    assert "overwrite" in str(e_info)
@@ -0,0 +1,162 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import time
+import pytest
+import datetime
+import threading
+import pyucrio
+from urllib.parse import urlsplit, parse_qs
+
+LISTING_PATH = "/api/v1/data_distribution/urls"
+DATASET = {
+    "name": "NORSTAR_RIOMETER_K0_TXT",
+    "short_description": "NORSTAR riometer K0 data",
+    "long_description": "NORSTAR riometer K0 data",
+    "data_tree_url": "https://data.phys.ucalgary.ca/sort_by_project/GO-Canada/GO-Rio/txt",
+    "file_listing_supported": True,
+    "level": "K0",
+    "supported_libraries": ["pyucalgarysrs", "pyucrio"],
+    "file_time_resolution": "1 day",
+}
+FILE_CONTENT = b"0123456789" * 100
+
+
+def __filename(date):
+    return "norstar_k0_rio-gill_%s_v01.txt" % (date.strftime("%Y%m%d"))
+
+
+def __listing_route(local_server, delays=None):
+    """
+    A file listing route with one file per day of the requested range, and the file of the
+    day before the range (as a duplicate of the previous shard's last file). Listing the
+    shards starting on the dates in 'delays' is delayed by that many seconds.
+    """
+
+    def route(handler):
+        params = parse_qs(urlsplit(handler.path).query)
+        start = datetime.datetime.fromisoformat(params["start"][0])
+        end = datetime.datetime.fromisoformat(params["end"][0])
+        if (delays is not None and start.date() in delays):
+            time.sleep(delays[start.date()])
+        day = datetime.datetime.combine(start.date(), datetime.time()) - datetime.timedelta(days=1)
+        urls = []
+        while (day <= end):
+            urls.append(local_server.url + "/data/%s" % (__filename(day)))
+            local_server.add_file("/data/%s" % (__filename(day)), FILE_CONTENT)
+            day += datetime.timedelta(days=1)
+        body = {
+            "urls": urls,
+            "path_prefix": local_server.url + "/data",
+            "count": len(urls),
+            "dataset": DATASET,
+            "total_bytes": len(urls) * len(FILE_CONTENT)
+        }
+        return 200, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+    return route
+
+
+def __listing_requests(local_server):
+    return [(x["params"]["start"][0], x["params"]["end"][0]) for x in local_server.requests if x["path"] == LISTING_PATH]
+
+
+@pytest.mark.data
+def test_get_urls_sharding(local_server):
+    rio = pyucrio.PyUCRio(api_base_url=local_server.url)
+    local_server.routes[LISTING_PATH] = __listing_route(local_server)
+
+    # a range of several months is listed by month, and merged
+    start = datetime.datetime(2023, 11, 5, 0, 0)
+    end = datetime.datetime(2024, 1, 10, 23, 59)
+    res = rio.data.ucalgary.get_urls(DATASET["name"], start, end)
+    assert sorted(__listing_requests(local_server)) == [
+        ("2023-11-05 00:00:00", "2023-11-30 23:59:59.999999"),
+        ("2023-12-01 00:00:00", "2023-12-31 23:59:59.999999"),
+        ("2024-01-01 00:00:00", "2024-01-10 23:59:00"),
+    ]
+    expected_urls = [local_server.url + "/data/%s" % (__filename(start + datetime.timedelta(days=i))) for i in range(-1, 67)]
+    assert res.urls == expected_urls
+    assert res.count == len(expected_urls)
+    assert res.total_bytes == (len(expected_urls) + 2) * len(FILE_CONTENT)
+    assert res.dataset.name == DATASET["name"]
+
+    # a short range, or no sharding, is listed in one request
+    for start, end, shard_size in [
+        (datetime.datetime(2023, 11, 5, 0, 0), datetime.datetime(2023, 11, 6, 23, 59), "month"),
+        (datetime.datetime(2023, 11, 5, 0, 0), datetime.datetime(2024, 1, 10, 23, 59), None),
+    ]:
+        local_server.requests.clear()
+        rio.data.ucalgary.get_urls(DATASET["name"], start, end, shard_size=shard_size)
+        assert __listing_requests(local_server) == [(str(start), str(end))]
+
+    # shards of a fixed duration, listed one at a time
+    local_server.requests.clear()
+    start = datetime.datetime(2023, 11, 5, 12, 0)
+    end = datetime.datetime(2023, 11, 8, 23, 59)
+    res = rio.data.ucalgary.get_urls(DATASET["name"], start, end, shard_size=datetime.timedelta(hours=36), n_parallel=1)
+    assert __listing_requests(local_server) == [
+        ("2023-11-05 12:00:00", "2023-11-06 23:59:59.999999"),
+        ("2023-11-07 00:00:00", "2023-11-08 11:59:59.999999"),
+        ("2023-11-08 12:00:00", "2023-11-08 23:59:00"),
+    ]
+    assert res.count == 5
+
+    # invalid parameters
+    for kwargs in [{"shard_size": "week"}, {"shard_size": datetime.timedelta(0)}, {"n_parallel": 0}]:
+        with pytest.raises(ValueError) as e_info:
+            rio.data.ucalgary.get_urls(DATASET["name"], start, end, **kwargs)  # type: ignore
+        assert list(kwargs.keys())[0] in str(e_info)
+
+
+@pytest.mark.data
+def test_download_streaming(local_server, tmp_path):
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url)
+    start = datetime.datetime(2023, 11, 5, 0, 0)
+    end = datetime.datetime(2024, 1, 10, 23, 59)
+
+    # the last shard is slow to list, and its listing must be requested after the first
+    # shard's files are being downloaded
+    listed = threading.Event()
+    first_file_requested = {"value": False}
+    listing_route = __listing_route(local_server, delays={datetime.date(2024, 1, 1): 2.0})
+
+    def route(handler):
+        res = listing_route(handler)
+        if ("2024-01-01" in handler.path):
+            first_file_requested["value"] = any([x["path"] == "/data/%s" % (__filename(start)) for x in local_server.requests])
+            listed.set()
+        return res
+
+    local_server.routes[LISTING_PATH] = route
+    res = rio.data.ucalgary.download(DATASET["name"], start, end, progress_bar_disable=True)
+    assert listed.is_set() is True
+    assert first_file_requested["value"] is True
+    assert res.count == 68
+    assert str(res.filenames[0]).endswith(__filename(start - datetime.timedelta(days=1)))
+    assert str(res.filenames[-1]).endswith(__filename(datetime.datetime(2024, 1, 10)))
+    assert res.total_bytes == 68 * len(FILE_CONTENT)
+    assert len([x for x in local_server.requests if x["path"].startswith("/data/")]) == 68
+
+    # the shard listings can also be passed to download_using_urls() as they complete
+    file_listings = rio.data.ucalgary.iter_urls(DATASET["name"], start, end, shard_size="day", n_parallel=8)
+    res = rio.data.ucalgary.download_using_urls(file_listings, overwrite=True, progress_bar_disable=True)
+    assert res.count == 68
+    assert res.total_bytes == 68 * len(FILE_CONTENT)
+
+    # an empty listing
+    with pytest.raises(ValueError) as e_info:
+        rio.data.ucalgary.download_using_urls(iter([]), progress_bar_disable=True)
+    assert "No file listing" in str(e_info)
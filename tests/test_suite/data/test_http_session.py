@@ -0,0 +1,120 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+import datetime
+import pyucrio
+
+DATASET = {
+    "name": "NORSTAR_RIOMETER_K0_TXT",
+    "short_description": "NORSTAR riometer K0 data",
+    "long_description": "NORSTAR riometer K0 data",
+    "data_tree_url": "https://data.phys.ucalgary.ca/sort_by_project/GO-Canada/GO-Rio/txt",
+    "file_listing_supported": True,
+    "level": "K0",
+    "supported_libraries": ["pyucalgarysrs", "pyucrio"],
+    "file_time_resolution": "1 day",
+}
+FILES = {
+    "/data/2023/11/05/norstar_k0_gill_20231105_v01.txt": b"gill data",
+    "/data/2023/11/05/norstar_k0_chur_20231105_v01.txt": b"chur data, a bit longer",
+}
+
+
+@pytest.fixture(scope="function")
+def pooled_rio(local_server, tmp_path):
+    # set up the API and data server
+    urls = [local_server.url + x for x in FILES.keys()]
+    local_server.add_json("/api/v1/data_distribution/datasets", [DATASET])
+    local_server.add_json(
+        "/api/v1/data_distribution/urls", {
+            "urls": urls,
+            "path_prefix": local_server.url + "/data",
+            "count": len(urls),
+            "dataset": DATASET,
+            "total_bytes": sum([len(x) for x in FILES.values()]),
+        })
+    for path, content in FILES.items():
+        local_server.add_file(path, content)
+
+    # return
+    return pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url, http_pool_size=2)
+
+
+@pytest.mark.data
+def test_http_session_reuse(pooled_rio, local_server):
+    rio = pooled_rio
+    start = datetime.datetime(2023, 11, 5)
+    end = datetime.datetime(2023, 11, 5, 23, 59)
+
+    # a burst of listings uses a single connection
+    for _ in range(0, 5):
+        r = rio.data.ucalgary.get_urls(DATASET["name"], start, end, site_uid="gill")
+        assert r.count == 2
+        assert r.dataset.file_reading_supported is True
+    assert local_server.requests[0]["params"]["site_uid"] == ["gill"]
+    assert local_server.requests[0]["headers"]["user-agent"].startswith("python-pyucrio/")
+    assert local_server.connections == 1
+    stats = rio.http_connection_stats()
+    assert stats == {"pool_size": 2, "requests": 5, "connections_opened": 1, "connections_reused": 4}
+
+    # downloads share the same pool
+    res = rio.data.ucalgary.download(DATASET["name"], start, end, n_parallel=2, progress_bar_disable=True)
+    assert res.count == 2
+    assert res.total_bytes == sum([len(x) for x in FILES.values()])
+    for filename in res.filenames:
+        with open(filename, "rb") as fp:
+            assert fp.read() in FILES.values()
+    assert rio.http_connection_stats()["requests"] == 8
+    assert local_server.connections <= 2
+
+    # existing files are not downloaded again
+    res = rio.data.ucalgary.download_using_urls(r, progress_bar_disable=True)
+    assert res.total_bytes == 0
+    assert rio.http_connection_stats()["requests"] == 8
+
+    # changing the pool size starts a new pool
+    rio.http_pool_size = 4
+    assert rio.http_connection_stats() == {"pool_size": 4, "requests": 0, "connections_opened": 0, "connections_reused": 0}
+    with pytest.raises(pyucrio.PyUCRioInitializationError):
+        rio.http_pool_size = 0
+
+
+@pytest.mark.data
+def test_http_session_errors(pooled_rio, local_server):
+    rio = pooled_rio
+
+    # API errors
+    local_server.add_json("/api/v1/data_distribution/urls", {"detail": "Dataset not found"}, status=404)
+    with pytest.raises(pyucrio.PyUCRioAPIError) as e_info:
+        rio.data.ucalgary.get_urls("SOME_DATASET", datetime.datetime(2023, 11, 5), datetime.datetime(2023, 11, 5))
+    assert "API error code 404: Dataset not found" in str(e_info)
+
+    # a missing file, and a page of HTML instead of a file
+    listing = pyucrio.data.ucalgary.FileListingResponse(
+        urls=[local_server.url + "/data/missing.txt"],
+        path_prefix=local_server.url + "/data",
+        count=1,
+        dataset=rio.data.ucalgary.list_datasets()[0],
+    )
+    with pytest.warns(UserWarning, match="1 of 1 files could not be downloaded"):
+        res = rio.data.ucalgary.download_using_urls(listing, progress_bar_disable=True)
+    assert res.count == 0
+    assert "HTTP error 404" in res.failed[0].error
+    local_server.add_file("/data/missing.txt", b"<html></html>", content_type="text/html")
+    with pytest.warns(UserWarning):
+        res = rio.data.ucalgary.download_using_urls(listing, progress_bar_disable=True)
+    assert "HTML content received" in res.failed[0].error
+    assert os.path.exists(os.path.join(rio.download_output_root_path, DATASET["name"], "missing.txt")) is False
@@ -0,0 +1,127 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import json
+import time
+import threading
+import pytest
+import pyucrio
+from pyucalgarysrs.data import Dataset, Observatory
+from pyucrio.data.ucalgary import _api
+from pyucrio.data.ucalgary._metadata import clear_cache, get_snapshot_filename
+from unittest.mock import patch
+
+DATASETS = [
+    Dataset(
+        name="SWAN_HSR_K0_H5",
+        short_description="SWAN HSR K0 data",
+        long_description="SWAN Hyper Spectral Riometer K0 data",
+        data_tree_url="https://data.phys.ucalgary.ca/sort_by_project/SWAN/hsr/k0",
+        file_listing_supported=True,
+        file_reading_supported=True,
+        level="K0",
+        supported_libraries=["pyucalgarysrs", "pyucrio"],
+        file_time_resolution="1 day",
+    ),
+]
+OBSERVATORIES = [
+    Observatory(uid="gill", full_name="Gillam", geodetic_latitude=56.38, geodetic_longitude=-94.64),
+    Observatory(uid="mean", full_name="Meanook", geodetic_latitude=54.60, geodetic_longitude=-113.35),
+]
+
+
+@pytest.fixture(scope="function")
+def snapshot_rio(tmp_path):
+    clear_cache()
+    yield pyucrio.PyUCRio(download_output_root_path=str(tmp_path))
+    clear_cache()
+
+
+@pytest.mark.data
+def test_metadata_snapshot(snapshot_rio):
+    rio = snapshot_rio
+    with patch.object(_api, "list_datasets", return_value=DATASETS) as mock_datasets:
+        with patch.object(_api, "list_observatories", return_value=OBSERVATORIES) as mock_observatories:
+            # first calls go to the API
+            assert [d.name for d in rio.data.ucalgary.list_datasets()] == ["SWAN_HSR_K0_H5"]
+            assert [o.uid for o in rio.data.ucalgary.list_observatories("swan_hsr")] == ["gill", "mean"]
+            assert mock_datasets.call_count == 1
+            assert mock_observatories.call_count == 1
+
+            # subsequent calls use the snapshot, including filtering
+            assert rio.data.ucalgary.get_dataset("SWAN_HSR_K0_H5").long_description == DATASETS[0].long_description
+            assert len(rio.data.ucalgary.list_datasets(name="swan_hsr")) == 1
+            assert len(rio.data.ucalgary.list_datasets(name="NORSTAR")) == 0
+            observatories = rio.data.ucalgary.list_observatories("swan_hsr", uid="mean")
+            assert [(o.uid, o.geodetic_latitude) for o in observatories] == [("mean", 54.60)]
+            assert mock_datasets.call_count == 1
+            assert mock_observatories.call_count == 1
+
+    # the snapshot is used by a new process (without the in-memory copy), even if the API is unavailable
+    clear_cache()
+    filename = get_snapshot_filename(rio)
+    assert os.path.exists(filename) is True
+    with open(filename, "r") as fp:
+        assert json.load(fp)["api_base_url"] == rio.api_base_url
+    with patch.object(_api, "list_observatories", side_effect=pyucrio.PyUCRioAPIError("unavailable")):
+        assert [o.uid for o in rio.data.ucalgary.list_observatories("swan_hsr")] == ["gill", "mean"]
+
+        # sections that were never retrieved still need the API
+        with pytest.raises(pyucrio.PyUCRioAPIError) as e_info:
+            rio.data.ucalgary.list_observatories("norstar_riometer")
+        assert "unavailable" in str(e_info)
+
+
+@pytest.mark.data
+def test_metadata_snapshot_refresh(snapshot_rio):
+    rio = snapshot_rio
+    with patch.object(_api, "list_datasets", return_value=DATASETS) as mock_datasets:
+        with patch.object(_api, "list_observatories", return_value=OBSERVATORIES) as mock_observatories:
+            filename = rio.data.ucalgary.refresh_metadata_snapshot()
+            assert filename == get_snapshot_filename(rio)
+            assert mock_datasets.call_count == 1
+            assert mock_observatories.call_count == 2
+
+            # refresh in the background
+            threads_before = set(threading.enumerate())
+            rio.data.ucalgary.refresh_metadata_snapshot(background=True)
+            for thread in set(threading.enumerate()) - threads_before:
+                thread.join(5)
+            assert mock_datasets.call_count == 2
+            assert mock_observatories.call_count == 4
+
+    # old sections are refreshed in the background, while still returning the snapshot
+    with open(filename, "r") as fp:
+        snapshot = json.load(fp)
+    snapshot["sections"]["observatories:swan_hsr"]["updated"] = "2020-01-01T00:00:00+00:00"
+    snapshot["sections"]["observatories:swan_hsr"]["items"] = snapshot["sections"]["observatories:swan_hsr"]["items"][0:1]
+    with open(filename, "w") as fp:
+        json.dump(snapshot, fp)
+    clear_cache()
+    api_response_ready = threading.Event()
+
+    def list_observatories(ucrio_obj, instrument_array, uid, timeout):
+        api_response_ready.wait(5)
+        return OBSERVATORIES
+
+    with patch.object(_api, "list_observatories", side_effect=list_observatories) as mock_observatories:
+        assert [o.uid for o in rio.data.ucalgary.list_observatories("swan_hsr")] == ["gill"]
+        api_response_ready.set()
+        for _ in range(0, 100):
+            if (len(rio.data.ucalgary.list_observatories("swan_hsr")) == 2):
+                break
+            time.sleep(0.05)
+        assert mock_observatories.call_count == 1
+        assert [o.uid for o in rio.data.ucalgary.list_observatories("swan_hsr")] == ["gill", "mean"]
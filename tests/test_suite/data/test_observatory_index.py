@@ -0,0 +1,110 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import datetime
+import numpy as np
+import pyucrio
+from pyucalgarysrs.data import Observatory
+from pyucrio.data.ucalgary._observatory_index import clear_cache
+from unittest.mock import patch
+
+OBSERVATORIES = {
+    "norstar_riometer": [
+        Observatory(uid="gill", full_name="Gillam", geodetic_latitude=56.38, geodetic_longitude=-94.64),
+        Observatory(uid="chur", full_name="Churchill", geodetic_latitude=58.76, geodetic_longitude=-94.08),
+        Observatory(uid="daws", full_name="Dawson", geodetic_latitude=64.05, geodetic_longitude=-139.11),
+    ],
+    "swan_hsr": [
+        Observatory(uid="gill", full_name="Gillam", geodetic_latitude=56.38, geodetic_longitude=-94.64),
+        Observatory(uid="mean", full_name="Meanook", geodetic_latitude=54.60, geodetic_longitude=-113.35),
+    ],
+}
+
+
+def __list_observatories(instrument_array, uid=None, timeout=None):
+    return OBSERVATORIES[instrument_array]
+
+
+@pytest.mark.data
+def test_observatory_index(rio, capsys):
+    clear_cache()
+    with patch.object(rio.data.ucalgary, "list_observatories", side_effect=__list_observatories) as mock_list:
+        index = rio.data.ucalgary.observatory_index()
+        assert mock_list.call_count == 2
+
+        # calling again uses the cache
+        assert rio.data.ucalgary.observatory_index() is index
+        assert mock_list.call_count == 2
+
+    assert isinstance(index, pyucrio.data.ucalgary.ObservatoryIndex) is True
+    assert len(index.observatories) == 5
+    assert index.location("chur") == (58.76, -94.08)
+    assert index.location("gill", instrument_array="swan_hsr") == (56.38, -94.64)
+
+    # radius query, ordered by distance
+    lat, lon = index.location("gill")
+    matches = index.query_radius(lat, lon, 500)
+    assert [(m.uid, m.instrument_array) for m in matches] == [("gill", "norstar_riometer"), ("gill", "swan_hsr"), ("chur", "norstar_riometer")]
+    assert matches[0].distance_km == pytest.approx(0.0, abs=1e-3)
+    assert matches[2].distance_km == pytest.approx(266.0, abs=2.0)
+
+    # nearest HSR to a NORSTAR site
+    matches = index.query_nearest(*index.location("daws"), k=1, instrument_array="swan_hsr")
+    assert [m.uid for m in matches] == ["mean"]
+    assert len(index.query_nearest(lat, lon, k=10, instrument_array="swan_hsr")) == 2
+
+    # vectorized queries
+    results = index.query_nearest(np.array([56.0, 64.0]), np.array([-95.0, -139.0]), k=2, instrument_array="norstar_riometer")
+    assert [[m.uid for m in x] for x in results] == [["gill", "chur"], ["daws", "chur"]]
+    results = index.query_radius([56.0, 0.0], [-95.0, 0.0], 100)
+    assert [len(x) for x in results] == [2, 0]
+
+    # check __str__, __repr__, and pretty_print
+    assert "ObservatoryIndex(" in str(index)
+    assert "ObservatoryMatch(" in str(matches[0])
+    index.pretty_print()
+    matches[0].pretty_print()
+    assert capsys.readouterr().out != ""
+
+
+@pytest.mark.data
+def test_observatory_index_aacgm(rio):
+    clear_cache()
+    timestamp = datetime.datetime(2024, 2, 3, 12, 30)
+    with patch.object(rio.data.ucalgary, "list_observatories", side_effect=__list_observatories):
+        index = rio.data.ucalgary.observatory_index(instrument_array="swan_hsr", coordinates="aacgm", timestamp=timestamp)
+
+    assert index.coordinates == "aacgm"
+    assert index.timestamp == datetime.datetime(2024, 2, 3)
+    assert index.instrument_array_list == ["swan_hsr", "swan_hsr"]
+    lat, lon = index.location("gill")
+    assert 60 < lat < 70
+    assert index.query_nearest(lat, lon)[0].uid == "gill"
+
+
+@pytest.mark.data
+def test_observatory_index_errors(rio):
+    with pytest.raises(ValueError) as e_info:
+        rio.data.ucalgary.observatory_index(coordinates="some_coordinates")
+    assert "coordinates" in str(e_info)
+
+    with patch.object(rio.data.ucalgary, "list_observatories", side_effect=__list_observatories):
+        index = rio.data.ucalgary.observatory_index(use_cache=False)
+    with pytest.raises(ValueError) as e_info:
+        index.location("some_site")
+    assert "was not found" in str(e_info)
+    with pytest.raises(ValueError) as e_info:
+        index.query_nearest(0.0, 0.0, k=0)
+    assert "at least 1" in str(e_info)
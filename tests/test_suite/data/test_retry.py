@@ -0,0 +1,169 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import json
+import time
+import pytest
+import datetime
+import pyucrio
+from pyucrio.data.ucalgary import RetryPolicy
+from pyucalgarysrs.data import Dataset, FileListingResponse
+
+LISTING_PATH = "/api/v1/data_distribution/urls"
+DATASET = {
+    "name": "NORSTAR_RIOMETER_K0_TXT",
+    "short_description": "NORSTAR riometer K0 data",
+    "long_description": "NORSTAR riometer K0 data",
+    "data_tree_url": "https://data.phys.ucalgary.ca/sort_by_project/GO-Canada/GO-Rio/txt",
+    "file_listing_supported": True,
+    "level": "K0",
+    "supported_libraries": ["pyucalgarysrs", "pyucrio"],
+    "file_time_resolution": "1 day",
+}
+
+
+def __listing_route(local_server, statuses, delays=None):
+    """
+    A file listing route that responds with the given status codes (and delays) in turn, and then successfully.
+    """
+    responses = {"n": 0}
+
+    def route(handler):
+        i = responses["n"]
+        responses["n"] += 1
+        if (delays is not None and i < len(delays)):
+            time.sleep(delays[i])
+        if (i < len(statuses)):
+            return statuses[i], {"Content-Type": "application/json"}, json.dumps({"detail": "Service unavailable"}).encode()
+        body = {"urls": [], "path_prefix": local_server.url + "/data", "count": 0, "dataset": DATASET, "total_bytes": 0}
+        return 200, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+    return route
+
+
+def __get_urls(rio):
+    return rio.data.ucalgary.get_urls(DATASET["name"], datetime.datetime(2023, 11, 5), datetime.datetime(2023, 11, 5, 23, 59))
+
+
+@pytest.mark.data
+def test_retry_policy(capsys):
+    policy = RetryPolicy(backoff_initial=0.5, backoff_max=3.0, jitter=False)
+    assert [policy.backoff_delay(x) for x in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+    policy.jitter = True
+    for _ in range(0, 20):
+        assert 0.0 <= policy.backoff_delay(3) <= 2.0
+
+    # check __str__, __repr__, and pretty_print
+    assert "RetryPolicy(max_attempts=3" in str(policy)
+    policy.pretty_print()
+    assert capsys.readouterr().out != ""
+
+    # check the PyUCRio object's policy
+    rio = pyucrio.PyUCRio(retry_policy=RetryPolicy(max_attempts=5))
+    assert rio.retry_policy.max_attempts == 5
+    rio.retry_policy = None
+    assert rio.retry_policy.max_attempts == 3
+    with pytest.raises(pyucrio.PyUCRioInitializationError):
+        rio.retry_policy = RetryPolicy(max_attempts=0)
+
+
+@pytest.mark.data
+def test_retry_listing(local_server):
+    rio = pyucrio.PyUCRio(api_base_url=local_server.url, retry_policy=RetryPolicy(backoff_initial=0.01))
+
+    # transient errors are retried
+    local_server.routes[LISTING_PATH] = __listing_route(local_server, [503, 502])
+    assert __get_urls(rio).count == 0
+    assert len(local_server.requests) == 3
+
+    # until there are no attempts left
+    local_server.routes[LISTING_PATH] = __listing_route(local_server, [503, 503, 503])
+    with pytest.raises(pyucrio.PyUCRioAPIError) as e_info:
+        __get_urls(rio)
+    assert "API error code 503: Service unavailable" in str(e_info)
+    assert len(local_server.requests) == 6
+
+    # other errors are not retried
+    local_server.routes[LISTING_PATH] = __listing_route(local_server, [404])
+    with pytest.raises(pyucrio.PyUCRioAPIError):
+        __get_urls(rio)
+    assert len(local_server.requests) == 7
+
+    # no retries that would start after the deadline
+    rio.retry_policy = RetryPolicy(backoff_initial=5.0, jitter=False, deadline=1.0)
+    local_server.routes[LISTING_PATH] = __listing_route(local_server, [503])
+    with pytest.raises(pyucrio.PyUCRioAPIError):
+        __get_urls(rio)
+    assert len(local_server.requests) == 8
+
+
+@pytest.mark.data
+def test_retry_hedged_listing(local_server):
+    rio = pyucrio.PyUCRio(api_base_url=local_server.url, retry_policy=RetryPolicy(hedge_after=0.1))
+
+    # the slow first response is not waited for
+    local_server.routes[LISTING_PATH] = __listing_route(local_server, [], delays=[2.0])
+    start = time.perf_counter()
+    assert __get_urls(rio).count == 0
+    assert time.perf_counter() - start < 1.5
+    assert len(local_server.requests) == 2
+
+    # fast responses are not hedged
+    local_server.routes[LISTING_PATH] = __listing_route(local_server, [])
+    __get_urls(rio)
+    assert len(local_server.requests) == 3
+
+
+@pytest.mark.data
+def test_retry_downloads(local_server, tmp_path):
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path), api_base_url=local_server.url, retry_policy=RetryPolicy(backoff_initial=0.01))
+    content = b"0123456789" * 20000
+    responses = {"n": 0}
+
+    def flaky_route(handler):
+        responses["n"] += 1
+        if (responses["n"] == 1):
+            return 503, {}, b""
+        return 200, {"Content-Type": "text/plain"}, content
+
+    local_server.routes["/data/flaky.txt"] = flaky_route
+    local_server.routes["/data/broken.txt"] = lambda handler: (500, {}, b"")
+    local_server.add_file("/data/truncated.txt", content, truncate=150000)
+    listing = FileListingResponse(
+        urls=[local_server.url + "/data/%s.txt" % (x) for x in ["flaky", "broken", "truncated"]],
+        path_prefix=local_server.url + "/data",
+        count=3,
+        dataset=Dataset(**DATASET, file_reading_supported=True),
+        total_bytes=len(content) * 3,
+    )
+
+    # failures don't abort the other downloads
+    with pytest.warns(UserWarning, match="1 of 3 files could not be downloaded"):
+        res = rio.data.ucalgary.download_using_urls(listing, n_parallel=3)
+    assert sorted([os.path.basename(x) for x in res.filenames]) == ["flaky.txt", "truncated.txt"]
+    assert res.count == 2
+    assert len(res.failed) == 1
+    assert res.failed[0].url.endswith("/data/broken.txt")
+    assert res.failed[0].attempts == 3
+    assert "HTTP error 500" in res.failed[0].error
+    assert "failed=[1 failures]" in str(res)
+
+    # interrupted downloads were resumed by the retries
+    for filename in res.filenames:
+        with open(filename, "rb") as fp:
+            assert fp.read() == content
+    truncated_requests = [x for x in local_server.requests if x["path"] == "/data/truncated.txt"]
+    assert len(truncated_requests) == 2
+    assert truncated_requests[1]["headers"]["range"].startswith("bytes=")
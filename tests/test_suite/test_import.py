@@ -0,0 +1,62 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import json
+import pytest
+import subprocess
+
+# dependencies that should only be loaded when first used
+HEAVY_MODULES = ["matplotlib.pyplot", "cartopy", "pyproj", "shapely", "aacgmv2"]
+
+# import time budget for pyucrio itself, in seconds (not including pyucalgarysrs)
+IMPORT_TIME_BUDGET = 0.25
+
+
+def __run_fresh_interpreter(code):
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.top_level
+def test_import_is_lazy():
+    code = "; ".join([
+        "import sys, json",
+        "import pyucrio",
+        "rio = pyucrio.PyUCRio()",
+        "rio.tools",
+        "before = [m for m in %s if m in sys.modules]" % (HEAVY_MODULES),
+        "rio.tools.site_map",
+        "after = [m for m in %s if m in sys.modules]" % (HEAVY_MODULES),
+        "print(json.dumps({'before': before, 'after': after}))",
+    ])
+    result = __run_fresh_interpreter(code)
+    assert result["before"] == []
+    assert "cartopy" in result["after"]
+
+
+@pytest.mark.top_level
+def test_import_time():
+    # NOTE: we take the best of several runs, to reduce the influence of a busy machine
+    code = "; ".join([
+        "import time, json",
+        "import pyucalgarysrs",
+        "start = time.perf_counter()",
+        "import pyucrio",
+        "rio = pyucrio.PyUCRio()",
+        "rio.tools",
+        "print(json.dumps({'seconds': time.perf_counter() - start}))",
+    ])
+    best = min([__run_fresh_interpreter(code)["seconds"] for _ in range(0, 3)])
+    assert best < IMPORT_TIME_BUDGET
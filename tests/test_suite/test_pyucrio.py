@@ -19,8 +19,14 @@ import string
 import pytest
 import platform
 import datetime
+import time
+import pyucalgarysrs
 import pyucrio
 from pathlib import Path
+from unittest.mock import patch
+
+# startup time budget for a new PyUCRio object, in seconds
+SESSION_STARTUP_TIME_BUDGET = 0.005
 
 
 @pytest.mark.top_level
@@ -83,6 +89,62 @@ def test_bad_paths_noparams(rio):
         assert "Error during output path creation" in str(e_info)
 
 
+@pytest.mark.top_level
+def test_lazy_session(tmp_path):
+    # nothing is created until first used
+    with patch("pyucalgarysrs.PyUCalgarySRS", wraps=pyucalgarysrs.PyUCalgarySRS) as mock_srs:
+        rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path / "data"))
+        rio.api_base_url = "https://testing-url.com"
+        rio.api_timeout = 5
+        rio.progress_bar_backend = "standard"
+        assert mock_srs.call_count == 0
+        assert os.path.exists(tmp_path / "data") is False
+
+        # settings made before first use are applied when it is created
+        assert rio.srs_obj.api_base_url == "https://testing-url.com"
+        assert rio.srs_obj.api_timeout == 5
+        assert rio.srs_obj.progress_bar_backend == "standard"
+        assert rio.srs_obj.download_output_root_path == str(tmp_path / "data")
+        assert rio.data is rio.data
+        assert rio.tools is rio.tools
+        assert mock_srs.call_count == 1
+
+        # settings made afterwards are applied directly
+        rio.api_timeout = 7
+        assert rio.srs_obj.api_timeout == 7
+        assert mock_srs.call_count == 1
+
+
+@pytest.mark.top_level
+def test_session_startup_nothing_created():
+    # creating a session doesn't create the PyUCalgarySRS object, HTTP session, or sub-modules
+    with patch("pyucalgarysrs.PyUCalgarySRS") as mock_srs, \
+            patch("pyucrio.pyucrio.HTTPSession") as mock_http_session, \
+            patch("pyucrio.pyucrio.DataManager") as mock_data, \
+            patch("pyucrio.pyucrio.ToolsManager") as mock_tools:
+        rio = pyucrio.PyUCRio()
+        assert mock_srs.call_count == 0
+        assert mock_http_session.call_count == 0
+        assert mock_data.call_count == 0
+        assert mock_tools.call_count == 0
+
+        # the HTTP session is created once, when first used
+        assert rio.http_session is rio.http_session
+        assert mock_http_session.call_count == 1
+
+
+@pytest.mark.top_level
+def test_session_startup_time():
+    # NOTE: we take the best of several runs, to reduce the influence of a busy machine
+    pyucrio.PyUCRio()
+    durations = []
+    for _ in range(0, 5):
+        start = time.perf_counter()
+        pyucrio.PyUCRio()
+        durations.append(time.perf_counter() - start)
+    assert min(durations) < SESSION_STARTUP_TIME_BUDGET
+
+
 @pytest.mark.top_level
 def test_api_base_url(rio):
     # set flag
@@ -0,0 +1,154 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import pytest
+import datetime
+import matplotlib
+import numpy as np
+from PIL import Image
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from unittest.mock import patch
+from pyucrio.tools.classes._animation import FFMpegFrameWriter, GifFrameWriter
+
+MAP_EXTENT = [-115, -85, 45, 65]
+
+
+@pytest.mark.tools
+def test_animate_gif(plot_cleanup, tmp_path, synthetic_site_map):
+    n_frames = 6
+    values = np.linspace(0, 3, n_frames)[:, np.newaxis] * np.array([1.0, 0.5, 0.2, 0.0])[np.newaxis, :]
+    timestamps = [datetime.datetime(2023, 11, 5, 6, 0) + datetime.timedelta(minutes=i) for i in range(0, n_frames)]
+    output_filename = str(tmp_path / "animation.gif")
+
+    # the map background is only drawn once
+    with patch("matplotlib.backends.backend_agg.FigureCanvasAgg.draw", autospec=True, side_effect=FigureCanvasAgg.draw) as mock_draw:
+        synthetic_site_map.animate(MAP_EXTENT, values, output_filename, timestamps=timestamps, fps=5, figsize=(4, 4))
+        assert mock_draw.call_count == 1
+
+    assert os.path.exists(output_filename)
+    with Image.open(output_filename) as img:
+        assert img.n_frames == n_frames
+
+
+@pytest.mark.tools
+def test_animate_interpolate(plot_cleanup, tmp_path, synthetic_site_map):
+    values = {
+        "gill": np.array([1.0, 2.0, np.nan]),
+        "chur": np.array([2.0, 3.0, 1.0]),
+        "rabb": np.array([0.5, 1.0, 2.0]),
+    }
+    output_filename = str(tmp_path / "animation.gif")
+    synthetic_site_map.animate(MAP_EXTENT,
+                               values,
+                               output_filename,
+                               interpolate=True,
+                               grid_size=(20, 20),
+                               color_range=(0, 3),
+                               label=False,
+                               colorbar=False,
+                               figsize=(4, 4))
+    with Image.open(output_filename) as img:
+        assert img.n_frames == 3
+
+
+@pytest.mark.tools
+def test_animate_bad_args(plot_cleanup, tmp_path, synthetic_site_map):
+    output_filename = str(tmp_path / "animation.gif")
+
+    with pytest.raises(ValueError) as e_info:
+        synthetic_site_map.animate(MAP_EXTENT, np.zeros((5, 2)), output_filename)
+    assert "n_frames, n_sites" in str(e_info)
+
+    with pytest.raises(ValueError) as e_info:
+        synthetic_site_map.animate(MAP_EXTENT, np.zeros((5, 4)), output_filename, timestamps=[datetime.datetime(2023, 11, 5)])
+    assert "does not match the number of frames" in str(e_info)
+
+
+def __fake_ffmpeg(tmp_path, script):
+    """
+    Create a fake ffmpeg executable, running the given Python code.
+    """
+    filename = str(tmp_path / "ffmpeg")
+    with open(filename, "w") as fp:
+        fp.write("#!%s\nimport sys\n%s\n" % (sys.executable, script))
+    os.chmod(filename, 0o755)
+    return filename
+
+
+@pytest.mark.tools
+@pytest.mark.skipif(os.name != "posix", reason="uses a fake ffmpeg script")
+def test_ffmpeg_writer_noisy(tmp_path):
+    # ffmpeg writing a lot of messages doesn't block the writing of frames
+    ffmpeg_path = __fake_ffmpeg(tmp_path, "sys.stderr.write('x' * 1024 * 1024)\nsys.stderr.flush()\nsys.stdin.buffer.read()")
+    with matplotlib.rc_context({"animation.ffmpeg_path": ffmpeg_path}):
+        writer = FFMpegFrameWriter(str(tmp_path / "animation.mp4"), 5, 100, 100)
+        for _ in range(0, 10):
+            writer.write(np.zeros((100, 100, 4), dtype=np.uint8))
+        writer.close()
+
+
+@pytest.mark.tools
+@pytest.mark.skipif(os.name != "posix", reason="uses a fake ffmpeg script")
+def test_ffmpeg_writer_errors(tmp_path):
+    ffmpeg_path = __fake_ffmpeg(tmp_path, "sys.stderr.write('some ffmpeg error')\nsys.exit(1)")
+    frame = np.zeros((1000, 1000, 4), dtype=np.uint8)
+    with matplotlib.rc_context({"animation.ffmpeg_path": ffmpeg_path}):
+        # errors are reported when writing frames
+        writer = FFMpegFrameWriter(str(tmp_path / "animation.mp4"), 5, 1000, 1000)
+        with pytest.raises(ValueError) as e_info:
+            for _ in range(0, 10):
+                writer.write(frame)
+        assert "some ffmpeg error" in str(e_info)
+
+        # and when closing
+        writer = FFMpegFrameWriter(str(tmp_path / "animation.mp4"), 5, 1000, 1000)
+        with pytest.raises(ValueError) as e_info:
+            writer.close()
+        assert "some ffmpeg error" in str(e_info)
+
+        # unless the writing of frames was aborted by another error
+        writer = FFMpegFrameWriter(str(tmp_path / "animation.mp4"), 5, 1000, 1000)
+        with pytest.raises(KeyError):
+            try:
+                raise KeyError("some other error")
+            finally:
+                writer.close(aborted=True)
+
+
+@pytest.mark.tools
+@pytest.mark.skipif(os.name != "posix", reason="uses a fake ffmpeg script")
+def test_animate_ffmpeg_error(plot_cleanup, tmp_path, synthetic_site_map):
+    # ffmpeg failing after all frames are written is reported, even when animating while the
+    # caller is handling another exception
+    ffmpeg_path = __fake_ffmpeg(tmp_path, "sys.stdin.buffer.read()\nsys.stderr.write('some ffmpeg error')\nsys.exit(1)")
+    values = np.zeros((3, 4))
+    with matplotlib.rc_context({"animation.ffmpeg_path": ffmpeg_path}):
+        try:
+            raise KeyError("some other error")
+        except KeyError:
+            with pytest.raises(ValueError) as e_info:
+                synthetic_site_map.animate(MAP_EXTENT, values, str(tmp_path / "animation.mp4"), figsize=(4, 4))
+            assert "some ffmpeg error" in str(e_info)
+
+
+@pytest.mark.tools
+def test_gif_writer_aborted(tmp_path):
+    # an aborted GIF isn't written
+    output_filename = str(tmp_path / "animation.gif")
+    writer = GifFrameWriter(output_filename, 5)
+    writer.write(np.zeros((10, 10, 4), dtype=np.uint8))
+    writer.close(aborted=True)
+    assert os.path.exists(output_filename) is False
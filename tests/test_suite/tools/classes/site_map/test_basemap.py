@@ -0,0 +1,86 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import glob
+import pytest
+import shapely
+import numpy as np
+from matplotlib import pyplot as plt
+from unittest.mock import patch
+from pyucrio.tools.classes import _basemap
+
+MAP_EXTENT = [-115, -85, 45, 65]
+
+
+@pytest.mark.tools
+def test_basemap_cached(plot_cleanup, synthetic_site_map):
+    _basemap.clear_cache()
+    project_feature = getattr(_basemap, "__project_feature")
+    with patch.object(_basemap, "__project_feature", wraps=project_feature) as mock_project:
+        fig, ax = synthetic_site_map.plot(MAP_EXTENT, returnfig=True)
+        plt.close(fig)
+        assert mock_project.call_count == len(_basemap.FEATURES)
+
+        # same region, no re-projection
+        fig, ax = synthetic_site_map.plot(MAP_EXTENT, returnfig=True, ocean_color="white", borders_disable=True)
+        plt.close(fig)
+        assert mock_project.call_count == len(_basemap.FEATURES)
+
+        # different region
+        fig, ax = synthetic_site_map.plot([-110, -90, 50, 60], returnfig=True)
+        plt.close(fig)
+        assert mock_project.call_count == 2 * len(_basemap.FEATURES)
+
+
+@pytest.mark.tools
+def test_basemap_disk_cache(plot_cleanup, tmp_path, rio, synthetic_site_map):
+    rio.download_output_root_path = str(tmp_path)
+    _basemap.clear_cache()
+    fig, ax = synthetic_site_map.plot(MAP_EXTENT, basemap_disk_cache=True, returnfig=True)
+    plt.close(fig)
+    cache_files = glob.glob(os.path.join(str(tmp_path), "basemap_cache", "*.npz"))
+    assert len(cache_files) == 1
+
+    # a new session re-uses the file on disk
+    _basemap.clear_cache()
+    with patch.object(_basemap, "__project_feature") as mock_project:
+        fig, ax = synthetic_site_map.plot(MAP_EXTENT, basemap_disk_cache=True, returnfig=True)
+        plt.close(fig)
+        assert mock_project.call_count == 0
+
+
+@pytest.mark.tools
+def test_basemap_disk_cache_format(tmp_path):
+    geometries = {
+        "ocean": [shapely.box(0, 0, 1, 1), shapely.Point(1, 2)],
+        "land": [],
+        "borders": [shapely.LineString([(0, 0), (1, 1)])],
+    }
+    cache_filename = os.path.join(str(tmp_path), "basemap.npz")
+    getattr(_basemap, "__write_disk_cache")(cache_filename, geometries)
+
+    # the file holds plain arrays, which are read back without pickle
+    with np.load(cache_filename, allow_pickle=False) as npz:
+        assert sorted(npz.keys()) == sorted(["%s_%s" % (name, x) for name in _basemap.FEATURES for x in ["wkb", "offsets"]])
+    read_geometries = getattr(_basemap, "__read_disk_cache")(cache_filename)
+    for name, geometry_list in geometries.items():
+        assert len(read_geometries[name]) == len(geometry_list)
+        for a, b in zip(geometry_list, read_geometries[name], strict=True):
+            assert a.equals(b) is True
+
+    # corrupt files are ignored
+    with open(cache_filename, "wb") as fp:
+        fp.write(b"not a cache file")
+    assert getattr(_basemap, "__read_disk_cache")(cache_filename) is None
@@ -0,0 +1,141 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import glob
+import pytest
+import pyproj
+import aacgmv2
+import datetime
+import cartopy.crs
+import numpy as np
+from matplotlib import pyplot as plt
+from matplotlib.collections import LineCollection
+from unittest.mock import patch
+from pyucrio.tools.classes import _aacgm
+
+MAP_EXTENT = [-115, -85, 45, 65]
+
+
+@pytest.mark.tools
+def test_contour_data_layout(synthetic_site_map):
+    synthetic_site_map.add_geo_contours(lats=[60.0, 60.0, 60.0], lons=[-130.0, -125.0, -120.0], constant_lats=[50.0, 55.0], constant_lons=[-100.0])
+    synthetic_site_map.add_mag_contours(datetime.datetime(2023, 11, 5), constant_lats=[65.0], color="red", linestyle="--")
+
+    contour_data = synthetic_site_map.contour_data
+    n_contours = 5
+    assert contour_data["offsets"].shape == (n_contours + 1, )
+    assert contour_data["offsets"][0] == 0
+    assert contour_data["offsets"][-1] == contour_data["coords"].shape[0]
+    assert contour_data["coords"].shape[1] == 2
+    assert contour_data["offsets"][1] == 3
+    assert contour_data["color"] == ["black"] * 4 + ["red"]
+    assert contour_data["linestyle"] == ["solid"] * 4 + ["--"]
+    assert contour_data["linewidth"].shape == (n_contours, )
+    assert contour_data["zorder"].shape == (n_contours, )
+
+
+@pytest.mark.tools
+def test_contours_grouped_rendering(plot_cleanup, synthetic_site_map):
+    synthetic_site_map.add_geo_contours(constant_lats=np.arange(0, 90, 5), constant_lons=np.arange(-180, 180, 10))
+    synthetic_site_map.add_geo_contours(constant_lats=[60.0], color="red", marker="o", bring_to_front=True)
+
+    fig, ax = synthetic_site_map.plot(MAP_EXTENT, returnfig=True)
+    line_collections = [x for x in ax.collections if isinstance(x, LineCollection)]
+    assert len(line_collections) == 2
+    assert sorted([len(x.get_segments()) for x in line_collections]) == [1, 54]
+
+    # markers are drawn as a single line object
+    assert len(ax.lines) == 1
+    plt.close(fig)
+
+
+@pytest.mark.tools
+def test_contours_adaptive_sampling(synthetic_site_map):
+    timestamp = datetime.datetime(2023, 11, 5)
+    with patch("aacgmv2.convert_latlon_arr", wraps=aacgmv2.convert_latlon_arr) as mock_convert:
+        synthetic_site_map.add_mag_contours(timestamp, constant_lats=[60.0, 65.0], constant_lons=[-30.0], map_extent=MAP_EXTENT)
+        n_converted = sum([len(np.atleast_1d(x.args[0])) for x in mock_convert.call_args_list])
+    synthetic_site_map.add_geo_contours(constant_lats=[50.0, 55.0, 60.0], constant_lons=[-100.0, -90.0], map_extent=MAP_EXTENT)
+
+    # far fewer points than sampling the full globe at the finest step (1801 points per line)
+    assert n_converted < 3 * 1801 / 5
+    assert synthetic_site_map.contour_data["coords"].shape[0] < 8 * 1801 / 10
+
+    # the sampled points are on the contour
+    transformer = pyproj.Transformer.from_crs(pyproj.CRS.from_user_input(cartopy.crs.Geodetic()),
+                                              pyproj.CRS.from_user_input(synthetic_site_map.cartopy_projection),
+                                              always_xy=True)
+    offsets = synthetic_site_map.contour_data["offsets"]
+    lat_50 = synthetic_site_map.contour_data["coords"][offsets[3]:offsets[4]]
+    lons, lats = transformer.transform(lat_50[:, 0], lat_50[:, 1], direction="INVERSE")
+    np.testing.assert_allclose(lats[np.isfinite(lats)], 50.0, atol=1e-6)
+
+
+@pytest.mark.tools
+def test_contours_outside_extent(plot_cleanup, synthetic_site_map):
+    # a line of constant latitude that isn't visible on the map
+    synthetic_site_map.add_geo_contours(constant_lats=[-60.0], map_extent=MAP_EXTENT)
+    assert synthetic_site_map.contour_data["offsets"].tolist() == [0, 0]
+
+    fig, ax = synthetic_site_map.plot(MAP_EXTENT, returnfig=True)
+    plt.close(fig)
+
+
+@pytest.mark.tools
+def test_mag_contours_memoized(synthetic_site_map):
+    _aacgm.clear_cache()
+    with patch("aacgmv2.convert_latlon_arr", wraps=aacgmv2.convert_latlon_arr) as mock_convert:
+        synthetic_site_map.add_mag_contours(datetime.datetime(2023, 11, 5, 6, 0), constant_lats=[55.0, 60.0, 65.0, 70.0], map_extent=MAP_EXTENT)
+
+        # all lines are converted together, once per refinement level
+        assert 0 < mock_convert.call_count <= 5
+        n_calls = mock_convert.call_count
+
+        # same day, lines, and sampling
+        synthetic_site_map.add_mag_contours(datetime.datetime(2023, 11, 5, 18, 0), constant_lats=[60.0, 65.0], map_extent=MAP_EXTENT)
+        assert mock_convert.call_count == n_calls
+
+        # different day
+        synthetic_site_map.add_mag_contours(datetime.datetime(2023, 11, 6, 6, 0), constant_lats=[60.0, 65.0], map_extent=MAP_EXTENT)
+        assert mock_convert.call_count > n_calls
+
+    # cached contours are identical
+    offsets = synthetic_site_map.contour_data["offsets"]
+    coords = synthetic_site_map.contour_data["coords"]
+    np.testing.assert_array_equal(coords[offsets[1]:offsets[2]], coords[offsets[4]:offsets[5]])
+
+
+@pytest.mark.tools
+def test_mag_contours_disk_cache(tmp_path, rio, synthetic_site_map):
+    rio.download_output_root_path = str(tmp_path)
+    _aacgm.clear_cache()
+    synthetic_site_map.add_mag_contours(datetime.datetime(2023, 11, 5), constant_lats=[60.0], constant_lons=[-30.0], aacgm_disk_cache=True)
+    assert len(glob.glob(os.path.join(str(tmp_path), "aacgm_cache", "*.npz"))) == 2
+
+    # a new session re-uses the files on disk
+    _aacgm.clear_cache()
+    with patch("aacgmv2.convert_latlon_arr") as mock_convert:
+        synthetic_site_map.add_mag_contours(datetime.datetime(2023, 11, 5), constant_lats=[60.0], constant_lons=[-30.0], aacgm_disk_cache=True)
+        assert mock_convert.call_count == 0
+
+
+@pytest.mark.tools
+def test_contours_transformer_reused(synthetic_site_map):
+    synthetic_site_map.cartopy_projection = cartopy.crs.NearsidePerspective(central_longitude=-101.5, central_latitude=56.5)
+    with patch("pyproj.Transformer.from_crs", wraps=pyproj.Transformer.from_crs) as mock_from_crs:
+        synthetic_site_map.add_geo_contours(constant_lats=[55.0])
+        synthetic_site_map.add_geo_contours(constant_lons=[-100.0])
+        synthetic_site_map.add_mag_contours(datetime.datetime(2023, 11, 5), constant_lats=[65.0])
+        assert mock_from_crs.call_count == 1
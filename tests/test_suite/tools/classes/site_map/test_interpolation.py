@@ -0,0 +1,128 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import numpy as np
+import cartopy.crs
+from matplotlib import pyplot as plt
+from unittest.mock import patch
+from pyucrio.tools.classes import _interpolation
+
+MAP_EXTENT = [-115, -85, 45, 65]
+
+
+@pytest.mark.tools
+@pytest.mark.parametrize("method", ["idw", "rbf"])
+def test_interpolate(synthetic_site_map, method):
+    _interpolation.clear_cache()
+    values = {"gill": 1.0, "chur": 2.0, "rabb": 3.0, "pina": 4.0}
+
+    grid_x, grid_y, grid = synthetic_site_map.interpolate(values, MAP_EXTENT, grid_size=(50, 40), method=method)
+    assert grid_x.shape == (50, )
+    assert grid_y.shape == (40, )
+    assert grid.shape == (40, 50)
+
+    # inverse distance weighting never goes outside the range of the inputs
+    assert np.all(np.isfinite(grid))
+    if (method == "idw"):
+        assert np.nanmin(grid) >= 1.0 - 1e-6
+        assert np.nanmax(grid) <= 4.0 + 1e-6
+
+
+@pytest.mark.tools
+def test_interpolate_constant(synthetic_site_map):
+    _, _, grid = synthetic_site_map.interpolate({"gill": 2.5, "chur": 2.5, "rabb": 2.5}, MAP_EXTENT, grid_size=(20, 20))
+    np.testing.assert_allclose(grid, 2.5)
+
+
+@pytest.mark.tools
+def test_interpolate_weights_cached(synthetic_site_map):
+    _interpolation.clear_cache()
+    with patch.object(_interpolation, "__compute_weights", wraps=getattr(_interpolation, "__compute_weights")) as mock_compute:
+        synthetic_site_map.interpolate({"gill": 1.0, "chur": 2.0}, MAP_EXTENT, grid_size=(20, 20))
+        synthetic_site_map.interpolate({"gill": 5.0, "chur": 6.0}, MAP_EXTENT, grid_size=(20, 20))
+        assert mock_compute.call_count == 1
+        synthetic_site_map.interpolate({"gill": 5.0, "chur": 6.0}, MAP_EXTENT, grid_size=(30, 20))
+        assert mock_compute.call_count == 2
+
+
+@pytest.mark.tools
+def test_interpolate_many_frames(synthetic_site_map):
+    values = np.array([[1.0, 2.0, 3.0, 4.0], [2.0, 4.0, 6.0, 8.0], [0.0, 0.0, 0.0, 0.0]])
+    _, _, grid = synthetic_site_map.interpolate(values, MAP_EXTENT, grid_size=(20, 10))
+    assert grid.shape == (3, 10, 20)
+    np.testing.assert_allclose(grid[1], grid[0] * 2.0)
+    np.testing.assert_allclose(grid[2], 0.0)
+
+    # a single frame matches the batched result
+    _, _, single = synthetic_site_map.interpolate(values[0], MAP_EXTENT, grid_size=(20, 10))
+    np.testing.assert_allclose(single, grid[0])
+
+
+@pytest.mark.tools
+def test_interpolate_max_distance(synthetic_site_map):
+    _, _, grid = synthetic_site_map.interpolate({"gill": 1.0, "chur": 2.0}, MAP_EXTENT, grid_size=(30, 30))
+    _, _, limited = synthetic_site_map.interpolate({"gill": 1.0, "chur": 2.0}, MAP_EXTENT, grid_size=(30, 30), max_distance_km=300)
+    assert np.count_nonzero(np.isnan(limited)) > np.count_nonzero(np.isnan(grid))
+
+
+@pytest.mark.tools
+def test_interpolate_bad_args(synthetic_site_map):
+    with pytest.raises(ValueError) as e_info:
+        synthetic_site_map.interpolate({"gill": 1.0, "chur": 2.0}, MAP_EXTENT, method="cubic")
+    assert "not supported" in str(e_info)
+
+    with pytest.raises(ValueError) as e_info:
+        synthetic_site_map.interpolate({"gill": 1.0, "fsmi": 2.0}, MAP_EXTENT)
+    assert "not included" in str(e_info)
+
+    with pytest.raises(ValueError) as e_info:
+        synthetic_site_map.interpolate(np.array([1.0, 2.0]), MAP_EXTENT)
+    assert "does not match" in str(e_info)
+
+    with pytest.raises(ValueError) as e_info:
+        synthetic_site_map.interpolate({"gill": 1.0}, MAP_EXTENT, method="rbf")
+    assert "At least two sites" in str(e_info)
+
+
+@pytest.mark.tools
+def test_add_interpolation_plot(plot_cleanup, synthetic_site_map):
+    synthetic_site_map.add_interpolation({"gill": 1.0, "chur": 2.0, "rabb": 3.0}, MAP_EXTENT, grid_size=(30, 30), color_range=(0, 3))
+    assert synthetic_site_map.interpolation_data is not None
+    assert synthetic_site_map.interpolation_data["grid"].shape == (30, 30)
+
+    fig, ax = synthetic_site_map.plot(MAP_EXTENT, returnfig=True)
+    assert len(ax.collections) > 0
+    assert len(fig.axes) == 2  # includes the colorbar
+    plt.close(fig)
+
+
+@pytest.mark.tools
+def test_interpolate_unprojectable_site():
+    # a site on the far side of the globe can't be projected
+    projection = cartopy.crs.NearsidePerspective(central_longitude=-100.0, central_latitude=55.0)
+    with pytest.raises(ValueError) as e_info:
+        _interpolation.get_interpolation_weights([56.38, -50.0], [-94.64, 80.0], projection, MAP_EXTENT, (20, 20), "idw", 2.0)
+    assert "not visible" in str(e_info)
+
+
+@pytest.mark.tools
+def test_interpolate_max_distance_degrees():
+    # the distance to the nearest site is in km, even in a projection with units of degrees
+    _interpolation.clear_cache()
+    grid_x, grid_y, _, _, nearest_distance = _interpolation.get_interpolation_weights([50.0], [-100.0], cartopy.crs.PlateCarree(),
+                                                                                      [-110, -90, 45, 55], (21, 11), "idw", 2.0)
+    nearest_distance = nearest_distance.reshape((len(grid_y), len(grid_x)))
+    assert nearest_distance[5, 10] == pytest.approx(0.0, abs=1e-3)
+    assert nearest_distance[10, 10] == pytest.approx(5.0 * np.pi / 180.0 * 6371.0, rel=1e-6)
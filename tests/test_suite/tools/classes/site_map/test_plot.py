@@ -18,6 +18,7 @@ import os
 import string
 import random
 import cartopy.crs
+from pyucrio.tools.classes.site_map import SiteMap
 from matplotlib import pyplot as plt
 from unittest.mock import patch
 
@@ -234,3 +235,43 @@ def test_plot_with_contours(mock_show, plot_cleanup, rt):
     rio_map.plot([-145, -65, 35, 80])
 
     assert mock_show.call_count == 1
+
+
+@pytest.mark.tools
+def test_plot_sites_single_collection(plot_cleanup, synthetic_site_map):
+    fig, ax = synthetic_site_map.plot([-115, -85, 45, 65], returnfig=True)
+
+    # all sites of the instrument array are drawn as a single collection
+    site_collections = [x for x in ax.collections if x.get_offsets().shape[0] > 0 and x.get_zorder() == 1]
+    assert len(site_collections) == 1
+    assert site_collections[0].get_offsets().shape == (4, 2)
+    assert len(ax.lines) == 0
+
+    # one label per site
+    assert sorted([x.get_text() for x in ax.texts]) == ["chur", "gill", "pina", "rabb"]
+    plt.close(fig)
+
+
+@pytest.mark.tools
+def test_plot_sites_not_visible(plot_cleanup, rio):
+    # a site on the far side of the globe is neither drawn nor labelled
+    site_map = SiteMap(
+        cartopy.crs.NearsidePerspective(central_longitude=-100.0, central_latitude=55.0),
+        [["gill", "farside"]],
+        [{
+            "gill": (56.38, -94.64),
+            "farside": (-50.0, 80.0),
+        }],  # type: ignore
+        ["norstar_riometer"],
+        None,
+        ["red"],
+        ["o"],
+        [5],
+        None,
+        rio,
+    )
+    fig, ax = site_map.plot([-115, -85, 45, 65], returnfig=True)
+    site_collections = [x for x in ax.collections if x.get_offsets().shape[0] > 0 and x.get_zorder() == 1]
+    assert site_collections[0].get_offsets().shape == (1, 2)
+    assert [x.get_text() for x in ax.texts] == ["gill"]
+    plt.close(fig)
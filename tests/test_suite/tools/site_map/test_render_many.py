@@ -0,0 +1,176 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+import cartopy.crs
+import pyucrio
+from matplotlib import pyplot as plt
+from pyucalgarysrs.data import Observatory
+from pyucrio.data.ucalgary import RetryPolicy
+from pyucrio.tools.classes.site_map import SiteMap
+from pyucrio.tools.site_map import _render_many
+from pyucrio.tools.classes.site_map_render import SiteMapRenderSpec, SiteMapRenderResult
+from unittest.mock import patch
+
+OBSERVATORIES = [
+    Observatory(uid="chur", full_name="Churchill", geodetic_latitude=58.76, geodetic_longitude=-94.08),
+    Observatory(uid="gill", full_name="Gillam", geodetic_latitude=56.38, geodetic_longitude=-94.64),
+    Observatory(uid="rabb", full_name="Rabbit Lake", geodetic_latitude=58.22, geodetic_longitude=-103.68),
+]
+
+
+@pytest.mark.tools
+def test_render_many(plot_cleanup, rio, tmp_path):
+    projection_obj = cartopy.crs.NearsidePerspective(central_longitude=-100.0, central_latitude=55.0)
+    specs = [
+        SiteMapRenderSpec(
+            output_filename=str(tmp_path / "map1.png"),
+            cartopy_projection=projection_obj,
+            map_extent=[-145, -65, 35, 80],
+            instrument_array="swan_hsr",
+        ),
+        {
+            "output_filename": str(tmp_path / "map2.png"),
+            "cartopy_projection": projection_obj,
+            "map_extent": [-145, -65, 35, 80],
+            "instrument_array": "swan_hsr",
+            "site_uid_list": ["gill", "rabb"],
+            "color": "red",
+            "plot_kwargs": {
+                "title": "some title"
+            },
+        },
+        SiteMapRenderSpec(
+            output_filename=str(tmp_path / "map3.png"),
+            cartopy_projection=projection_obj,
+            map_extent=[-145, -65, 35, 80],
+            instrument_array="swan_hsr",
+            plot_kwargs={"bad_kwarg": True},
+        ),
+    ]
+    with patch.object(rio.data.ucalgary, "list_observatories", return_value=OBSERVATORIES) as mock_list:
+        results = rio.tools.site_map.render_many(specs, n_parallel=1)
+        assert mock_list.call_count == 1
+
+    # check results, in the order of the specs
+    assert len(results) == 3
+    for i, result in enumerate(results):
+        assert isinstance(result, SiteMapRenderResult) is True
+        assert result.output_filename == str(tmp_path / ("map%d.png" % (i + 1)))
+        assert result.duration_seconds >= 0
+    assert results[0].success is True and results[0].error is None
+    assert results[1].success is True and results[1].error is None
+    assert os.path.exists(results[0].output_filename) is True
+    assert os.path.exists(results[1].output_filename) is True
+
+    # check that errors are reported per map
+    assert results[2].success is False
+    assert "bad_kwarg" in results[2].error
+    assert os.path.exists(results[2].output_filename) is False
+
+
+@pytest.mark.tools
+def test_render_many_errors(rio, tmp_path):
+    projection_obj = cartopy.crs.NearsidePerspective(central_longitude=-100.0, central_latitude=55.0)
+    spec = SiteMapRenderSpec(
+        output_filename=str(tmp_path / "map.png"),
+        cartopy_projection=projection_obj,
+        map_extent=[-145, -65, 35, 80],
+        instrument_array="swan_hsr",
+        site_uid_list=["gill", "some_site"],
+    )
+
+    with pytest.raises(ValueError) as e_info:
+        rio.tools.site_map.render_many([spec], n_parallel=0)
+    assert "n_parallel" in str(e_info)
+
+    with patch.object(rio.data.ucalgary, "list_observatories", return_value=OBSERVATORIES):
+        with pytest.raises(ValueError) as e_info:
+            rio.tools.site_map.render_many([spec])
+        assert "Could not find requested site_uid" in str(e_info)
+
+    assert rio.tools.site_map.render_many([]) == []
+
+
+@pytest.mark.tools
+def test_render_many_backend(plot_cleanup, rio, tmp_path):
+    projection_obj = cartopy.crs.NearsidePerspective(central_longitude=-100.0, central_latitude=55.0)
+    spec = SiteMapRenderSpec(
+        output_filename=str(tmp_path / "map.png"),
+        cartopy_projection=projection_obj,
+        map_extent=[-145, -65, 35, 80],
+        instrument_array="swan_hsr",
+    )
+
+    # maps rendered in this process are rendered off-screen, and the backend is restored after
+    backends = []
+    plot = SiteMap.plot
+
+    def record_backend(*args, **kwargs):
+        backends.append(plt.get_backend())
+        return plot(*args, **kwargs)
+
+    previous_backend = plt.get_backend()
+    plt.switch_backend("svg")
+    try:
+        with patch.object(rio.data.ucalgary, "list_observatories", return_value=OBSERVATORIES), \
+                patch.object(SiteMap, "plot", side_effect=record_backend, autospec=True):
+            results = rio.tools.site_map.render_many([spec], n_parallel=1)
+        assert results[0].success is True
+        assert [x.lower() for x in backends] == ["agg"]
+        assert plt.get_backend() == "svg"
+    finally:
+        plt.switch_backend(previous_backend)
+
+
+@pytest.mark.tools
+def test_render_many_worker_config(tmp_path):
+    # worker processes use the same settings as the caller
+    rio = pyucrio.PyUCRio(
+        download_output_root_path=str(tmp_path),
+        api_base_url="https://testing-url.com",
+        api_timeout=5,
+        progress_bar_backend="standard",
+        http_pool_size=7,
+        retry_policy=RetryPolicy(max_attempts=5),
+        download_compression="gzip",
+    )
+    config = getattr(_render_many, "__get_ucrio_config")(rio)
+    worker_rio = pyucrio.PyUCRio(**config)
+    for name in ["download_output_root_path", "api_base_url", "api_timeout", "progress_bar_backend", "http_pool_size", "download_compression"]:
+        assert getattr(worker_rio, name) == getattr(rio, name)
+    assert worker_rio.retry_policy.max_attempts == 5
+
+
+@pytest.mark.tools
+def test_render_many_parallel_disk_cache(plot_cleanup, tmp_path):
+    # maps rendered in worker processes can share basemaps using the on-disk cache
+    rio = pyucrio.PyUCRio(download_output_root_path=str(tmp_path))
+    projection_obj = cartopy.crs.NearsidePerspective(central_longitude=-100.0, central_latitude=55.0)
+    specs = [
+        SiteMapRenderSpec(
+            output_filename=str(tmp_path / ("map%d.png" % (i))),
+            cartopy_projection=projection_obj,
+            map_extent=[-145, -65, 35, 80],
+            instrument_array="swan_hsr",
+            plot_kwargs={"basemap_disk_cache": True},
+        ) for i in range(0, 2)
+    ]
+    with patch.object(rio.data.ucalgary, "list_observatories", return_value=OBSERVATORIES):
+        results = rio.tools.site_map.render_many(specs, n_parallel=2)
+    for result in results:
+        assert result.success is True and result.error is None
+        assert os.path.exists(result.output_filename) is True
+    assert len(os.listdir(tmp_path / "basemap_cache")) > 0
@@ -0,0 +1,65 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import numpy as np
+
+
+@pytest.mark.tools
+def test_cross_correlate(rt, synthetic_rio_k2_data_list, capsys):
+    # compute
+    result = rt.cross_correlate(synthetic_rio_k2_data_list, absorption=True, max_lag_seconds=1800)
+
+    # check shapes
+    assert result.site_uid_list == ["rabb", "chur", "gill"]
+    assert result.time_resolution_seconds == 5.0
+    assert result.lags.shape == (721, )
+    assert result.correlation.shape == (3, 3, 721)
+    assert result.peak_lag.shape == (3, 3)
+
+    # check lags
+    assert result.peak_lag[1, 0] == pytest.approx(300, abs=30)
+    assert result.peak_lag[2, 0] == pytest.approx(600, abs=30)
+    assert result.peak_lag[2, 1] == pytest.approx(300, abs=30)
+    assert np.all(result.peak_lag == -result.peak_lag.T)
+
+    # check correlations
+    assert np.allclose(np.diag(result.peak_correlation), 1.0)
+    assert np.all(result.peak_correlation > 0.9)
+    assert np.allclose(result.peak_correlation, result.peak_correlation.T)
+
+    # check __str__ and __repr__
+    assert isinstance(str(result), str) is True
+    assert isinstance(repr(result), str) is True
+    result.pretty_print()
+    assert capsys.readouterr().out != ""
+
+
+@pytest.mark.tools
+def test_cross_correlate_parallel(rt, synthetic_rio_k2_data_list):
+    result_serial = rt.cross_correlate(synthetic_rio_k2_data_list, absorption=True, max_lag_seconds=1800)
+    result_parallel = rt.cross_correlate(synthetic_rio_k2_data_list, absorption=True, max_lag_seconds=1800, n_parallel=2)
+    assert np.allclose(result_serial.correlation, result_parallel.correlation)
+    assert np.all(result_serial.peak_lag == result_parallel.peak_lag)
+
+
+@pytest.mark.tools
+def test_cross_correlate_bad_params(rt, synthetic_rio_k2_data_list):
+    with pytest.raises(ValueError) as e_info:
+        rt.cross_correlate(synthetic_rio_k2_data_list[0])
+    assert "At least two Data objects are required" in str(e_info)
+
+    with pytest.raises(ValueError) as e_info:
+        rt.cross_correlate(synthetic_rio_k2_data_list, max_lag_seconds=-5)
+    assert "max_lag_seconds" in str(e_info)
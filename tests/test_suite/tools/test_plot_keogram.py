@@ -0,0 +1,67 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import numpy as np
+from matplotlib import pyplot as plt
+from pyucalgarysrs.data import Observatory
+from unittest.mock import patch
+
+OBSERVATORIES = [
+    Observatory(uid="chur", full_name="Churchill", geodetic_latitude=58.76, geodetic_longitude=-94.08),
+    Observatory(uid="gill", full_name="Gillam", geodetic_latitude=56.38, geodetic_longitude=-94.64),
+    Observatory(uid="rabb", full_name="Rabbit Lake", geodetic_latitude=58.22, geodetic_longitude=-103.68),
+]
+
+
+@pytest.mark.tools
+@patch("matplotlib.pyplot.show")
+def test_plot_keogram(mock_show, plot_cleanup, rio, synthetic_rio_k2_data_list):
+    with patch.object(rio.data.ucalgary, "list_observatories", return_value=OBSERVATORIES) as mock_list:
+        rio.tools.plot_keogram(synthetic_rio_k2_data_list, title="some title")
+        assert mock_list.call_count == 1
+    assert mock_show.call_count == 1
+
+
+@pytest.mark.tools
+def test_plot_keogram_raster(plot_cleanup, rio, synthetic_rio_k2_data_list):
+    with patch.object(rio.data.ucalgary, "list_observatories", return_value=OBSERVATORIES):
+        fig, ax = rio.tools.plot_keogram(synthetic_rio_k2_data_list, time_resolution_seconds=60, color_range=(0, 2), returnfig=True)
+
+    # check that a single image was rendered, ordered by latitude
+    assert len(ax.collections) == 1
+    raster = ax.collections[0].get_array()
+    assert raster.shape == (3, 1440)
+    assert [x.get_text()[0:4] for x in ax.get_yticklabels()] == ["GILL", "RABB", "CHUR"]
+
+    # check that the event arrives last at the site with the largest delay (gill)
+    peak_idx = np.argmax(raster, axis=1)
+    assert peak_idx[0] > peak_idx[2] > peak_idx[1]
+    plt.close(fig)
+
+
+@pytest.mark.tools
+def test_plot_keogram_bad_params(plot_cleanup, rio, synthetic_rio_k2_data_list):
+    with patch.object(rio.data.ucalgary, "list_observatories", return_value=OBSERVATORIES[0:1]):
+        with pytest.raises(ValueError) as e_info:
+            rio.tools.plot_keogram(synthetic_rio_k2_data_list)
+        assert "Unable to find the location of site" in str(e_info)
+
+        with pytest.raises(ValueError) as e_info:
+            rio.tools.plot_keogram(synthetic_rio_k2_data_list, time_resolution_seconds=-1)
+        assert "time_resolution_seconds" in str(e_info)
+
+        with pytest.raises(ValueError) as e_info:
+            rio.tools.plot_keogram(synthetic_rio_k2_data_list, returnfig=True, savefig=True)
+        assert "Only one of returnfig or savefig can be set to True" in str(e_info)
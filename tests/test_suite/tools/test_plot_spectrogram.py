@@ -0,0 +1,77 @@
+# Copyright 2024 University of Calgary
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+import datetime
+import numpy as np
+from matplotlib import pyplot as plt
+from unittest.mock import patch
+
+
+@pytest.mark.tools
+@patch("matplotlib.pyplot.show")
+def test_plot_spectrogram(mock_show, plot_cleanup, rt, synthetic_hsr_k0_data):
+    rt.plot_spectrogram(synthetic_hsr_k0_data, title="some title")
+    assert mock_show.call_count == 1
+
+
+@pytest.mark.tools
+def test_plot_spectrogram_binning(plot_cleanup, rt, synthetic_hsr_k0_data):
+    # plot with time binning
+    fig, ax = rt.plot_spectrogram(
+        synthetic_hsr_k0_data,
+        time_bin_seconds=60,
+        color_range=(-65, -55),
+        xrange=(datetime.datetime(2023, 11, 5, 4, 0), datetime.datetime(2023, 11, 5, 6, 0)),
+        returnfig=True,
+    )
+
+    # check that a single image artist was used
+    assert len(ax.collections) == 1
+    assert ax.collections[0].get_array().shape == (12, 120)
+    plt.close(fig)
+
+    # check the data gap shows as empty
+    fig, ax = rt.plot_spectrogram(synthetic_hsr_k0_data, time_bin_seconds=30, returnfig=True)
+    mesh_array = np.ma.filled(ax.collections[0].get_array(), np.nan)
+    assert mesh_array.shape == (12, 240)
+    assert np.count_nonzero(np.isnan(mesh_array[0, :])) == 20
+    plt.close(fig)
+
+
+@pytest.mark.tools
+def test_plot_spectrogram_savefig(plot_cleanup, rt, synthetic_hsr_k0_data, tmp_path):
+    output_filename = str(tmp_path / "spectrogram.png")
+    rt.plot_spectrogram(synthetic_hsr_k0_data, time_bin_seconds=10, savefig=True, savefig_filename=output_filename)
+    assert os.path.exists(output_filename)
+
+
+@pytest.mark.tools
+def test_plot_spectrogram_bad_params(plot_cleanup, rt, synthetic_hsr_k0_data, synthetic_rio_k2_data_list):
+    with pytest.raises(ValueError) as e_info:
+        rt.plot_spectrogram(synthetic_rio_k2_data_list[0])
+    assert "does not contain HSR data" in str(e_info)
+
+    with pytest.raises(ValueError) as e_info:
+        rt.plot_spectrogram(synthetic_hsr_k0_data, absorption=True)
+    assert "No absorption data available" in str(e_info)
+
+    with pytest.raises(ValueError) as e_info:
+        rt.plot_spectrogram(synthetic_hsr_k0_data, time_bin_seconds=0)
+    assert "time_bin_seconds" in str(e_info)
+
+    with pytest.raises(ValueError) as e_info:
+        rt.plot_spectrogram(synthetic_hsr_k0_data, returnfig=True, savefig=True)
+    assert "Only one of returnfig or savefig can be set to True" in str(e_info)